@@ -2,6 +2,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from embeds import format_event_embed, format_bot_info_embed
+from deadlines import start_interaction_deadline
+from logging_setup import bind_interaction
+from metrics import cache_hit_ratios
+from reminder_health import reminder_health
+from resilience import report_outage
+from tracing import start_interaction_trace
 
 
 class AdminCommands(commands.Cog):
@@ -13,6 +19,16 @@ class AdminCommands(commands.Cog):
     def _get_team(self, interaction: discord.Interaction):
         return self.bot.team_manager.get_team_for_guild(interaction.guild_id)
 
+    async def cog_app_command_error(self, interaction: discord.Interaction, error):
+        await report_outage(interaction, error)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Calendar calls made while handling this interaction share its deadline
+        start_interaction_deadline(interaction.created_at)
+        bind_interaction(interaction)
+        start_interaction_trace(interaction)
+        return True
+
     @app_commands.command(name='setreminderchannel', description='Set current channel as reminder channel (Admin only)')
     @app_commands.default_permissions(administrator=True)
     async def set_reminder_channel(self, interaction: discord.Interaction):
@@ -63,16 +79,19 @@ class AdminCommands(commands.Cog):
                 "❌ This server is not configured in `teams.json`.", ephemeral=True
             )
 
-        from config import Config
         config = {
             'calendar_connected': team.is_configured(),
             'reminder_channel_id': team.reminder_channel_id,
-            'check_interval': f"Every {Config.CHECK_INTERVAL} minutes",
-            'reminder_times': ", ".join([f"{h}h" for h in Config.REMINDER_TIMES]),
+            'check_interval': f"Every {team.reminder_policy.check_interval} minutes",
+            'reminder_times': team.reminder_policy.describe(),
             'player_role_id': team.player_role_id,
             'coach_role_id': team.coach_role_id,
             'team_name': team.name,
             'calendar_type': team.calendar_type,
+            'calendar_quota': team.limiter.usage(team.team_id) if team.limiter else None,
+            'calendar_health': team.calendar_health(),
+            'reminder_health': reminder_health.snapshot(team.team_id),
+            'cache_hit_ratios': cache_hit_ratios(),
         }
         embed = format_bot_info_embed(config)
         await interaction.response.send_message(embed=embed)
@@ -6,9 +6,20 @@ Availability is fully isolated per guild — team A never sees team B's reports.
 import discord
 from discord.ext import commands
 from discord import app_commands
+import time
 from typing import Literal
 from datetime import datetime, timedelta
 
+from calendar_provider import CalendarUnavailableError
+from deadlines import start_interaction_deadline
+from logging_setup import bind_interaction, get_logger
+from metrics import record_cache
+from resilience import report_outage
+from search_index import EventSearchIndex
+from tracing import start_interaction_trace
+
+log = get_logger(__name__)
+
 
 class AvailabilityCommands(commands.Cog):
     """Commands for players to report availability issues."""
@@ -17,21 +28,36 @@ class AvailabilityCommands(commands.Cog):
         self.bot = bot
         # Per-guild event cache: {guild_id: (events_list, cache_timestamp)}
         self._event_cache: dict[int, tuple[list, datetime]] = {}
+        # Per-guild autocomplete index, rebuilt whenever the event cache refreshes
+        self._event_index: dict[int, EventSearchIndex] = {}
 
     def _get_team(self, interaction: discord.Interaction):
         return self.bot.team_manager.get_team_for_guild(interaction.guild_id)
 
+    async def cog_app_command_error(self, interaction: discord.Interaction, error):
+        await report_outage(interaction, error)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Calendar calls made while handling this interaction share its deadline
+        start_interaction_deadline(interaction.created_at)
+        bind_interaction(interaction)
+        start_interaction_trace(interaction)
+        return True
+
     async def _get_cached_events(self, guild_id: int, team) -> list:
         """Return cached events for this guild, refreshing if older than 5 min."""
         cached = self._event_cache.get(guild_id)
         if cached:
             events, ts = cached
             if (datetime.now() - ts).total_seconds() <= 300:
+                record_cache('availability_events', True)
                 return events
+        record_cache('availability_events', False)
 
         calendar = team.get_calendar()
         events = calendar.get_upcoming_events(days=14)
         self._event_cache[guild_id] = (events, datetime.now())
+        self._event_index[guild_id] = EventSearchIndex(events, type_of=calendar.get_event_type)
         return events
 
     async def event_autocomplete(
@@ -43,20 +69,28 @@ class AvailabilityCommands(commands.Cog):
         if not team:
             return []
 
-        events = await self._get_cached_events(interaction.guild_id, team)
-        if not events:
+        try:
+            # Autocomplete has its own 3-second window; cog checks don't run for it
+            start_interaction_deadline(interaction.created_at)
+            await self._get_cached_events(interaction.guild_id, team)
+        except CalendarUnavailableError:
+            return []
+        index = self._event_index.get(interaction.guild_id)
+        if not index:
             return []
 
-        choices = []
-        for event in events[:25]:
-            start_time = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
-            display = f"{event.get('title', 'Unknown')} - {start_time.strftime('%b %d, %I:%M %p')}"
-            choices.append(app_commands.Choice(name=display[:100], value=event['id']))
-
-        if current:
-            choices = [c for c in choices if current.lower() in c.name.lower()]
-
-        return choices[:25]
+        started = time.perf_counter()
+        choices = [
+            app_commands.Choice(name=label, value=event_id)
+            for label, event_id in index.search(current)
+        ]
+        # Runs on every keystroke, so only a sample is logged
+        log.info(
+            f"🔎 Event autocomplete: {len(choices)} match(es) for {current!r}",
+            extra={'sample': 'autocomplete', 'guild_id': interaction.guild_id, 'team_id': team.team_id,
+                   'latency_ms': round((time.perf_counter() - started) * 1000, 2)},
+        )
+        return choices
 
     @app_commands.command(name='availability', description='Report if you\'ll be late or missing an event')
     @app_commands.describe(
@@ -127,7 +161,7 @@ class AvailabilityCommands(commands.Cog):
         mention_text = " ".join(mentions)
 
         try:
-            await channel.send(content=mention_text, embed=embed)
+            await self.bot.dispatcher.send(channel, content=mention_text, embed=embed)
 
             # Push availability note to the calendar event
             calendar = team.get_calendar()
@@ -0,0 +1,332 @@
+"""
+Micro-benchmarks for the per-event hot paths.
+
+    python benchmarks.py                   # run all, compare with the baseline
+    python benchmarks.py --save            # run all and store them as the baseline
+    python benchmarks.py format_event_embed roster_get
+
+Each benchmark runs one function over a fixed set of synthetic inputs built
+from a seeded `random.Random` (see synthetic.py).  The inputs vary title
+shapes, notes lengths, roster sizes and timezones, so a change that only
+helps the common case does not look better than it is.  For every
+benchmark the suite reports:
+
+    time    median nanoseconds per call over --repeat timed passes (GC
+            disabled while timing, like timeit); each pass loops over the
+            inputs until it has run for at least --min-time seconds
+    alloc   mean peak bytes allocated during one call (tracemalloc),
+            which depends only on the code and the inputs, not the machine
+
+Results are compared with the stored baseline (BASELINE_FILE).  Any
+benchmark slower than --threshold or allocating more than
+--alloc-threshold over its baseline is reported as a regression, and the
+script exits with status 1, so it can gate CI.  Timings only mean something
+on the machine that saved the baseline; the baseline records the Python
+version and platform, and a mismatch is reported.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from synthetic import (
+    TEAM_NAMES, TIMEZONES, make_event, make_events, make_google_event, make_roster, make_title,
+    SUBCALENDARS,
+)
+
+BASELINE_FILE = 'benchmark_baseline.json'
+
+# Event times are generated around a fixed date, so the inputs are identical on every run
+REFERENCE_TIME = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+
+# name → setup(rng, workdir, cases) returning (function, [(args, kwargs), ...])
+BENCHMARKS: dict = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under `name`."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _random_start(rng: random.Random) -> datetime:
+    return (REFERENCE_TIME + timedelta(minutes=rng.randrange(14 * 24 * 60))).replace(second=0, microsecond=0)
+
+
+def _roster_for(rng: random.Random):
+    """No roster, a typical one, or an oversized one."""
+    return rng.choice([None, make_roster(rng), make_roster(rng, 30)])
+
+
+def _event_list(rng: random.Random, count: int):
+    """(events, event_types, rosters) for one list view, as the cogs pass them."""
+    team = rng.choice(TEAM_NAMES)
+    events = make_events(rng, count, team, rng.choice(TIMEZONES), start=REFERENCE_TIME, days=7)
+    event_types = {e['id']: SUBCALENDARS[e['subcalendar_ids'][0]] for e in events}
+    rosters = {}
+    for event in events:
+        roster = _roster_for(rng)
+        if roster:
+            rosters[event['id']] = roster
+    return events, event_types, rosters
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+@benchmark('format_event_embed')
+def _format_event_embed(rng, workdir, cases):
+    from embeds import format_event_embed
+    inputs = []
+    for i in range(cases):
+        event = make_event(rng, f"evt{i}", rng.choice(TEAM_NAMES), _random_start(rng), rng.choice(TIMEZONES))
+        event_type = rng.choice([None, *SUBCALENDARS.values()])
+        inputs.append(((event,), {'roster': _roster_for(rng), 'event_type': event_type}))
+    return format_event_embed, inputs
+
+
+@benchmark('format_upcoming_events_embed')
+def _format_upcoming_events_embed(rng, workdir, cases):
+    from embeds import format_upcoming_events_embed
+    inputs = [(_event_list(rng, rng.randint(1, 25)), {}) for _ in range(max(1, cases // 10))]
+    return format_upcoming_events_embed, inputs
+
+
+@benchmark('format_week_events_embed')
+def _format_week_events_embed(rng, workdir, cases):
+    from embeds import format_week_events_embed
+    inputs = [(_event_list(rng, rng.randint(5, 40)), {}) for _ in range(max(1, cases // 10))]
+    return format_week_events_embed, inputs
+
+
+@benchmark('google_normalize')
+def _google_normalize(rng, workdir, cases):
+    # Needs the Google client libraries (imported by the provider module)
+    from google_calendar_api import _normalize
+    inputs = [
+        ((make_google_event(rng, f"g{i}", rng.choice(TEAM_NAMES), _random_start(rng),
+                            rng.choice(TIMEZONES)),), {})
+        for i in range(cases)
+    ]
+    return _normalize, inputs
+
+
+@benchmark('parse_team_name')
+def _parse_team_name(rng, workdir, cases):
+    from event_text import parse_team_name
+    return parse_team_name, [((make_title(rng, rng.choice(TEAM_NAMES))[0],), {}) for _ in range(cases)]
+
+
+@benchmark('infer_event_type')
+def _infer_event_type(rng, workdir, cases):
+    from event_text import infer_event_type
+    inputs = []
+    for i in range(cases):
+        # Providers classify on title + notes
+        event = make_event(rng, f"evt{i}", rng.choice(TEAM_NAMES), _random_start(rng))
+        inputs.append(((event['title'] + ' ' + event['notes'],), {}))
+    return infer_event_type, inputs
+
+
+@benchmark('roster_get')
+def _roster_get(rng, workdir, cases):
+    from roster_storage import RosterStorage
+    storage = RosterStorage(os.path.join(workdir, 'rosters.json'))
+    names = [f"{rng.choice(TEAM_NAMES)} {n}" for n in range(200)]
+    for name in names:
+        storage.set_roster(name, make_roster(rng, rng.choice([5, 8, 12, 30])))
+    lookups = []
+    for _ in range(cases):
+        name = rng.choice(names)
+        # Exact names, other casing, and names with no roster (a full scan)
+        lookups.append(rng.choice([name, name.upper(), f"{name} Academy"]))
+    return storage.get_roster, [((name,), {}) for name in lookups]
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+
+def _timed_pass(func, inputs, min_time: float) -> float:
+    """Nanoseconds per call for one pass of at least `min_time` seconds."""
+    calls = 0
+    started = time.perf_counter_ns()
+    deadline = started + int(min_time * 1e9)
+    while True:
+        for args, kwargs in inputs:
+            func(*args, **kwargs)
+        calls += len(inputs)
+        now = time.perf_counter_ns()
+        if now >= deadline:
+            return (now - started) / calls
+
+
+def _allocations(func, inputs) -> float:
+    """Mean peak bytes allocated by one call."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for args, kwargs in inputs:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks)
+
+
+def measure(func, inputs, repeat: int, min_time: float) -> dict:
+    # Warm caches (imports, regex compilation, lazily built indexes) first
+    for args, kwargs in inputs:
+        func(*args, **kwargs)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        passes = [_timed_pass(func, inputs, min_time) for _ in range(repeat)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'ns_per_call': statistics.median(passes),
+        'min_ns_per_call': min(passes),
+        'alloc_bytes': _allocations(func, inputs),
+        'inputs': len(inputs),
+    }
+
+
+def run(names: list, options: argparse.Namespace) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='jarvis-bench-') as workdir:
+        for name in names:
+            # Each benchmark gets its own generator, so adding one doesn't change the others' inputs
+            rng = random.Random(f"{options.seed}:{name}")
+            try:
+                func, inputs = BENCHMARKS[name](rng, workdir, options.cases)
+            except ImportError as e:
+                print(f"⏭️  {name}: skipped ({e})")
+                continue
+            results[name] = measure(func, inputs, options.repeat, options.min_time)
+            print(_format_result(name, results[name]))
+    return results
+
+
+# ----------------------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------------------
+
+def _environment() -> dict:
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'machine': platform.machine()}
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: dict) -> None:
+    baseline = load_baseline(path)
+    baseline.setdefault('benchmarks', {}).update(results)
+    baseline['environment'] = _environment()
+    baseline['saved_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare(results: dict, baseline: dict, threshold: float, alloc_threshold: float) -> list:
+    """Return [(name, message)] for each benchmark that regressed past a threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base:
+            continue
+        time_change = result['ns_per_call'] / base['ns_per_call'] - 1
+        if time_change > threshold:
+            regressions.append((name, f"time {time_change:+.0%} ({base['ns_per_call']:,.0f} → "
+                                      f"{result['ns_per_call']:,.0f} ns/call)"))
+        # A few bytes of slack so tiny allocations don't trip on interpreter noise
+        alloc_limit = base['alloc_bytes'] * (1 + alloc_threshold) + 64
+        if result['alloc_bytes'] > alloc_limit:
+            alloc_change = result['alloc_bytes'] / max(base['alloc_bytes'], 1) - 1
+            regressions.append((name, f"allocations {alloc_change:+.0%} ({base['alloc_bytes']:,.0f} → "
+                                      f"{result['alloc_bytes']:,.0f} bytes/call)"))
+    return regressions
+
+
+def _format_result(name: str, result: dict, base: dict = None) -> str:
+    line = (f"  {name:<30}{result['ns_per_call'] / 1000:>10.2f} µs/call"
+            f"{result['alloc_bytes'] / 1024:>10.1f} KiB/call")
+    if base:
+        line += (f"   ({result['ns_per_call'] / base['ns_per_call'] - 1:+.0%} time, "
+                 f"{result['alloc_bytes'] / max(base['alloc_bytes'], 1) - 1:+.0%} alloc)")
+    return line
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for embed formatting, parsing and roster lookup.")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default all: {', '.join(BENCHMARKS)})")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline file to compare with or save to")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--alloc-threshold', type=float, default=0.10, help="allowed allocation growth before failing")
+    parser.add_argument('--cases', type=int, default=200, help="synthetic inputs per benchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="timed passes per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per timed pass")
+    parser.add_argument('--seed', type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    options = parse_args(argv)
+    unknown = [name for name in options.names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+        return 2
+
+    print(f"⏱️  Running {len(options.names or BENCHMARKS)} benchmark(s) "
+          f"({options.cases} inputs, {options.repeat} × {options.min_time:g}s passes)")
+    results = run(options.names or list(BENCHMARKS), options)
+
+    if options.save:
+        save_baseline(options.baseline, results)
+        print(f"💾 Saved {len(results)} result(s) to {options.baseline}")
+        return 0
+
+    baseline = load_baseline(options.baseline)
+    if not baseline:
+        print(f"ℹ️  No baseline at {options.baseline}; run with --save to create one.")
+        return 0
+    if baseline.get('environment') != _environment():
+        print(f"⚠️  Baseline was saved on a different environment ({baseline.get('environment')}); "
+              f"timings may not be comparable.")
+
+    print("\nCompared with baseline:")
+    for name, result in results.items():
+        print(_format_result(name, result, baseline.get('benchmarks', {}).get(name)))
+    regressions = compare(results, baseline, options.threshold, options.alloc_threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s):")
+        for name, message in regressions:
+            print(f"  {name}: {message}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
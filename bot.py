@@ -1,31 +1,65 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
+import io
 import os
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
-from team_manager import TeamManager
-
+# Load .env before importing modules that read settings at import time (Config)
 load_dotenv()
 
+from team_manager import TeamManager
+from command_sync import sync_commands, sync_if_changed
+from config import Config
+from dispatcher import MessageDispatcher
+from deadlines import provider_stats
+from metrics import COMMAND_ERRORS, COMMAND_SECONDS, DISPATCHER_QUEUE_DEPTH, start_metrics_server
+from profiling import MODES, ProfileSession, note_interaction, parse_amount, stall_monitor
+from tracing import find_trace, finish_interaction_trace, setup_tracing
+from embeds import format_trace_embed
+from logging_setup import get_logger, setup_logging
+
+setup_logging()
+setup_tracing()
+log = get_logger(__name__)
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 
 bot = commands.Bot(command_prefix='!', intents=intents)
 bot.start_time = None
+bot.metrics_runner = None
 
 
 @bot.event
 async def on_ready():
-    print(f'{bot.user} has connected to Discord!')
-    print(f'Bot is in {len(bot.guilds)} guild(s)')
-
-    bot.team_manager = TeamManager()
+    log.info(f'{bot.user} has connected to Discord!')
+    log.info(f'Bot is in {len(bot.guilds)} guild(s)')
+
+    # on_ready fires again after a full reconnect; keep each team's breaker,
+    # stale snapshots, sync state and rate limiters across it
+    if getattr(bot, 'team_manager', None) is None:
+        bot.team_manager = TeamManager()
+    if getattr(bot, 'dispatcher', None) is None:
+        bot.dispatcher = MessageDispatcher()
+        bot.dispatcher.start()
+        DISPATCHER_QUEUE_DEPTH.set_function(bot.dispatcher.queue_depth)
+    if bot.metrics_runner is None:
+        try:
+            bot.metrics_runner = await start_metrics_server()
+        except OSError as e:
+            log.warning(f'⚠️ Could not start metrics endpoint: {e}')
+    if Config.LOOP_STALL_MONITOR:
+        stall_monitor.start()
 
-    print('Loading cogs...')
+    log.info('Loading cogs...')
     await load_cogs()
-    print('Bot is ready!')
-    print('💡 Use !sync to register slash commands with Discord')
+    if Config.AUTO_SYNC_COMMANDS:
+        await sync_if_changed(bot)
+    log.info('Bot is ready!')
+    log.info('💡 Use !sync to force a slash command sync with Discord')
 
 
 async def load_cogs():
@@ -40,22 +74,130 @@ async def load_cogs():
     for cog in cogs:
         try:
             await bot.load_extension(cog)
-            print(f'✅ Loaded {cog}')
+            log.info(f'✅ Loaded {cog}')
         except Exception as e:
-            print(f'❌ Failed to load {cog}: {e}')
+            log.error(f'❌ Failed to load {cog}: {e}')
 
 
 @bot.command(name='sync')
 @commands.is_owner()
-async def sync(ctx):
-    """Sync slash commands with Discord (Owner only)."""
+async def sync(ctx, scope: str = None):
+    """Force a slash command sync with Discord (Owner only). Use `!sync guild` for this server only."""
     try:
-        synced = await bot.tree.sync()
-        await ctx.send(f"✅ Synced {len(synced)} slash command(s)!")
-        print(f"Synced {len(synced)} commands")
+        guild_id = ctx.guild.id if scope == 'guild' and ctx.guild else None
+        count = await sync_commands(bot, guild_id, force=True)
+        await ctx.send(f"✅ Synced {count} slash command(s)!")
+        log.info(f"Synced {count} commands")
     except Exception as e:
         await ctx.send(f"❌ Failed to sync commands: {e}")
-        print(f"Sync error: {e}")
+        log.error(f"Sync error: {e}")
+
+
+@bot.command(name='queuestats')
+@commands.is_owner()
+async def queue_stats(ctx):
+    """Show outbound message queue depth and send latency (Owner only)."""
+    stats = bot.dispatcher.stats()
+    await ctx.send(
+        f"📤 Queue depth: {stats['queue_depth']} ({stats['channels_waiting']} channel(s) waiting)\n"
+        f"✅ Sent: {stats['sent']} message(s), {stats['merged']} merged, {stats['failed']} failed\n"
+        f"⏱️ Latency p50 {stats['latency_p50_ms']:.0f}ms • p95 {stats['latency_p95_ms']:.0f}ms"
+        f" • max {stats['latency_max_ms']:.0f}ms"
+    )
+
+
+@bot.command(name='providerstats')
+@commands.is_owner()
+async def provider_stats_command(ctx):
+    """Show calendar request counts, retries and timeouts (Owner only)."""
+    stats = provider_stats()
+    if not stats:
+        return await ctx.send("📡 No calendar requests yet.")
+    lines = [
+        f"📡 **{name}**: {s['calls']} request(s), {s['retries']} retried, "
+        f"{s['timeouts']} timed out, {s['deadline_exceeded']} over deadline"
+        for name, s in sorted(stats.items())
+    ]
+    await ctx.send("\n".join(lines))
+
+
+@bot.command(name='profile')
+@commands.is_owner()
+async def profile_command(ctx, mode: str = 'sample', amount: str = '30s'):
+    """Profile the live bot (Owner only). `!profile sample 30s` or `!profile cprofile 20i` (20 commands)."""
+    try:
+        seconds, interactions = parse_amount(amount)
+        session = ProfileSession(mode.lower(), seconds, interactions)
+        session.start()
+    except (ValueError, RuntimeError) as e:
+        return await ctx.send(f"❌ {e}. Modes: {', '.join(MODES)}; amount like `30s` or `20i`.")
+
+    until = f"{interactions} command(s) or {session.seconds:.0f}s" if interactions else f"{session.seconds:.0f}s"
+    await ctx.send(f"🔬 Profiling ({mode}) for {until}...")
+    try:
+        await session.wait()
+    finally:
+        session.stop()
+    files = [discord.File(io.BytesIO(data), filename=name) for name, data in session.results()]
+    await ctx.send(f"🔬 Done: {session.summary()}", files=files)
+
+
+@bot.command(name='stalls')
+@commands.is_owner()
+async def stalls_command(ctx):
+    """Show recent event-loop stalls with the stack that blocked the loop (Owner only)."""
+    if not stall_monitor.running:
+        return await ctx.send("⏸️ Loop stall monitor is off (LOOP_STALL_MONITOR=false).")
+    stalls = list(stall_monitor.stalls)
+    if not stalls:
+        return await ctx.send(
+            f"✅ No event-loop stalls over {stall_monitor.threshold * 1000:.0f}ms since startup."
+        )
+    worst = max(stall.duration for stall in stalls)
+    text = "\n\n".join(stall.format() for stall in reversed(stalls))
+    await ctx.send(
+        f"⚠️ {stall_monitor.total} stall(s) since startup; last {len(stalls)} attached "
+        f"(worst {worst * 1000:.0f}ms)",
+        file=discord.File(io.BytesIO(text.encode('utf-8')), filename='stalls.txt'),
+    )
+
+
+@bot.command(name='trace')
+@commands.is_owner()
+async def trace_command(ctx, command: str = None):
+    """Show the stage breakdown of the last traced slash command, e.g. `!trace week` (Owner only)."""
+    root = find_trace(command)
+    if root is None:
+        return await ctx.send("🧭 No matching trace yet." + ("" if Config.TRACE_ENABLED else " (TRACE_ENABLED is off)"))
+    await ctx.send(embed=format_trace_embed(root))
+
+
+def _command_name(interaction: discord.Interaction) -> str:
+    command = interaction.command
+    return command.qualified_name if command else 'unknown'
+
+
+def _since_created(interaction: discord.Interaction) -> float:
+    return (datetime.now(timezone.utc) - interaction.created_at).total_seconds()
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    # Measured from interaction creation, so gateway delay counts too
+    COMMAND_SECONDS.labels(command=command.qualified_name).observe(_since_created(interaction))
+    finish_interaction_trace(interaction)
+    note_interaction()
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    name = _command_name(interaction)
+    COMMAND_ERRORS.labels(command=name).inc()
+    COMMAND_SECONDS.labels(command=name).observe(_since_created(interaction))
+    finish_interaction_trace(interaction, error=getattr(error, 'original', error))
+    note_interaction()
+    # Keep discord.py's default logging of the traceback
+    await app_commands.CommandTree.on_error(bot.tree, interaction, error)
 
 
 @bot.event
@@ -67,14 +209,15 @@ async def on_command_error(ctx, error):
     elif isinstance(error, commands.NotOwner):
         await ctx.send("❌ Only the bot owner can use this command!")
     else:
-        print(f'Error: {error}')
+        log.error(f'Error: {error}', exc_info=error)
         await ctx.send(f"❌ An error occurred: {str(error)}")
 
 
 if __name__ == '__main__':
     TOKEN = os.getenv('DISCORD_BOT_TOKEN')
     if not TOKEN:
-        print("Error: DISCORD_BOT_TOKEN not found in environment variables")
+        log.error("Error: DISCORD_BOT_TOKEN not found in environment variables")
         exit(1)
 
-    bot.run(TOKEN)
+    # Logging is already configured (queue + rotating file); don't let discord.py add its own handler
+    bot.run(TOKEN, log_handler=None)
@@ -1,8 +1,16 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from embeds import format_event_embed, format_upcoming_events_embed, format_week_events_embed
+from embeds import (
+    format_event_embed, format_upcoming_events_embed,
+    build_upcoming_fields, build_week_fields, UPCOMING_PAGE_SIZE,
+)
+from pagination import EventPageSource, EventPaginator
+from deadlines import start_interaction_deadline
+from logging_setup import bind_interaction
+from resilience import report_outage, stale_notice
 from roster_storage import RosterStorage
+from tracing import span, start_interaction_trace
 
 
 def _no_team_response(interaction: discord.Interaction):
@@ -12,6 +20,16 @@ def _no_team_response(interaction: discord.Interaction):
     )
 
 
+async def _respond(interaction: discord.Interaction, *args, **kwargs):
+    """Send the command's reply, timed as its own tracing stage."""
+    with span('discord.respond'):
+        if interaction.response.is_done():
+            # A paginator deferred while loading further windows
+            await interaction.followup.send(*args, **kwargs)
+        else:
+            await interaction.response.send_message(*args, **kwargs)
+
+
 class CalendarCommands(commands.Cog):
     """Commands for viewing calendar events."""
 
@@ -22,19 +40,38 @@ class CalendarCommands(commands.Cog):
     def _get_team(self, interaction: discord.Interaction):
         return self.bot.team_manager.get_team_for_guild(interaction.guild_id)
 
+    async def cog_app_command_error(self, interaction: discord.Interaction, error):
+        await report_outage(interaction, error)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Calendar calls made while handling this interaction share its deadline
+        start_interaction_deadline(interaction.created_at)
+        bind_interaction(interaction)
+        start_interaction_trace(interaction)
+        return True
+
     def _enrich_events(self, events, calendar):
         """Return (event_types dict, rosters dict) for a list of events."""
         event_types = {}
         rosters = {}
-        for event in events:
-            event_types[event['id']] = calendar.get_event_type(event)
-            team_name = _roster_key(event)
-            if team_name:
-                roster = self.roster_storage.get_roster(team_name)
-                if roster:
-                    rosters[event['id']] = roster
+        with span('enrich_events', events=len(events)):
+            for event in events:
+                event_types[event['id']] = calendar.get_event_type(event)
+                team_name = _roster_key(event)
+                if team_name:
+                    roster = self.roster_storage.get_roster(team_name)
+                    if roster:
+                        rosters[event['id']] = roster
         return event_types, rosters
 
+    def _window_loader(self, calendar):
+        """Return a load_window callback for `EventPageSource`."""
+        def load_window(start_date, end_date):
+            events = calendar.get_events(start_date=start_date, end_date=end_date)
+            event_types, rosters = self._enrich_events(events, calendar)
+            return events, event_types, rosters
+        return load_window
+
     # ------------------------------------------------------------------
 
     @app_commands.command(name='upcoming', description='List upcoming scrims from the calendar')
@@ -43,17 +80,15 @@ class CalendarCommands(commands.Cog):
         if not team:
             return await _no_team_response(interaction)
 
-        calendar = team.get_calendar()
-        events = calendar.get_upcoming_events(days=7)
-        if not events:
-            return await interaction.response.send_message("📅 No upcoming scrims scheduled!")
-
-        event_types, rosters = self._enrich_events(events, calendar)
-        embed = format_upcoming_events_embed(events, event_types, rosters)
-        if embed:
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Error formatting events")
+        source = EventPageSource(
+            self._window_loader(team.get_calendar()),
+            build_upcoming_fields,
+            title="📋 Upcoming Events",
+            max_fields=UPCOMING_PAGE_SIZE,
+        )
+        paginator = EventPaginator(source, interaction.user.id)
+        if not await paginator.start(interaction):
+            await _respond(interaction, "📅 No upcoming scrims scheduled!")
 
     @app_commands.command(name='next', description='Show details of the next scheduled event')
     async def next_event(self, interaction: discord.Interaction):
@@ -64,16 +99,16 @@ class CalendarCommands(commands.Cog):
         calendar = team.get_calendar()
         events = calendar.get_upcoming_events(days=14)
         if not events:
-            return await interaction.response.send_message("📅 No events scheduled!")
+            return await _respond(interaction, "📅 No events scheduled!")
 
         events.sort(key=lambda x: x['start_dt'])
         event = events[0]
         event_type = calendar.get_event_type(event)
         roster = self.roster_storage.get_roster(_roster_key(event)) or None
 
-        await interaction.response.send_message(
-            embed=format_event_embed(event, roster=roster, event_type=event_type)
-        )
+        with span('embed.format'):
+            embed = format_event_embed(event, roster=roster, event_type=event_type)
+        await _respond(interaction, content=stale_notice(events), embed=embed)
 
     @app_commands.command(name='nextscrim', description='Show details of the next scheduled scrim')
     async def next_scrim(self, interaction: discord.Interaction):
@@ -84,20 +119,20 @@ class CalendarCommands(commands.Cog):
         calendar = team.get_calendar()
         events = calendar.get_upcoming_events(days=14)
         if not events:
-            return await interaction.response.send_message("📅 No events scheduled!")
+            return await _respond(interaction, "📅 No events scheduled!")
 
         scrims = [e for e in events if _is_type(calendar.get_event_type(e), 'scrim')]
         if not scrims:
-            return await interaction.response.send_message("📅 No scrims scheduled!")
+            return await _respond(interaction, "📅 No scrims scheduled!")
 
         scrims.sort(key=lambda x: x['start_dt'])
         event = scrims[0]
         event_type = calendar.get_event_type(event)
         roster = self.roster_storage.get_roster(_roster_key(event)) or None
 
-        await interaction.response.send_message(
-            embed=format_event_embed(event, roster=roster, event_type=event_type)
-        )
+        with span('embed.format'):
+            embed = format_event_embed(event, roster=roster, event_type=event_type)
+        await _respond(interaction, content=stale_notice(events), embed=embed)
 
     @app_commands.command(name='nextofficial', description='Show details of the next official match')
     async def next_official(self, interaction: discord.Interaction):
@@ -108,20 +143,20 @@ class CalendarCommands(commands.Cog):
         calendar = team.get_calendar()
         events = calendar.get_upcoming_events(days=14)
         if not events:
-            return await interaction.response.send_message("📅 No events scheduled!")
+            return await _respond(interaction, "📅 No events scheduled!")
 
         officials = [e for e in events if _is_type(calendar.get_event_type(e), 'official')]
         if not officials:
-            return await interaction.response.send_message("📅 No official matches scheduled!")
+            return await _respond(interaction, "📅 No official matches scheduled!")
 
         officials.sort(key=lambda x: x['start_dt'])
         event = officials[0]
         event_type = calendar.get_event_type(event)
         roster = self.roster_storage.get_roster(_roster_key(event)) or None
 
-        await interaction.response.send_message(
-            embed=format_event_embed(event, roster=roster, event_type=event_type)
-        )
+        with span('embed.format'):
+            embed = format_event_embed(event, roster=roster, event_type=event_type)
+        await _respond(interaction, content=stale_notice(events), embed=embed)
 
     @app_commands.command(name='scrim', description='Show details of a specific event by ID')
     @app_commands.describe(event_id='The event ID from the calendar')
@@ -133,14 +168,14 @@ class CalendarCommands(commands.Cog):
         calendar = team.get_calendar()
         event = calendar.get_event(event_id)
         if not event:
-            return await interaction.response.send_message(f"❌ Could not find event with ID: {event_id}")
+            return await _respond(interaction, f"❌ Could not find event with ID: {event_id}")
 
         event_type = calendar.get_event_type(event)
         roster = self.roster_storage.get_roster(_roster_key(event)) or None
 
-        await interaction.response.send_message(
-            embed=format_event_embed(event, roster=roster, event_type=event_type)
-        )
+        with span('embed.format'):
+            embed = format_event_embed(event, roster=roster, event_type=event_type)
+        await _respond(interaction, embed=embed)
 
     @app_commands.command(name='today', description='Show events scheduled for today')
     async def today_scrims(self, interaction: discord.Interaction):
@@ -153,13 +188,14 @@ class CalendarCommands(commands.Cog):
         today = datetime.now().strftime('%Y-%m-%d')
         events = calendar.get_events(start_date=today, end_date=today)
         if not events:
-            return await interaction.response.send_message("📅 No events scheduled for today!")
+            return await _respond(interaction, "📅 No events scheduled for today!")
 
         event_types, rosters = self._enrich_events(events, calendar)
-        embed = format_upcoming_events_embed(events, event_types, rosters)
+        with span('embed.format'):
+            embed = format_upcoming_events_embed(events, event_types, rosters)
         embed.title = "📋 Today's Events"
         embed.description = f"{len(events)} event{'s' if len(events) > 1 else ''} scheduled"
-        await interaction.response.send_message(embed=embed)
+        await _respond(interaction, content=stale_notice(events), embed=embed)
 
     @app_commands.command(name='week', description='Show scrims scheduled for this week')
     async def week_scrims(self, interaction: discord.Interaction):
@@ -167,15 +203,15 @@ class CalendarCommands(commands.Cog):
         if not team:
             return await _no_team_response(interaction)
 
-        calendar = team.get_calendar()
-        events = calendar.get_upcoming_events(days=7)
-        if not events:
-            return await interaction.response.send_message("📅 No scrims scheduled this week!")
-
-        event_types, rosters = self._enrich_events(events, calendar)
-        await interaction.response.send_message(
-            embed=format_week_events_embed(events, event_types, rosters)
+        source = EventPageSource(
+            self._window_loader(team.get_calendar()),
+            build_week_fields,
+            title="📅 This Week's Schedule",
+            footer="Times shown in your local timezone",
         )
+        paginator = EventPaginator(source, interaction.user.id)
+        if not await paginator.start(interaction):
+            await _respond(interaction, "📅 No scrims scheduled this week!")
 
 
 def _roster_key(event: dict) -> str:
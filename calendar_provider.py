@@ -5,17 +5,31 @@ Both TeamUp and Google Calendar implement this interface.
 from abc import ABC, abstractmethod
 
 
+class CalendarUnavailableError(Exception):
+    """Raised when a calendar backend can't be reached or returns an error."""
+
+
 class CalendarProvider(ABC):
     """Common interface for all calendar backends."""
 
+    # True for providers that override append_availability_note
+    supports_writes = False
+
     @abstractmethod
     def get_events(self, start_date=None, end_date=None) -> list:
-        """Fetch events between start_date and end_date (YYYY-MM-DD strings)."""
+        """
+        Fetch events between start_date and end_date (YYYY-MM-DD strings).
+        Raises CalendarUnavailableError if the backend fails, so an outage
+        is never mistaken for an empty calendar.
+        """
         pass
 
     @abstractmethod
     def get_event(self, event_id) -> dict:
-        """Fetch a single event by its ID. Returns None if not found."""
+        """
+        Fetch a single event by its ID. Returns None if not found;
+        raises CalendarUnavailableError if the backend fails.
+        """
         pass
 
     @abstractmethod
@@ -34,7 +48,8 @@ class CalendarProvider(ABC):
     def append_availability_note(self, event_id, note: str) -> bool:
         """
         Append an availability note to the event's description/notes.
-        Returns True on success, False on failure.
-        Override in providers that support writes.
+        Returns True on success, False if the event can't be updated (e.g.
+        it no longer exists); raises CalendarUnavailableError if the backend
+        fails. Override in providers that support writes.
         """
         return False
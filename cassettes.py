@@ -0,0 +1,501 @@
+"""
+Record and replay calendar provider traffic.
+
+`RecordingCalendar` wraps a live provider (TeamUp, Google or ICS) and writes
+every call it answers to a cassette file: the method and arguments, the
+result or error, when the call was made and how long it took.  Cassettes
+are gzip-compressed JSON lines, and results are stored once and referenced
+by number, so the event list a reminder check fetches every minute costs a
+few bytes per repeat rather than a full copy.
+
+Before anything is written, the API keys, calendar ids and feed URLs the
+provider was built with are replaced with `<redacted>`, as are token-like
+URL parameters and auth headers quoted in error messages.
+
+`ReplayCalendar` is a `CalendarProvider` that serves a cassette without
+credentials or network:
+
+- calls with the same method and arguments get the recorded answers in the
+  order they were recorded, then keep getting the last one
+- `speed` sleeps for each call's recorded duration divided by `speed`
+  (1.0 = recorded speed, 10 = ten times faster, None = no delay)
+- `rebase` moves every event by whole days so the recording's first day
+  becomes today, which keeps "upcoming" and "this week" queries meaningful
+- a date range that was never recorded is answered from every event the
+  cassette has seen, and counted in `misses`
+
+With CASSETTE_RECORD_DIR set the bot records every team's calendar; with
+CASSETTE_REPLAY_DIR set it serves each team from its newest cassette
+instead of the live provider.  Run `python cassettes.py info FILE` for a
+summary of a cassette, or `python cassettes.py replay FILE --speed 10` to
+drive its recorded call sequence, at its recorded pacing, through the
+circuit breaker and cache layer.
+"""
+import argparse
+import atexit
+import glob
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from deadlines import DeadlineExceeded
+from event_text import infer_event_type
+from logging_setup import get_logger
+from rate_limiter import RateLimited
+from reminder_health import percentiles
+
+log = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_SUFFIX = '.cassette.jsonl.gz'
+REDACTED = '<redacted>'
+
+# Query parameters, headers and URL segments whose values are credentials
+_SECRET_PATTERNS = [
+    (re.compile(r'(?i)\b((?:api[_-]?)?key|token|access_token|secret|sig(?:nature)?|password|auth)=[^&\s"\']+'),
+     rf'\1={REDACTED}'),
+    (re.compile(r'(?i)\b(Teamup-Token|Authorization)(["\']?\s*[:=]\s*["\']?)(?:Bearer\s+)?[^\s"\',}]+'),
+     rf'\1\2{REDACTED}'),
+    (re.compile(r'(?i)\b(Bearer)\s+[A-Za-z0-9._~+/=-]+'), rf'\1 {REDACTED}'),
+    # Google "secret address" feeds: /calendar/ical/<id>/private-<token>/basic.ics
+    (re.compile(r'/private-[0-9a-f]+'), f'/private-{REDACTED}'),
+]
+
+# Event fields moved by `rebase`
+_TIME_FIELDS = ('start_dt', 'end_dt')
+
+# Errors that are re-raised as their own type on replay, since the breaker and
+# stale cache treat them differently; anything else becomes CalendarUnavailableError
+_ERRORS = {cls.__name__: cls for cls in (CalendarUnavailableError, DeadlineExceeded, RateLimited)}
+
+
+def scrub(value, secrets: Iterable[str] = ()):
+    """Return `value` with every secret and token-like string replaced by `<redacted>`."""
+    secrets = sorted({s for s in secrets if s and len(s) >= 4}, key=len, reverse=True)
+
+    def clean(item):
+        if isinstance(item, str):
+            for secret in secrets:
+                item = item.replace(secret, REDACTED)
+            for pattern, replacement in _SECRET_PATTERNS:
+                item = pattern.sub(replacement, item)
+            return item
+        if isinstance(item, dict):
+            return {k: clean(v) for k, v in item.items()}
+        if isinstance(item, (list, tuple)):
+            return [clean(v) for v in item]
+        return item
+
+    return clean(value)
+
+
+def _encode(value) -> str:
+    return json.dumps(value, separators=(',', ':'), sort_keys=True, default=str)
+
+
+class RecordingCalendar(CalendarProvider):
+    """
+    Passes calls through to `provider` and appends each one to a cassette.
+
+    Args:
+        provider: The live provider
+        path: Cassette file to write (created with its directory)
+        secrets: Credentials to scrub, e.g. the API key, calendar id and feed URL
+        team_id: Stored in the cassette header
+        calendar_type: Stored in the cassette header
+    """
+
+    def __init__(self, provider: CalendarProvider, path: str, secrets: Iterable[str] = (),
+                 team_id: str = '', calendar_type: str = ''):
+        self.provider = provider
+        self.path = path
+        self._secrets = list(secrets)
+        self._started = time.monotonic()
+        # encoded result → blob number, so repeated answers are stored once
+        self._blobs: dict[str, int] = {}
+        self._event_types: dict[str, str] = {}
+        # Calls are recorded from the event loop; the lock keeps a record
+        # from being interleaved with close() if the file is shut from elsewhere
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self.calls = 0
+        self._write({
+            'cassette': CASSETTE_VERSION,
+            'team': team_id,
+            'provider': calendar_type,
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        })
+        atexit.register(self.close)
+        log.info(f"📼 Recording {calendar_type or 'calendar'} traffic for {team_id or 'team'} to {path}")
+
+    def __getattr__(self, attr):
+        # Provider-specific helpers (e.g. TeamUpAPI.get_subcalendar_name)
+        return getattr(self.provider, attr)
+
+    @property
+    def supports_writes(self) -> bool:
+        return self.provider.supports_writes
+
+    def _write(self, record: dict) -> None:
+        if self._file is None:
+            return
+        self._file.write(_encode(record) + '\n')
+
+    def _blob(self, value) -> int:
+        encoded = _encode(scrub(value, self._secrets))
+        number = self._blobs.get(encoded)
+        if number is None:
+            number = self._blobs[encoded] = len(self._blobs)
+            self._file.write(f'{{"blob":{number},"data":{encoded}}}\n')
+        return number
+
+    def _record(self, method: str, args: list, call):
+        started = time.monotonic()
+        try:
+            result = call()
+        except Exception as e:
+            self._append(method, args, started, err=[type(e).__name__, str(e)])
+            raise
+        self._append(method, args, started, result=result)
+        return result
+
+    def _append(self, method: str, args: list, started: float, result=None, err=None) -> None:
+        elapsed = time.monotonic() - started
+        try:
+            with self._lock:
+                if self._file is None:
+                    return
+                record = {
+                    't': round(started - self._started, 3),
+                    'call': method,
+                    'args': scrub(args, self._secrets),
+                    'ms': round(elapsed * 1000, 1),
+                }
+                if err is not None:
+                    record['err'] = scrub(err, self._secrets)
+                else:
+                    record['ok'] = self._blob(result)
+                self._write(record)
+                self._file.flush()
+                self.calls += 1
+        except (OSError, TypeError, ValueError) as e:
+            # A broken cassette must never break the calendar
+            log.warning(f"⚠️ Cassette {self.path}: failed to record {method}: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        return self._record('get_events', [start_date, end_date],
+                            lambda: self.provider.get_events(start_date, end_date))
+
+    def get_event(self, event_id) -> dict:
+        return self._record('get_event', [event_id], lambda: self.provider.get_event(event_id))
+
+    def get_upcoming_events(self, days=7) -> list:
+        return self._record('get_upcoming_events', [days], lambda: self.provider.get_upcoming_events(days))
+
+    def get_event_type(self, event) -> str:
+        # Local lookup, not traffic: stored once per event so replay can answer it
+        event_type = self.provider.get_event_type(event)
+        event_id = str(event.get('id', ''))
+        if event_id and self._event_types.get(event_id) != event_type:
+            try:
+                with self._lock:
+                    self._event_types[event_id] = event_type
+                    self._write({'event_type': [event_id, event_type]})
+            except (OSError, TypeError, ValueError) as e:
+                # A broken cassette must never break the calendar
+                log.warning(f"⚠️ Cassette {self.path}: failed to record event type: {e}")
+        return event_type
+
+    def append_availability_note(self, event_id, note: str) -> bool:
+        return self._record('append_availability_note', [event_id, note],
+                            lambda: self.provider.append_availability_note(event_id, note))
+
+
+class Cassette:
+    """A cassette file loaded into memory."""
+
+    def __init__(self, header: dict, calls: list, blobs: dict, event_types: dict):
+        self.header = header
+        # Each call: {'t', 'call', 'args', 'ms', and 'ok' (blob number) or 'err'}
+        self.calls = calls
+        self.blobs = blobs
+        self.event_types = event_types
+
+    @classmethod
+    def load(cls, path: str) -> 'Cassette':
+        header, calls, blobs, event_types = None, [], {}, {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if 'blob' in record:
+                        blobs[record['blob']] = record['data']
+                    elif 'call' in record:
+                        calls.append(record)
+                    elif 'event_type' in record:
+                        event_id, event_type = record['event_type']
+                        event_types[event_id] = event_type
+                    elif 'cassette' in record:
+                        header = record
+            except (EOFError, json.JSONDecodeError):
+                # The recording process was killed mid-write; keep what was flushed
+                log.warning(f"⚠️ Cassette {path} is truncated; replaying the {len(calls)} complete calls")
+        if header is None:
+            raise ValueError(f"{path} is not a cassette")
+        if header['cassette'] > CASSETTE_VERSION:
+            raise ValueError(f"{path}: cassette version {header['cassette']} is newer than supported")
+        return cls(header, calls, blobs, event_types)
+
+    def result(self, call: dict):
+        return self.blobs.get(call['ok'])
+
+    def recorded_day(self) -> date:
+        return datetime.fromisoformat(self.header['recorded_at']).date()
+
+
+def newest_cassette(directory: str, team_id: str) -> Optional[str]:
+    """Most recent cassette recorded for `team_id` in `directory`, if any."""
+    paths = glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(team_id)}-*{CASSETTE_SUFFIX}"))
+    return max(paths, default=None)
+
+
+def cassette_path(directory: str, team_id: str) -> str:
+    """New cassette file name for `team_id`; names sort by recording time."""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    return os.path.join(directory, f"{team_id}-{stamp}{CASSETTE_SUFFIX}")
+
+
+def _shift_date(value: str, days: int) -> str:
+    """Move the YYYY-MM-DD prefix of a date or ISO timestamp; the rest is kept as is."""
+    if not days or not isinstance(value, str) or len(value) < 10:
+        return value
+    try:
+        day = date.fromisoformat(value[:10])
+    except ValueError:
+        return value
+    return (day + timedelta(days=days)).isoformat() + value[10:]
+
+
+class ReplayCalendar(CalendarProvider):
+    """
+    Serves a recorded cassette deterministically.
+
+    Args:
+        cassette: A loaded `Cassette` or the path of one
+        speed: Divide recorded call durations by this (None = answer at once)
+        rebase: Shift events by whole days so the recording's first day is today
+    """
+
+    supports_writes = True
+
+    def __init__(self, cassette, speed: Optional[float] = None, rebase: bool = True):
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+        self.speed = speed
+        self.shift_days = (date.today() - self.cassette.recorded_day()).days if rebase else 0
+        self._lock = threading.Lock()
+        # (method, encoded args) → recorded calls not yet served; the last one is kept
+        self._tapes: dict[tuple, deque] = defaultdict(deque)
+        # Every event seen in any recorded answer, for queries that were never recorded
+        self._pool: dict[str, dict] = {}
+        for call in self.cassette.calls:
+            self._tapes[(call['call'], _encode(call['args']))].append(call)
+            result = self.cassette.result(call) if 'ok' in call else None
+            for event in (result if isinstance(result, list) else [result]):
+                if isinstance(event, dict) and 'id' in event:
+                    self._pool[str(event['id'])] = event
+        # Stats
+        self.served = 0
+        self.misses = 0
+
+    def _next(self, method: str, args: list) -> Optional[dict]:
+        with self._lock:
+            tape = self._tapes.get((method, _encode(args)))
+            if not tape:
+                self.misses += 1
+                return None
+            self.served += 1
+            return tape.popleft() if len(tape) > 1 else tape[0]
+
+    def _play(self, call: dict):
+        if self.speed:
+            time.sleep(call['ms'] / 1000 / self.speed)
+        if 'err' in call:
+            kind, message = call['err']
+            raise _ERRORS.get(kind, CalendarUnavailableError)(f"Replay: {message}")
+        return self._rebase(self.cassette.result(call))
+
+    def _rebase(self, result):
+        # Fresh copies every time, as a real provider decodes new dicts per response
+        if isinstance(result, list):
+            return [self._rebase_event(e) for e in result]
+        if isinstance(result, dict):
+            return self._rebase_event(result)
+        return result
+
+    def _rebase_event(self, event: dict) -> dict:
+        event = dict(event)
+        for field in _TIME_FIELDS:
+            if field in event:
+                event[field] = _shift_date(event[field], self.shift_days)
+        return event
+
+    def _from_pool(self, start_date: str, end_date: str) -> list:
+        events = [e for e in self._pool.values() if start_date <= e.get('start_dt', '')[:10] <= end_date]
+        events.sort(key=lambda e: e.get('start_dt', ''))
+        return self._rebase(events)
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        recorded = [_shift_date(start_date, -self.shift_days), _shift_date(end_date, -self.shift_days)]
+        call = self._next('get_events', recorded)
+        if call is not None:
+            return self._play(call)
+        start_date = start_date or datetime.now().strftime('%Y-%m-%d')
+        end_date = end_date or (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+        return self._from_pool(_shift_date(start_date, -self.shift_days), _shift_date(end_date, -self.shift_days))
+
+    def get_event(self, event_id) -> dict:
+        call = self._next('get_event', [event_id])
+        if call is None:
+            event = self._pool.get(str(event_id))
+            return self._rebase(event) if event else None
+        return self._play(call)
+
+    def get_upcoming_events(self, days=7) -> list:
+        call = self._next('get_upcoming_events', [days])
+        if call is None:
+            start = datetime.now().strftime('%Y-%m-%d')
+            end = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+            return self._from_pool(_shift_date(start, -self.shift_days), _shift_date(end, -self.shift_days))
+        return self._play(call)
+
+    def get_event_type(self, event) -> str:
+        event_type = self.cassette.event_types.get(str(event.get('id', '')))
+        if event_type is not None:
+            return event_type
+        return infer_event_type(event.get('title', '') + ' ' + (event.get('notes') or ''))
+
+    def append_availability_note(self, event_id, note: str) -> bool:
+        call = self._next('append_availability_note', [event_id, note])
+        if call is None:
+            # Notes differ between runs; any recorded write to the same event will do
+            writes = [c for c in self.cassette.calls
+                      if c['call'] == 'append_availability_note' and c['args'][0] == event_id]
+            if not writes:
+                return False
+            call = writes[-1]
+        return bool(self._play(call))
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+
+def summarize(cassette: Cassette) -> str:
+    header = cassette.header
+    calls = cassette.calls
+    span = calls[-1]['t'] if calls else 0.0
+    lines = [
+        f"{header.get('provider') or 'calendar'} cassette for {header.get('team') or '?'}, "
+        f"recorded {header['recorded_at']}",
+        f"{len(calls)} calls over {span:.0f}s, {len(cassette.blobs)} distinct results, "
+        f"{len(cassette.event_types)} event types",
+        "",
+        f"{'call':<26}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}",
+    ]
+    by_method = defaultdict(list)
+    for call in calls:
+        by_method[call['call']].append(call)
+    for method, group in sorted(by_method.items()):
+        durations = [c['ms'] for c in group]
+        p50, p95 = percentiles(durations, 0.50, 0.95)
+        errors = sum(1 for c in group if 'err' in c)
+        lines.append(f"{method:<26}{len(group):>7}{errors:>8}{p50:>9.1f}{p95:>9.1f}{max(durations):>9.1f}")
+    error_kinds = Counter(c['err'][0] for c in calls if 'err' in c)
+    if error_kinds:
+        lines.append("")
+        lines.append("errors: " + ", ".join(f"{kind} ×{n}" for kind, n in error_kinds.most_common()))
+    return "\n".join(lines)
+
+
+_REPLAYED = ('get_events', 'get_event', 'get_upcoming_events', 'append_availability_note')
+
+
+def replay(cassette: Cassette, speed: float) -> str:
+    """
+    Re-issue the recorded calls at their recorded offsets (divided by `speed`)
+    through `ResilientCalendar`, and report how the breaker and cache handled them.
+    """
+    from resilience import ResilientCalendar, is_stale
+
+    provider = ReplayCalendar(cassette, speed=speed, rebase=False)
+    calendar = ResilientCalendar(provider, 'replay', cassette.header.get('team') or 'replay',
+                                 cassette.header.get('provider') or 'replay')
+    latencies, outcomes = defaultdict(list), Counter()
+    started = time.monotonic()
+    for call in cassette.calls:
+        if call['call'] not in _REPLAYED:
+            continue
+        delay = started + call['t'] / speed - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        began = time.monotonic()
+        try:
+            result = getattr(calendar, call['call'])(*call['args'])
+            outcomes['stale' if is_stale(result) else 'ok'] += 1
+        except CalendarUnavailableError:
+            outcomes['unavailable'] += 1
+        latencies[call['call']].append((time.monotonic() - began) * 1000)
+    elapsed = time.monotonic() - started
+
+    lines = [
+        f"replayed {sum(len(v) for v in latencies.values())} calls in {elapsed:.1f}s at {speed:g}x "
+        f"({provider.served} matched, {provider.misses} unmatched)",
+        "outcomes: " + ", ".join(f"{kind} {n}" for kind, n in sorted(outcomes.items())),
+        f"circuit: {calendar.breaker.state}",
+        "",
+        f"{'call':<26}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}",
+    ]
+    for method, values in sorted(latencies.items()):
+        p50, p95 = percentiles(values, 0.50, 0.95)
+        lines.append(f"{method:<26}{len(values):>7}{p50:>9.1f}{p95:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect or replay calendar cassettes.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help="summarize a cassette")
+    info.add_argument('path')
+    play = sub.add_parser('replay', help="replay a cassette's calls through the cache and breaker")
+    play.add_argument('path')
+    play.add_argument('--speed', type=float, default=1.0,
+                      help="1 = recorded pacing and latency, 10 = ten times faster")
+    args = parser.parse_args(argv)
+
+    cassette = Cassette.load(args.path)
+    if args.command == 'info':
+        print(summarize(cassette))
+    else:
+        if args.speed <= 0:
+            parser.error("--speed must be positive")
+        print(replay(cassette, args.speed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Event change detection.
+
+Each reminder sync hashes the fields players care about for every event
+and diffs them against the previous snapshot for that team, producing
+typed changes (created, moved, cancelled, renamed, opponent changed).
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+CREATED = 'created'
+MOVED = 'moved'
+CANCELLED = 'cancelled'
+RENAMED = 'renamed'
+OPPONENT_CHANGED = 'opponent_changed'
+
+_TRACKED_FIELDS = ('title', 'start_dt', 'end_dt', 'who')
+
+
+def _parse(dt: str) -> datetime:
+    return datetime.fromisoformat(dt.replace('Z', '+00:00'))
+
+
+def event_hash(event: dict) -> str:
+    """Stable hash of the tracked fields of an event."""
+    blob = '\x1f'.join(str(event.get(f) or '') for f in _TRACKED_FIELDS)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+class EventChange:
+    """One detected change. `previous` holds the tracked fields before the change."""
+
+    __slots__ = ('kind', 'event', 'previous')
+
+    def __init__(self, kind: str, event: dict, previous: Optional[dict] = None):
+        self.kind = kind
+        self.event = event
+        self.previous = previous
+
+    def __repr__(self):
+        return f"EventChange({self.kind!r}, {self.event.get('id')!r})"
+
+
+class ChangeDetector:
+    """Keeps the last snapshot per team and diffs each new sync against it."""
+
+    def __init__(self):
+        # team_id → {event_id: (hash, tracked fields)}
+        self._snapshots: dict[str, dict[str, tuple]] = {}
+        # team_id → end of the range the snapshot was fetched for
+        self._window_ends: dict[str, datetime] = {}
+
+    def has_snapshot(self, team_id: str) -> bool:
+        return team_id in self._snapshots
+
+    def seed(self, team_id: str, events: list, window_end: datetime) -> None:
+        """Set the baseline without reporting changes (e.g. from cached events at startup)."""
+        self._snapshots[team_id] = self._snapshot(events)
+        self._window_ends[team_id] = window_end
+
+    @staticmethod
+    def _snapshot(events: list) -> dict:
+        return {
+            e['id']: (event_hash(e), {f: e.get(f) for f in _TRACKED_FIELDS})
+            for e in events
+        }
+
+    def update(self, team_id: str, events: list, window_end: datetime) -> list:
+        """
+        Diff `events` against the previous snapshot and store them as the new one.
+
+        The first sync for a team only records a baseline.  Events that started
+        in the past or lie beyond `window_end` (the end of the fetched range)
+        are ignored when they disappear, since they simply left the window.
+        Likewise an event is only reported as created if it starts before the
+        previous snapshot's window end; otherwise it has just entered the
+        range as the window slid forward.
+
+        Returns:
+            List of `EventChange`, in start-time order
+        """
+        previous = self._snapshots.get(team_id)
+        previous_end = self._window_ends.get(team_id)
+        current = self._snapshot(events)
+        self._snapshots[team_id] = current
+        self._window_ends[team_id] = window_end
+        if previous is None:
+            return []
+
+        now = datetime.now(timezone.utc)
+        changes = []
+        by_id = {e['id']: e for e in events}
+        for event_id, (digest, fields) in current.items():
+            event = by_id[event_id]
+            if event_id not in previous:
+                if now <= _parse(fields['start_dt']) < previous_end:
+                    changes.append(EventChange(CREATED, event))
+                continue
+            old_digest, old_fields = previous[event_id]
+            if digest == old_digest:
+                continue
+            if (fields['start_dt'], fields['end_dt']) != (old_fields['start_dt'], old_fields['end_dt']):
+                changes.append(EventChange(MOVED, event, old_fields))
+            if fields['title'] != old_fields['title']:
+                changes.append(EventChange(RENAMED, event, old_fields))
+            if (fields['who'] or '') != (old_fields['who'] or ''):
+                changes.append(EventChange(OPPONENT_CHANGED, event, old_fields))
+
+        for event_id, (_, old_fields) in previous.items():
+            if event_id in current:
+                continue
+            old_start = _parse(old_fields['start_dt'])
+            if now <= old_start < window_end:
+                changes.append(EventChange(CANCELLED, {'id': event_id, **old_fields}, old_fields))
+
+        changes.sort(key=lambda c: c.event.get('start_dt') or '')
+        return changes
+
+
+def format_change_lines(changes: list) -> list:
+    """Render changes as compact one-line notices using Discord timestamps."""
+    def ts(dt: str, style: str = 'f') -> str:
+        return f"<t:{int(_parse(dt).timestamp())}:{style}>"
+
+    lines = []
+    for change in changes:
+        event, prev = change.event, change.previous
+        title = event.get('title') or 'Event'
+        if change.kind == CREATED:
+            lines.append(f"🆕 **{title}** — {ts(event['start_dt'])}")
+        elif change.kind == MOVED:
+            lines.append(f"🔁 **{title}** moved: {ts(prev['start_dt'])} → {ts(event['start_dt'])}")
+        elif change.kind == CANCELLED:
+            lines.append(f"❌ **{title}** cancelled (was {ts(prev['start_dt'])})")
+        elif change.kind == RENAMED:
+            lines.append(f"✏️ **{prev['title'] or 'Event'}** renamed to **{title}**")
+        elif change.kind == OPPONENT_CHANGED:
+            old = prev.get('who') or 'TBD'
+            new = event.get('who') or 'TBD'
+            lines.append(f"🆚 **{title}** opponent: {old} → {new}")
+    return lines
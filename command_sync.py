@@ -0,0 +1,113 @@
+"""
+Automatic slash command sync.
+
+`bot.tree.sync()` is slow and rate-limited, so instead of syncing on every
+restart (or relying on someone to run `!sync`), we hash the app command
+tree and only sync when the hash differs from the one recorded after the
+last successful sync.
+"""
+import hashlib
+import json
+from typing import Optional
+
+import discord
+
+from config import Config
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+
+def _command_payload(command, tree) -> dict:
+    # discord.py >= 2.4 takes the tree; older releases take no arguments
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        return command.to_dict()
+
+
+def command_tree_hash(tree: discord.app_commands.CommandTree, guild: Optional[discord.Object] = None) -> str:
+    """Return a stable hash of the commands that would be synced for `guild` (None = global)."""
+    payload = sorted(
+        (_command_payload(cmd, tree) for cmd in tree.get_commands(guild=guild)),
+        key=lambda c: (c.get('type', 1), c['name']),
+    )
+    blob = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class CommandSyncState:
+    """Last-synced command hashes, persisted to a small JSON file."""
+
+    def __init__(self, file_path: str = Config.COMMAND_SYNC_FILE):
+        self.file_path = file_path
+        self._hashes: dict[str, str] = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.file_path) as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _save(self) -> None:
+        with open(self.file_path, 'w') as f:
+            json.dump(self._hashes, f, indent=2)
+
+    @staticmethod
+    def _key(guild_id: Optional[int]) -> str:
+        return f"guild:{guild_id}" if guild_id else 'global'
+
+    def get(self, guild_id: Optional[int] = None) -> Optional[str]:
+        return self._hashes.get(self._key(guild_id))
+
+    def set(self, digest: str, guild_id: Optional[int] = None) -> None:
+        self._hashes[self._key(guild_id)] = digest
+        self._save()
+
+
+async def sync_commands(bot, guild_id: Optional[int] = None, force: bool = False,
+                        state: CommandSyncState = None) -> Optional[int]:
+    """
+    Sync the command tree globally or to one guild if it changed since the last sync.
+
+    Guild syncs copy the global commands into the guild first, which makes
+    them show up immediately instead of after Discord's global propagation.
+
+    Returns:
+        Number of commands synced, or None if the tree was unchanged
+    """
+    state = state or CommandSyncState()
+    guild = discord.Object(id=guild_id) if guild_id else None
+    if guild:
+        bot.tree.copy_global_to(guild=guild)
+
+    digest = command_tree_hash(bot.tree, guild)
+    if not force and state.get(guild_id) == digest:
+        return None
+
+    synced = await bot.tree.sync(guild=guild)
+    state.set(digest, guild_id)
+    return len(synced)
+
+
+async def sync_if_changed(bot) -> None:
+    """
+    Startup hook: sync commands only where the tree has changed.
+
+    With `Config.SYNC_GUILD_IDS` set (test guilds), each listed guild is synced
+    directly and the global sync is skipped; otherwise commands sync globally.
+    """
+    state = CommandSyncState()
+    targets = Config.SYNC_GUILD_IDS or [None]
+    for guild_id in targets:
+        scope = f"guild {guild_id}" if guild_id else "global"
+        try:
+            count = await sync_commands(bot, guild_id, state=state)
+        except discord.HTTPException as e:
+            log.error(f"❌ Command sync ({scope}) failed: {e}")
+            continue
+        if count is None:
+            log.info(f"✅ Slash commands unchanged ({scope}) — skipping sync")
+        else:
+            log.info(f"✅ Synced {count} slash command(s) ({scope})")
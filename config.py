@@ -11,3 +11,138 @@ class Config:
 
     # How often to check for upcoming reminders (minutes)
     CHECK_INTERVAL = 5
+
+    # How far ahead (minutes) reminders are rendered and armed before they fire.
+    # Must exceed CHECK_INTERVAL so every reminder is planned before it is due.
+    REMINDER_PREFETCH_MINUTES = 12
+
+    # Default local time (HH:MM, team timezone) for the daily summary, and how
+    # many minutes early each summary is fetched and rendered
+    DAILY_SUMMARY_TIME = '12:00'
+    DAILY_SUMMARY_PREFETCH_MINUTES = 5
+
+    # Post a notice in the reminder channel when events are added, moved,
+    # renamed, cancelled or change opponent
+    CHANGE_NOTICES_ENABLED = True
+
+    # Catch-up after downtime or reconnect: reminders missed by at most
+    # CATCHUP_LATE_MINUTES are sent late (if the event hasn't started); others
+    # for events that started within CATCHUP_NOTICE_HOURS go in a "missed" notice
+    CATCHUP_ENABLED = True
+    CATCHUP_LATE_MINUTES = 30
+    CATCHUP_NOTICE_HOURS = 3
+    # Send today's daily summary late if it came due while the bot was down
+    CATCHUP_DAILY = True
+
+    # Sync slash commands at startup when the command tree has changed
+    AUTO_SYNC_COMMANDS = os.getenv('AUTO_SYNC_COMMANDS', 'true').lower() != 'false'
+
+    # Where the hash of the last synced command tree is stored
+    COMMAND_SYNC_FILE = 'command_sync.json'
+
+    # Comma-separated guild IDs to sync to directly instead of globally (test guilds)
+    SYNC_GUILD_IDS = [int(g) for g in os.getenv('SYNC_GUILD_IDS', '').split(',') if g.strip()]
+
+    # Calendar circuit breaker: consecutive failures before the circuit opens,
+    # and the backoff (seconds) before a probe request is allowed through
+    BREAKER_FAILURE_THRESHOLD = 3
+    BREAKER_BASE_BACKOFF = 30
+    BREAKER_MAX_BACKOFF = 600
+
+    # Serve the last good calendar result for up to this long during outages
+    STALE_MAX_AGE_HOURS = 24
+
+    # Calendar request timeouts (seconds). Each request is also bounded by the
+    # caller's remaining deadline; transient failures are retried while it allows
+    PROVIDER_TIMEOUT = 10
+    PROVIDER_CONNECT_TIMEOUT = 3
+    PROVIDER_RETRIES = 2
+    PROVIDER_RETRY_BACKOFF = 0.25
+
+    # Deadline budgets: slash commands must answer within Discord's 3s window,
+    # the reminder loop gets a budget per team, background prefetches get more
+    INTERACTION_DEADLINE = 2.5
+    REMINDER_DEADLINE = 8
+    BACKGROUND_DEADLINE = 30
+
+    # Default per-credential request limits when teams.json has no "rate_limits"
+    # entry for the credential (requests per minute, burst size)
+    TEAMUP_RATE_LIMIT_PER_MINUTE = 100
+    TEAMUP_RATE_LIMIT_BURST = 20
+    GOOGLE_RATE_LIMIT_PER_MINUTE = 300
+    GOOGLE_RATE_LIMIT_BURST = 50
+    ICS_RATE_LIMIT_PER_MINUTE = 30
+    ICS_RATE_LIMIT_BURST = 10
+
+    # Longest a request made off the event loop (scripts, tools) waits for a
+    # rate-limit token (seconds) before it is shed; background requests and
+    # anything on the bot's event loop never wait
+    RATE_LIMIT_MAX_WAIT = 1.0
+
+    # Minimum seconds between checks of an ICS feed for changes (conditional
+    # requests, so an unchanged feed costs a 304)
+    ICS_REFRESH_SECONDS = 60
+
+    # Minimum seconds between incremental syncs of a Google calendar mirror
+    GOOGLE_SYNC_SECONDS = 60
+
+    # How far back a full sync of a Google calendar mirror reaches (hours). Covers
+    # "today" queries and catch-up; older history is never fetched
+    GOOGLE_SYNC_HISTORY_HOURS = 24
+
+    # Calendar API base URLs. Point them at mock_calendar_server.py to run without
+    # network; GOOGLE_API_BASE_URL must include the service path (…/calendar/v3/),
+    # and with it set a team needs no Google credentials file
+    TEAMUP_API_BASE_URL = os.getenv('TEAMUP_API_BASE_URL', 'https://api.teamup.com')
+    GOOGLE_API_BASE_URL = os.getenv('GOOGLE_API_BASE_URL', '')
+
+    # Prometheus metrics endpoint (GET /metrics). Binds to localhost by default;
+    # set METRICS_HOST=0.0.0.0 only if the scraper runs on another machine
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() != 'false'
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+    # Logging: records are queued and written by a background thread to the
+    # console and a rotating JSON-lines file (LOG_FILE='' disables the file)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.getenv('LOG_FILE', 'logs/jarvis.log')
+    LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+    LOG_FILE_BACKUPS = 5
+    # Write JSON to the console too (for log shippers reading stdout)
+    LOG_JSON_CONSOLE = os.getenv('LOG_JSON_CONSOLE', 'false').lower() == 'true'
+    # Records beyond this many waiting to be written are dropped, not blocked on
+    LOG_QUEUE_SIZE = 10000
+    # Share of records kept for high-volume paths (logged with extra={'sample': name})
+    LOG_SAMPLE_RATES = {'autocomplete': 0.01}
+
+    # Profiling (!profile): longest capture, sampling interval, and how many
+    # functions the cProfile text summary lists
+    PROFILE_MAX_SECONDS = 300
+    PROFILE_SAMPLE_INTERVAL_MS = 5
+    PROFILE_TOP_FUNCTIONS = 40
+
+    # Report callbacks that block the event loop for longer than this (ms)
+    LOOP_STALL_MONITOR = os.getenv('LOOP_STALL_MONITOR', 'true').lower() != 'false'
+    LOOP_STALL_THRESHOLD_MS = 250
+
+    # Tracing: spans for commands, calendar calls, roster I/O and sends.
+    # TRACE_EXPORT='file' appends JSON lines to TRACE_FILE; 'otlp' posts
+    # OTLP/HTTP JSON to TRACE_OTLP_ENDPOINT (e.g. a local collector)
+    TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'true').lower() != 'false'
+    TRACE_HISTORY = 200
+    TRACE_EXPORT = os.getenv('TRACE_EXPORT', '')
+    TRACE_FILE = os.getenv('TRACE_FILE', 'logs/traces.jsonl')
+    TRACE_OTLP_ENDPOINT = os.getenv('TRACE_OTLP_ENDPOINT', 'http://127.0.0.1:4318/v1/traces')
+
+    # Reminder SLO shown in /botinfo: a reminder counts as on time if sent within
+    # this many seconds of its target; percentiles cover the last N deliveries
+    REMINDER_SLO_LAG_SECONDS = 60
+    REMINDER_HEALTH_SAMPLES = 256
+
+    # Calendar cassettes (see cassettes.py): record every team's provider traffic
+    # to CASSETTE_RECORD_DIR, or serve each team from its newest cassette in
+    # CASSETTE_REPLAY_DIR instead of the live provider (no credentials needed).
+    # CASSETTE_REPLAY_SPEED replays recorded latency (1 = as recorded, 0 = none)
+    CASSETTE_RECORD_DIR = os.getenv('CASSETTE_RECORD_DIR', '')
+    CASSETTE_REPLAY_DIR = os.getenv('CASSETTE_REPLAY_DIR', '')
+    CASSETTE_REPLAY_SPEED = float(os.getenv('CASSETTE_REPLAY_SPEED', '0'))
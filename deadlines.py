@@ -0,0 +1,164 @@
+"""
+Deadline budgets for calendar provider calls.
+
+Callers set a budget for the work they are doing. A slash command gets
+about 2.5 seconds so it can still answer inside Discord's 3-second window.
+The reminder loop gets a per-team budget, and background prefetches get a
+longer one. The budget is stored in a context variable, so provider code
+never has to pass it around.
+
+Each HTTP request uses whatever is left of the budget as its timeout, capped
+at PROVIDER_TIMEOUT. A retry only happens if enough budget remains for
+another attempt. Once the deadline has passed, no new requests are started
+and `DeadlineExceeded` is raised instead.
+
+Provider calls are made synchronously from the bot's coroutines, so on the
+event loop thread a retry goes out straight away rather than after a
+backoff sleep, which would stall every guild for its length.
+"""
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from calendar_provider import CalendarUnavailableError
+from config import Config
+from tracing import span
+
+# Attempts that would get less time than this are not worth starting
+_MIN_ATTEMPT_SECONDS = 0.2
+
+
+class DeadlineExceeded(CalendarUnavailableError):
+    """Raised when a provider call runs out of budget."""
+
+
+class Deadline:
+    """A point in (monotonic) time by which the current work must finish."""
+
+    __slots__ = ('at', 'budget')
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar('calendar_deadline', default=None)
+
+# Per-provider counters: '<provider>.calls', '.timeouts', '.retries', '.deadline_exceeded'
+_stats: Counter = Counter()
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def _tighter(seconds: float) -> Deadline:
+    new = Deadline(seconds)
+    outer = _current.get()
+    # A nested budget can only shrink the caller's, never extend it
+    return outer if outer and outer.at <= new.at else new
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Run the enclosed provider calls within `seconds`."""
+    token = _current.set(_tighter(seconds))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def start_interaction_deadline(created_at: datetime) -> None:
+    """
+    Set the budget for the rest of an interaction's task.
+
+    Discord starts the 3-second clock when the interaction is created, not
+    when we get it, so time already spent in transit counts against it.
+    """
+    elapsed = (datetime.now(timezone.utc) - created_at).total_seconds()
+    _current.set(Deadline(max(0.0, Config.INTERACTION_DEADLINE - max(0.0, elapsed))))
+
+
+def request_timeout(provider: str, cap: float = None):
+    """
+    Timeout for the next HTTP request: the remaining budget, capped at `cap`.
+
+    Returns a (connect, read) tuple suitable for `requests`.
+
+    Raises:
+        DeadlineExceeded: if there is no meaningful budget left
+    """
+    cap = Config.PROVIDER_TIMEOUT if cap is None else cap
+    current = _current.get()
+    total = min(cap, current.remaining()) if current else cap
+    if total < _MIN_ATTEMPT_SECONDS:
+        _stats[f'{provider}.deadline_exceeded'] += 1
+        raise DeadlineExceeded(f"{provider}: deadline exceeded")
+    return (min(Config.PROVIDER_CONNECT_TIMEOUT, total), total)
+
+
+def on_event_loop() -> bool:
+    """True when called (synchronously) from the thread running the asyncio loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def record_timeout(provider: str) -> None:
+    _stats[f'{provider}.timeouts'] += 1
+
+
+def call_with_retries(provider: str, fetch: Callable, retryable: Callable[[Exception], bool]):
+    """
+    Call `fetch()` and retry transient failures while the deadline allows.
+
+    Args:
+        provider: Name used for stats, e.g. 'teamup'
+        fetch: Performs one attempt; should take its timeout from `request_timeout`
+        retryable: Returns True for exceptions worth another attempt
+
+    Raises:
+        The last exception if attempts or budget run out
+    """
+    attempt = 0
+    while True:
+        _stats[f'{provider}.calls'] += 1
+        try:
+            with span(f'{provider}.request', attempt=attempt):
+                return fetch()
+        except Exception as e:
+            if attempt >= Config.PROVIDER_RETRIES or not retryable(e):
+                raise
+            backoff = Config.PROVIDER_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.0)
+            current = _current.get()
+            if current and current.remaining() < backoff + _MIN_ATTEMPT_SECONDS:
+                raise
+            attempt += 1
+            _stats[f'{provider}.retries'] += 1
+            if not on_event_loop():
+                time.sleep(backoff)
+
+
+def provider_stats() -> dict:
+    """{provider: {'calls', 'retries', 'timeouts', 'deadline_exceeded'}} since startup."""
+    stats: dict = {}
+    for key, count in _stats.items():
+        provider, metric = key.rsplit('.', 1)
+        stats.setdefault(provider, {
+            'calls': 0, 'retries': 0, 'timeouts': 0, 'deadline_exceeded': 0,
+        })[metric] = count
+    return stats
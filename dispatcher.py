@@ -0,0 +1,245 @@
+"""
+Outbound Discord message dispatcher.
+
+Background loops hand their messages to a shared `MessageDispatcher` instead
+of calling `channel.send` inline.  The dispatcher keeps one queue per
+channel, paces each channel with its own token bucket (so one busy channel
+never stalls the others behind 429 retries), always drains the most urgent
+work first, and merges messages queued for the same channel at the same
+moment into a single send.
+"""
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Optional
+
+import discord
+
+from metrics import DISPATCHER_SEND_SECONDS
+from tracing import span
+
+# Lower value = sent first
+PRIORITY_REMINDER = 0
+PRIORITY_NOTIFICATION = 1
+PRIORITY_SUMMARY = 2
+
+# Discord message limits
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBED_TOTAL = 6000
+
+# Discord allows roughly 5 messages per 5 seconds per channel
+_CHANNEL_BURST = 5
+_CHANNEL_REFILL_PER_SEC = 1.0
+
+
+class _Outbound:
+    __slots__ = ('priority', 'content', 'embeds', 'future', 'queued_at')
+
+    def __init__(self, priority: int, content: Optional[str], embeds: list):
+        self.priority = priority
+        self.content = content
+        self.embeds = embeds
+        self.future = asyncio.get_running_loop().create_future()
+        self.queued_at = time.monotonic()
+
+
+class _ChannelBucket:
+    """Token bucket pacing sends to a single channel."""
+
+    def __init__(self):
+        self.tokens = float(_CHANNEL_BURST)
+        self.updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(_CHANNEL_BURST, self.tokens + (now - self.updated) * _CHANNEL_REFILL_PER_SEC)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / _CHANNEL_REFILL_PER_SEC
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class MessageDispatcher:
+    """
+    Central async outbound queue for channel messages.
+
+    Args:
+        workers: Number of concurrent senders across all channels
+        coalesce_delay: Seconds to wait after a channel becomes ready so that
+            messages queued in the same instant can be merged
+    """
+
+    def __init__(self, workers: int = 4, coalesce_delay: float = 0.05):
+        self._workers = workers
+        self._coalesce_delay = coalesce_delay
+        self._pending: dict[int, list[_Outbound]] = {}
+        self._channels: dict[int, discord.abc.Messageable] = {}
+        self._buckets: dict[int, _ChannelBucket] = {}
+        self._scheduled: set[int] = set()
+        self._ready: Optional[asyncio.PriorityQueue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._seq = itertools.count()
+
+        # Stats
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+        self._latencies: deque = deque(maxlen=500)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._ready = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, channel, content: str = None, embed: discord.Embed = None,
+               embeds: list = None, priority: int = PRIORITY_NOTIFICATION) -> asyncio.Future:
+        """Queue a message and return a future resolving to the sent `discord.Message`."""
+        self.start()
+        all_embeds = list(embeds or [])
+        if embed is not None:
+            all_embeds.insert(0, embed)
+        item = _Outbound(priority, content, all_embeds)
+
+        self._channels[channel.id] = channel
+        self._pending.setdefault(channel.id, []).append(item)
+        self._schedule(channel.id, priority)
+        return item.future
+
+    async def send(self, channel, content: str = None, embed: discord.Embed = None,
+                   embeds: list = None, priority: int = PRIORITY_NOTIFICATION) -> discord.Message:
+        """Queue a message and wait until it has been delivered."""
+        # Covers queueing and pacing as well as the send itself
+        with span('discord.send', channel_id=channel.id, priority=priority):
+            return await self.submit(channel, content, embed, embeds, priority)
+
+    def queue_depth(self) -> int:
+        return sum(len(items) for items in self._pending.values())
+
+    def stats(self) -> dict:
+        """Return queue depth, delivery counters and send latency percentiles (ms)."""
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            'queue_depth': self.queue_depth(),
+            'channels_waiting': len(self._scheduled),
+            'sent': self.sent,
+            'merged': self.merged,
+            'failed': self.failed,
+            'latency_p50_ms': pct(0.50),
+            'latency_p95_ms': pct(0.95),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _schedule(self, channel_id: int, priority: int, delay: float = 0.0) -> None:
+        if channel_id in self._scheduled:
+            return
+        self._scheduled.add(channel_id)
+        entry = (priority, next(self._seq), channel_id)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._ready.put_nowait, entry)
+        else:
+            self._ready.put_nowait(entry)
+
+    def _take_batch(self, channel_id: int) -> list:
+        """Pop the most urgent run of messages for a channel that fits in one send."""
+        items = sorted(self._pending.get(channel_id, []), key=lambda i: i.priority)
+        batch, length, embed_count, embed_chars = [], 0, 0, 0
+        for item in items:
+            item_length = len(item.content or '') + (1 if batch else 0)
+            item_embed_chars = sum(len(e) for e in item.embeds)
+            if batch and (
+                item.priority != batch[0].priority
+                or length + item_length > MAX_CONTENT_LENGTH
+                or embed_count + len(item.embeds) > MAX_EMBEDS
+                or embed_chars + item_embed_chars > MAX_EMBED_TOTAL
+            ):
+                break
+            batch.append(item)
+            length += item_length
+            embed_count += len(item.embeds)
+            embed_chars += item_embed_chars
+
+        remaining = items[len(batch):]
+        if remaining:
+            self._pending[channel_id] = remaining
+        else:
+            self._pending.pop(channel_id, None)
+        return batch
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, channel_id = await self._ready.get()
+            bucket = self._buckets.setdefault(channel_id, _ChannelBucket())
+            wait = bucket.wait_time()
+            if wait > 0:
+                # Out of tokens — requeue later instead of blocking this worker
+                self._scheduled.discard(channel_id)
+                pending = self._pending.get(channel_id)
+                if pending:
+                    self._schedule(channel_id, min(i.priority for i in pending), delay=wait)
+                continue
+
+            await asyncio.sleep(self._coalesce_delay)
+            batch = self._take_batch(channel_id)
+            try:
+                if batch:
+                    bucket.take()
+                    await self._deliver(channel_id, batch)
+            finally:
+                # Only after the send, so a message submitted meanwhile can't
+                # start a second, concurrent send to the same channel
+                self._scheduled.discard(channel_id)
+
+            pending = self._pending.get(channel_id)
+            if pending:
+                self._schedule(channel_id, min(i.priority for i in pending))
+
+    async def _deliver(self, channel_id: int, batch: list) -> None:
+        channel = self._channels[channel_id]
+        kwargs = {'content': "\n".join(i.content for i in batch if i.content) or None}
+        embeds = [e for i in batch for e in i.embeds]
+        if embeds:
+            kwargs['embeds'] = embeds
+        try:
+            message = await channel.send(**kwargs)
+        except Exception as e:
+            self.failed += len(batch)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        self.sent += 1
+        self.merged += len(batch) - 1
+        for item in batch:
+            self._latencies.append(now - item.queued_at)
+            DISPATCHER_SEND_SECONDS.observe(now - item.queued_at)
+            if not item.future.done():
+                item.future.set_result(message)
@@ -88,72 +88,80 @@ def format_event_embed(event, roster=None, event_type=None):
     return embed
 
 
-def format_upcoming_events_embed(events, event_types=None, rosters=None):
-    """Create an embed for listing multiple upcoming events
+# Discord embed limits
+EMBED_MAX_FIELDS = 25
+EMBED_MAX_TOTAL = 6000
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+
+# Room kept free on every page for the title, description and footer
+_PAGE_HEADER_RESERVE = 500
+
+# Events shown per page in list views
+UPCOMING_PAGE_SIZE = 10
+
+
+def _truncate(text, limit):
+    """Clip text to a Discord limit, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _type_emoji(event_type):
+    emoji = "🎮"
+    if event_type:
+        type_lower = event_type.lower()
+        if "warm" in type_lower:
+            emoji = "🔥"
+        elif "official" in type_lower:
+            emoji = "🏆"
+        elif "vod" in type_lower:
+            emoji = "🎥"
+    return emoji
+
+
+def build_upcoming_fields(events, event_types=None, rosters=None):
+    """Return one (name, value) embed field per event, sorted by start time.
 
     Args:
         events: List of event dictionaries
         event_types: Optional dictionary mapping event IDs to their types
         rosters: Optional dictionary mapping event IDs to roster lists
     """
-    if not events:
-        return None
-
-    # Sort by start time
-    events.sort(key=lambda x: x['start_dt'])
-
-    embed = discord.Embed(
-        title="📋 Upcoming Events",
-        color=discord.Color.blue(),
-        description=f"Next {len(events)} scheduled event{'s' if len(events) > 1 else ''}"
-    )
-
-    for event in events[:10]:  # Limit to 10 events
+    fields = []
+    for event in sorted(events, key=lambda x: x['start_dt']):
         start_time = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
 
         # Convert to Unix timestamp for Discord's timezone support
         unix_timestamp = int(start_time.timestamp())
 
-        # Get event type if available
         event_type = event_types.get(event['id']) if event_types else None
-        emoji = "🎮"
-        if event_type:
-            type_lower = event_type.lower()
-            if "warm" in type_lower:
-                emoji = "🔥"
-            elif "official" in type_lower:
-                emoji = "🏆"
-            elif "vod" in type_lower:
-                emoji = "🎥"
-
-        # Create value with optional opponent and type info
+
         # Use Discord timestamp format for automatic timezone conversion
         value_parts = [f"📅 <t:{unix_timestamp}:F>"]
         if event_type:
-            value_parts.append(f"{emoji} Type: {event_type}")
+            value_parts.append(f"{_type_emoji(event_type)} Type: {event_type}")
         if event.get('who'):
             value_parts.append(f"🆚 {event['who']}")
 
-        # Add roster if available
-        if rosters and event['id'] in rosters:
-            roster = rosters[event['id']]
-            if roster:
-                roster_text = ", ".join(roster[:6])  # Show first 6 players
-                if len(roster) > 6:
-                    roster_text += f" +{len(roster) - 6} more"
-                value_parts.append(f"👥 Roster: {roster_text}")
+        roster = rosters.get(event['id']) if rosters else None
+        if roster:
+            roster_text = ", ".join(roster[:6])  # Show first 6 players
+            if len(roster) > 6:
+                roster_text += f" +{len(roster) - 6} more"
+            value_parts.append(f"👥 Roster: {roster_text}")
 
-        embed.add_field(
-            name=event.get('title', 'Event'),
-            value="\n".join(value_parts),
-            inline=False
-        )
+        fields.append((
+            _truncate(event.get('title', 'Event'), FIELD_NAME_LIMIT),
+            _truncate("\n".join(value_parts), FIELD_VALUE_LIMIT),
+        ))
+    return fields
 
-    return embed
 
+def build_week_fields(events, event_types=None, rosters=None):
+    """Return embed fields grouping events by day.
 
-def format_week_events_embed(events, event_types=None, rosters=None):
-    """Create an organized embed for week view with events grouped by day
+    A day whose events don't fit in one field continues in follow-up
+    "(cont.)" fields, split between events rather than mid-event.
 
     Args:
         events: List of event dictionaries
@@ -162,51 +170,27 @@ def format_week_events_embed(events, event_types=None, rosters=None):
     """
     from collections import defaultdict
 
-    if not events:
-        return None
-
-    # Sort by start time
-    events.sort(key=lambda x: x['start_dt'])
-
     # Group events by day
     events_by_day = defaultdict(list)
-    for event in events:
+    for event in sorted(events, key=lambda x: x['start_dt']):
         start_time = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
         day_name = start_time.strftime('%A, %B %d')  # e.g., "Monday, February 17"
-        events_by_day[day_name].append(event)
-
-    embed = discord.Embed(
-        title="📅 This Week's Schedule",
-        color=discord.Color.blue(),
-        description=f"Showing {len(events)} upcoming event{'s' if len(events) > 1 else ''}"
-    )
+        events_by_day[day_name].append((event, start_time))
 
-    # Add each day as a field
+    fields = []
     for day_name, day_events in events_by_day.items():
         event_blocks = []
 
-        for event in day_events:
-            start_time = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
+        for event, start_time in day_events:
             unix_timestamp = int(start_time.timestamp())
-
-            # Get event type
             event_type = event_types.get(event['id']) if event_types else None
-            emoji = "🎮"
-            if event_type:
-                type_lower = event_type.lower()
-                if "warm" in type_lower:
-                    emoji = "🔥"
-                elif "official" in type_lower:
-                    emoji = "🏆"
-                elif "vod" in type_lower:
-                    emoji = "🎥"
 
             # Build event block with title and details
             event_text = f"**{event.get('title', 'Event')}** • <t:{unix_timestamp}:t>"
 
             details = []
             if event_type:
-                details.append(f"{emoji} {event_type}")
+                details.append(f"{_type_emoji(event_type)} {event_type}")
             if event.get('who'):
                 details.append(f"🆚 {event['who']}")
 
@@ -214,26 +198,90 @@ def format_week_events_embed(events, event_types=None, rosters=None):
                 event_text += f"\n{' | '.join(details)}"
 
             # Add roster on separate line if available
-            if rosters and event['id'] in rosters:
-                roster = rosters[event['id']]
-                if roster:
-                    roster_text = ", ".join(roster)
-                    event_text += f"\n👥 {roster_text}"
+            roster = rosters.get(event['id']) if rosters else None
+            if roster:
+                event_text += f"\n👥 {', '.join(roster)}"
+
+            event_blocks.append(_truncate(event_text, FIELD_VALUE_LIMIT))
+
+        name = f"📆 {day_name}"
+        value = ""
+        for block in event_blocks:
+            candidate = f"{value}\n\n{block}" if value else block
+            if len(candidate) > FIELD_VALUE_LIMIT:
+                fields.append((name, value))
+                name = f"📆 {day_name} (cont.)"
+                candidate = block
+            value = candidate
+        fields.append((name, value))
+    return fields
+
+
+def paginate_fields(fields, max_fields=EMBED_MAX_FIELDS, max_chars=EMBED_MAX_TOTAL - _PAGE_HEADER_RESERVE):
+    """Split (name, value) fields into pages that each fit in one embed."""
+    pages = []
+    page, page_chars = [], 0
+    for name, value in fields:
+        size = len(name) + len(value)
+        if page and (len(page) >= max_fields or page_chars + size > max_chars):
+            pages.append(page)
+            page, page_chars = [], 0
+        page.append((name, value))
+        page_chars += size
+    if page:
+        pages.append(page)
+    return pages
+
+
+def _add_fields(embed, fields):
+    for name, value in fields:
+        embed.add_field(name=name, value=value, inline=False)
+    return embed
 
-            event_blocks.append(event_text)
 
-        # Add field for this day with clear separation
-        embed.add_field(
-            name=f"━━━━━━━━━━━━━━━━━━━━━━",
-            value="",
-            inline=False
-        )
-        embed.add_field(
-            name=f"📆 {day_name}",
-            value="\n\n".join(event_blocks),
-            inline=False
-        )
+def format_upcoming_events_embed(events, event_types=None, rosters=None):
+    """Create an embed for listing multiple upcoming events
 
+    Only the first page of events is shown; use `EventPaginator` from
+    pagination.py to let users page through the rest.
+
+    Args:
+        events: List of event dictionaries
+        event_types: Optional dictionary mapping event IDs to their types
+        rosters: Optional dictionary mapping event IDs to roster lists
+    """
+    if not events:
+        return None
+
+    embed = discord.Embed(
+        title="📋 Upcoming Events",
+        color=discord.Color.blue(),
+        description=f"Next {len(events)} scheduled event{'s' if len(events) > 1 else ''}"
+    )
+    fields = build_upcoming_fields(events, event_types, rosters)
+    return _add_fields(embed, paginate_fields(fields, max_fields=UPCOMING_PAGE_SIZE)[0])
+
+
+def format_week_events_embed(events, event_types=None, rosters=None):
+    """Create an organized embed for week view with events grouped by day
+
+    Days that don't fit within Discord's embed limits are left for later
+    pages; use `EventPaginator` from pagination.py to show them.
+
+    Args:
+        events: List of event dictionaries
+        event_types: Optional dictionary mapping event IDs to their types
+        rosters: Optional dictionary mapping event IDs to roster lists
+    """
+    if not events:
+        return None
+
+    embed = discord.Embed(
+        title="📅 This Week's Schedule",
+        color=discord.Color.blue(),
+        description=f"Showing {len(events)} upcoming event{'s' if len(events) > 1 else ''}"
+    )
+    _add_fields(embed, paginate_fields(build_week_fields(events, event_types, rosters))[0])
     embed.set_footer(text="Times shown in your local timezone")
 
     return embed
@@ -276,5 +324,99 @@ def format_bot_info_embed(config):
         value=f"<@&{config.get('coach_role_id')}>" if config.get('coach_role_id') else "❌ Not Set",
         inline=True
     )
+
+    quota = config.get('calendar_quota')
+    if quota:
+        shared = f" • shared with {quota['shared_with']} other team(s)" if quota['shared_with'] else ""
+        embed.add_field(
+            name="Calendar Quota",
+            value=(
+                f"{quota['last_minute']} req/min, {quota['last_hour']} req/h by this team\n"
+                f"Limit {quota['per_minute']:g}/min • {quota['tokens']}/{quota['burst']} burst left{shared}\n"
+                f"Throttled: {quota['waited']} waited, {quota['shed']} shed"
+            ),
+            inline=False
+        )
+
+    health = config.get('reminder_health')
+    calendar = config.get('calendar_health')
+    if health or calendar:
+        embed.add_field(name="Reminder Health", value=_format_reminder_health(health, calendar), inline=False)
+
+    ratios = config.get('cache_hit_ratios')
+    if ratios:
+        embed.add_field(
+            name="Cache Hit Rates",
+            value=" • ".join(
+                f"{name.replace('_', ' ')} {100 * hits / total:.0f}% ({int(hits)}/{int(total)})"
+                for name, (hits, total) in sorted(ratios.items()) if total
+            ) or "No lookups yet",
+            inline=False
+        )
     
     return embed
+
+
+def _format_seconds(seconds):
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.1f}s"
+
+
+def _format_reminder_health(health, calendar):
+    lines = []
+    if health and health['samples']:
+        target = health['target_seconds']
+        on_time = health['on_time_pct']
+        status = "✅" if on_time >= 99 else "⚠️" if on_time >= 95 else "❌"
+        lines.append(
+            f"{status} {on_time:.1f}% on time (≤{target:g}s) over last {health['samples']} • "
+            f"p50 {_format_seconds(health['lag_p50'])} • p95 {_format_seconds(health['lag_p95'])} • "
+            f"max {_format_seconds(health['lag_max'])}"
+        )
+    if health:
+        lines.append(
+            f"Sent {health['sent']} • failed {health['failed']} • "
+            f"late (catch-up) {health['late']} • skipped {health['skipped']}"
+        )
+        if health['last_sent']:
+            lines.append(f"Last reminder <t:{int(health['last_sent'].timestamp())}:R>")
+    if calendar:
+        synced = calendar['last_success']
+        sync_text = f"<t:{int(synced.timestamp())}:R>" if synced else "never"
+        circuit = "" if calendar['circuit'] == 'closed' else f" • ⚠️ circuit {calendar['circuit']}"
+        lines.append(f"Calendar last synced {sync_text}{circuit}")
+    if health and (health['checks_stale'] or health['checks_failed']):
+        lines.append(
+            f"Reminder checks: {health['checks_stale']} on stale data, {health['checks_failed']} failed"
+            + (f" (last: {health['last_check']})" if health['last_check'] != 'fresh' else "")
+        )
+    return "\n".join(lines) or "No reminders sent yet"
+
+
+def format_trace_embed(root):
+    """Create an embed breaking a traced interaction down by stage"""
+    total_ms = root.duration * 1000
+    lines = [f"**{total_ms:.0f}ms** total" + (f" • ❌ {root.error}" if root.error else ""), ""]
+    for span in root.spans[1:]:
+        depth, parent = 0, span.parent
+        while parent is not None and parent is not root:
+            depth, parent = depth + 1, parent.parent
+        offset_ms = (span.start_ns - root.start_ns) / 1e6
+        detail = ", ".join(f"{k}={v}" for k, v in span.attributes.items() if k not in ('team', 'guild_id'))
+        line = f"{'› ' * depth}`+{offset_ms:.0f}ms` **{span.name}** {span.duration * 1000:.1f}ms"
+        if detail:
+            line += f" ({detail})"
+        if span.error:
+            line += " ❌"
+        lines.append(line)
+
+    direct_ms = sum(s.duration for s in root.spans[1:] if s.parent is root) * 1000
+    lines.append(f"*Untraced handler time* {max(0.0, total_ms - direct_ms):.1f}ms")
+
+    embed = discord.Embed(
+        title=f"🧭 Trace: {root.name}",
+        description=_truncate("\n".join(lines), 4000),
+        color=discord.Color.red() if root.error else discord.Color.blurple(),
+        timestamp=datetime.fromtimestamp(root.start_ns / 1e9)
+    )
+    embed.set_footer(text=f"Team {root.attributes.get('team', '—')} • trace {root.trace_id[:16]}")
+    return embed
@@ -0,0 +1,60 @@
+"""
+Title parsing shared by providers whose events carry no structured type
+(Google Calendar, ICS feeds): event type, team name and opponent are
+inferred from the event's title and notes.
+"""
+import re
+
+_TYPE_KEYWORDS = [
+    ('Scrim',    ['scrim']),
+    ('Official', ['official']),
+    ('Warmup',   ['warmup', 'warm up']),
+    ('VOD',      ['vod']),
+]
+
+# Keywords to strip when extracting the team name from a title
+_STRIP_WORDS = ['scrim', 'official', 'warmup', 'warm up', 'vod']
+
+
+def infer_event_type(text: str):
+    text = text.lower()
+    for type_name, keywords in _TYPE_KEYWORDS:
+        if any(kw in text for kw in keywords):
+            return type_name
+    # "vs" without a known keyword → treat as official match
+    if ' vs ' in text:
+        return 'Official'
+    return None
+
+
+def parse_team_name(title: str) -> str:
+    """
+    Extract the team name from an event title.
+    e.g. 'SSG Scrim' → 'SSG'
+         'SSG Scrim vs TeamX' → 'SSG'
+         'SSG Official vs TeamX' → 'SSG'
+    """
+    name = title
+    # Remove "vs ..." suffix first
+    lower = name.lower()
+    for sep in [' vs ', ' vs.']:
+        idx = lower.find(sep)
+        if idx != -1:
+            name = name[:idx]
+            lower = name.lower()
+    # Remove event-type words
+    for word in _STRIP_WORDS:
+        # Case-insensitive word removal (whole word match)
+        name = re.sub(r'(?i)\b' + re.escape(word) + r'\b', '', name)
+    return name.strip()
+
+
+def parse_opponent(title: str) -> str:
+    """Try to extract opponent from titles like 'SSG Scrim vs TeamName'."""
+    lower = title.lower()
+    for sep in [' vs ', ' vs.']:
+        if sep in lower:
+            parts = title.split(sep, 1)
+            if len(parts) == 2:
+                return parts[1].strip()
+    return ''
@@ -3,72 +3,62 @@ Google Calendar provider.
 Uses a service account for authentication — share your calendar with the
 service account email address found in the credentials JSON file.
 
+The calendar is mirrored locally: one full sync fetches recurring masters,
+their exceptions and single events (not server-expanded instances) ending
+after GOOGLE_SYNC_HISTORY_HOURS ago, then incremental syncs with Google's
+sync token fetch only what changed.
+Windows are answered by expanding the stored series locally.
+
 Required packages: google-api-python-client google-auth-httplib2 google-auth-oauthlib
 """
+import socket
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
 from zoneinfo import ZoneInfo
 
+import httplib2
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from config import Config
+from deadlines import call_with_retries, record_timeout, request_timeout
+from event_text import infer_event_type, parse_opponent, parse_team_name
+from recurrence import OccurrenceIndex, RecurringSeries, parse_recurrence_lines, resolve_tz
+from logging_setup import get_logger
 
-from calendar_provider import CalendarProvider
+log = get_logger(__name__)
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.events']
 
-_TYPE_KEYWORDS = [
-    ('Scrim',    ['scrim']),
-    ('Official', ['official']),
-    ('Warmup',   ['warmup', 'warm up']),
-    ('VOD',      ['vod']),
-]
-
-# Keywords to strip when extracting the team name from a title
-_STRIP_WORDS = ['scrim', 'official', 'warmup', 'warm up', 'vod']
-
-
-def _infer_event_type(text: str):
-    text = text.lower()
-    for type_name, keywords in _TYPE_KEYWORDS:
-        if any(kw in text for kw in keywords):
-            return type_name
-    # "vs" without a known keyword → treat as official match
-    if ' vs ' in text:
-        return 'Official'
-    return None
-
-
-def _parse_team_name(title: str) -> str:
-    """
-    Extract the team name from a Google Calendar event title.
-    e.g. 'SSG Scrim' → 'SSG'
-         'SSG Scrim vs TeamX' → 'SSG'
-         'SSG Official vs TeamX' → 'SSG'
-    """
-    name = title
-    # Remove "vs ..." suffix first
-    lower = name.lower()
-    for sep in [' vs ', ' vs.']:
-        idx = lower.find(sep)
-        if idx != -1:
-            name = name[:idx]
-            lower = name.lower()
-    # Remove event-type words
-    for word in _STRIP_WORDS:
-        # Case-insensitive word removal (whole word match)
-        import re
-        name = re.sub(r'(?i)\b' + re.escape(word) + r'\b', '', name)
-    return name.strip()
-
-
-def _parse_opponent(title: str) -> str:
-    """Try to extract opponent from titles like 'SSG Scrim vs TeamName'."""
-    lower = title.lower()
-    for sep in [' vs ', ' vs.']:
-        if sep in lower:
-            parts = title.split(sep, 1)
-            if len(parts) == 2:
-                return parts[1].strip()
-    return ''
+# Only the fields the bot uses, to keep sync payloads small
+_SYNC_FIELDS = (
+    'items(id,status,summary,description,location,start,end,recurrence,'
+    'recurringEventId,originalStartTime),nextPageToken,nextSyncToken'
+)
+
+
+def _retryable(error: Exception) -> bool:
+    """Timeouts, dropped connections, 429 and 5xx are worth another attempt."""
+    if isinstance(error, HttpError):
+        return error.resp.status == 429 or error.resp.status >= 500
+    return isinstance(error, (socket.timeout, ConnectionError, httplib2.HttpLib2Error))
+
+
+def _parse_time(value: dict, default_tz) -> tuple:
+    """Google start/end/originalStartTime → (aware datetime in the event's timezone, all_day)."""
+    tz = resolve_tz(value.get('timeZone'), default_tz)
+    if value.get('dateTime'):
+        return datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00')).astimezone(tz), False
+    return datetime.strptime(value['date'], '%Y-%m-%d').replace(tzinfo=tz), True
+
+
+def _format_time(dt: datetime, all_day: bool) -> dict:
+    return {'date': dt.strftime('%Y-%m-%d')} if all_day else {'dateTime': dt.isoformat()}
 
 
 def _normalize(event: dict) -> dict:
@@ -83,62 +73,195 @@ def _normalize(event: dict) -> dict:
     return {
         'id':        event['id'],
         'title':     title,
-        'team_name': _parse_team_name(title),  # cleaned name used for roster lookup
+        'team_name': parse_team_name(title),  # cleaned name used for roster lookup
         'start_dt':  start_dt,
         'end_dt':    end_dt,
         'notes':     event.get('description', ''),
         'location':  event.get('location', ''),
-        'who':       _parse_opponent(title),
+        'who':       parse_opponent(title),
     }
 
 
+def _set_timeout(http: httplib2.Http, seconds: float) -> None:
+    """Apply `seconds` to new connections of `http` and to the sockets it already holds."""
+    http.timeout = seconds
+    for conn in http.connections.values():
+        conn.timeout = seconds
+        if conn.sock is not None:
+            conn.sock.settimeout(seconds)
+
+
 class GoogleCalendarAPI(CalendarProvider):
     """Read-only Google Calendar provider using a service account."""
 
-    def __init__(self, calendar_id: str, credentials_file: str, tz_name: str = None):
+    supports_writes = True
+
+    def __init__(self, calendar_id: str, credentials_file: str, tz_name: str = None,
+                 acquire: Optional[Callable[[], None]] = None, base_url: str = None):
         self.calendar_id = calendar_id
+        # Called before every request to take a token from the credential's rate limiter
+        self._acquire = acquire
         self._tz = ZoneInfo(tz_name) if tz_name else timezone.utc
-        creds = service_account.Credentials.from_service_account_file(
-            credentials_file, scopes=SCOPES
+        base_url = Config.GOOGLE_API_BASE_URL if base_url is None else base_url
+        if credentials_file or not base_url:
+            self._creds = service_account.Credentials.from_service_account_file(
+                credentials_file, scopes=SCOPES
+            )
+        else:
+            # A stand-in server (mock_calendar_server.py) needs no account
+            self._creds = AnonymousCredentials()
+        self._service = build(
+            'calendar', 'v3', credentials=self._creds,
+            client_options={'api_endpoint': base_url} if base_url else None,
         )
-        self._service = build('calendar', 'v3', credentials=creds)
+        # One Http per provider so its connections are reused across calls
+        self._http = AuthorizedHttp(self._creds, http=httplib2.Http(timeout=Config.PROVIDER_TIMEOUT))
+        # event id → raw event (masters, single events and instance exceptions)
+        self._mirror: dict[str, dict] = {}
+        self._sync_token: Optional[str] = None
+        self._index: Optional[OccurrenceIndex] = None
+        self._synced_at = 0.0
 
-    def get_events(self, start_date=None, end_date=None) -> list:
-        now = datetime.now(timezone.utc)
-        if start_date:
-            time_min = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=self._tz).isoformat()
-        else:
-            time_min = now.isoformat()
+    def _execute(self, request, retry: bool = True):
+        """
+        Execute an API request with a deadline-bounded socket timeout.
 
-        if end_date:
-            # end of the end_date day — extend to 6am next day for late-night sessions
-            time_max = (datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=self._tz)
-                        + timedelta(days=1, hours=6)).isoformat()
-        else:
-            time_max = (now + timedelta(days=7)).isoformat()
+        The pooled connections keep their sockets, so each attempt resizes
+        the timeout of the shared Http and its open connections to the
+        remaining budget.
+        """
+        def attempt():
+            if self._acquire:
+                self._acquire()
+            _, read_timeout = request_timeout('google')
+            _set_timeout(self._http.http, read_timeout)
+            try:
+                return request.execute(http=self._http)
+            except socket.timeout:
+                record_timeout('google')
+                raise
 
-        try:
-            result = self._service.events().list(
+        return call_with_retries('google', attempt, _retryable if retry else (lambda e: False))
+
+    # ------------------------------------------------------------------
+    # Local mirror
+    # ------------------------------------------------------------------
+
+    def _list_all(self, **params) -> tuple:
+        """Page through events.list; returns (items, nextSyncToken)."""
+        items, page_token = [], None
+        while True:
+            result = self._execute(self._service.events().list(
                 calendarId=self.calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime',
-            ).execute()
-            return [_normalize(e) for e in result.get('items', [])]
-        except Exception as e:
-            print(f"Error fetching Google Calendar events: {e}")
-            return []
+                singleEvents=False,
+                showDeleted=True,
+                maxResults=2500,
+                pageToken=page_token,
+                fields=_SYNC_FIELDS,
+                **params,
+            ))
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return items, result.get('nextSyncToken')
 
-    def get_event(self, event_id) -> dict:
+    def _sync(self) -> OccurrenceIndex:
+        """Bring the mirror up to date (at most every GOOGLE_SYNC_SECONDS) and return its index."""
+        if self._index is not None and time.monotonic() - self._synced_at < Config.GOOGLE_SYNC_SECONDS:
+            return self._index
         try:
-            raw = self._service.events().get(
-                calendarId=self.calendar_id, eventId=event_id
-            ).execute()
-            return _normalize(raw)
+            mirror = self._mirror
+            items, token = None, None
+            if self._sync_token:
+                try:
+                    items, token = self._list_all(syncToken=self._sync_token)
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    log.warning("⚠️ Google sync token expired — running a full sync")
+            if items is None:
+                # Bounded so a full sync fits in a request's deadline however
+                # long the calendar's history is
+                since = datetime.now(timezone.utc) - timedelta(hours=Config.GOOGLE_SYNC_HISTORY_HOURS)
+                items, token = self._list_all(timeMin=since.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                mirror = {}
+        except CalendarUnavailableError:
+            raise
         except Exception as e:
-            print(f"Error fetching Google Calendar event {event_id}: {e}")
-            return None
+            log.error(f"Error syncing Google Calendar: {e}")
+            raise CalendarUnavailableError(f"Google Calendar: {e}") from e
+
+        for raw in items:
+            # Cancelled instances of a series stay as exclusions; anything else cancelled is gone
+            if raw.get('status') == 'cancelled' and not raw.get('recurringEventId'):
+                mirror.pop(raw['id'], None)
+            else:
+                mirror[raw['id']] = raw
+        self._mirror = mirror
+        self._sync_token = token
+        if items or self._index is None:
+            self._index = self._build_index()
+        self._synced_at = time.monotonic()
+        return self._index
+
+    def _build_index(self) -> OccurrenceIndex:
+        index = OccurrenceIndex()
+        exceptions = []
+        for raw in self._mirror.values():
+            if raw.get('recurringEventId'):
+                exceptions.append(raw)
+                continue
+            if raw.get('status') == 'cancelled':
+                continue
+            try:
+                start, all_day = _parse_time(raw['start'], self._tz)
+                end, _ = _parse_time(raw['end'], self._tz)
+                if raw.get('recurrence'):
+                    rule, exdates, rdates = parse_recurrence_lines(raw['recurrence'], start.tzinfo)
+                    series = RecurringSeries(start, end - start, rule, exdates, rdates)
+                    index.add_series(raw['id'], series, raw, all_day)
+                else:
+                    index.add_single(raw['id'], start, end - start, raw)
+            except (KeyError, ValueError) as e:
+                log.warning(f"⚠️ Skipping Google Calendar event {raw.get('id')}: {e}")
+
+        # Moved or cancelled instances replace the occurrence they came from
+        for raw in exceptions:
+            try:
+                original, _ = _parse_time(raw['originalStartTime'], self._tz)
+                index.exclude(raw['recurringEventId'], original)
+                if raw.get('status') != 'cancelled':
+                    start, _ = _parse_time(raw['start'], self._tz)
+                    end, _ = _parse_time(raw['end'], self._tz)
+                    index.add_single(raw['id'], start, end - start, raw)
+            except (KeyError, ValueError) as e:
+                log.warning(f"⚠️ Skipping Google Calendar instance {raw.get('id')}: {e}")
+        return index
+
+    @staticmethod
+    def _occurrence(event_id: str, start: datetime, end: datetime, raw: dict) -> dict:
+        all_day = 'date' in raw.get('start', {})
+        return _normalize(dict(
+            raw, id=event_id, start=_format_time(start, all_day), end=_format_time(end, all_day)
+        ))
+
+    # ------------------------------------------------------------------
+    # CalendarProvider
+    # ------------------------------------------------------------------
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        now = datetime.now(timezone.utc)
+        window_start = (datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=self._tz)
+                        if start_date else now)
+        # end of the end_date day — extend to 6am next day for late-night sessions
+        window_end = (datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=self._tz)
+                      + timedelta(days=1, hours=6)) if end_date else now + timedelta(days=7)
+        index = self._sync()
+        return [self._occurrence(*item) for item in index.between(window_start, window_end)]
+
+    def get_event(self, event_id) -> dict:
+        found = self._sync().find(str(event_id))
+        return self._occurrence(*found) if found else None
 
     def get_upcoming_events(self, days=7) -> list:
         start = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -148,22 +271,32 @@ class GoogleCalendarAPI(CalendarProvider):
     def get_event_type(self, event) -> str:
         title = event.get('title', '')
         notes = event.get('notes', '')
-        return _infer_event_type(title + ' ' + notes)
+        return infer_event_type(title + ' ' + notes)
 
     def append_availability_note(self, event_id, note: str) -> bool:
         """Append an availability note to the Google Calendar event's description."""
         try:
-            raw = self._service.events().get(
+            raw = self._execute(self._service.events().get(
                 calendarId=self.calendar_id, eventId=event_id
-            ).execute()
+            ))
             current_desc = raw.get('description') or ''
             updated_desc = (current_desc.rstrip() + '\n' + note).lstrip()
-            self._service.events().patch(
+            # Not retried: a patch that timed out may still have been applied
+            self._execute(self._service.events().patch(
                 calendarId=self.calendar_id,
                 eventId=event_id,
                 body={'description': updated_desc}
-            ).execute()
+            ), retry=False)
             return True
+        except HttpError as e:
+            if e.resp.status in (403, 404, 410):
+                # Shared read-only, or the event is gone
+                log.warning(f"⚠️ Can't update Google Calendar event {event_id}: {e}", extra={'event_id': event_id})
+                return False
+            log.error(f"Error updating Google Calendar event {event_id}: {e}", extra={'event_id': event_id})
+            raise CalendarUnavailableError(f"Google Calendar: {e}") from e
+        except CalendarUnavailableError:
+            raise
         except Exception as e:
-            print(f"Error updating Google Calendar event {event_id}: {e}")
-            return False
+            log.error(f"Error updating Google Calendar event {event_id}: {e}", extra={'event_id': event_id})
+            raise CalendarUnavailableError(f"Google Calendar: {e}") from e
@@ -0,0 +1,351 @@
+"""
+iCalendar (.ics) feed provider.
+
+Reads a published ICS feed from a URL (http, https or webcal) or a local
+export file.  Refreshes are cheap when nothing changed:
+
+- URLs are fetched with If-None-Match / If-Modified-Since, and a 304 keeps
+  the already-parsed events.  Local files are re-read only when their
+  modification time or size changes.
+- The feed is parsed line by line as it streams in.  Only the fields the bot
+  uses are kept for each VEVENT, so the raw file is never held in memory.
+- Recurring events are stored once as a master and expanded locally for the
+  requested window (see recurrence.py), with RECURRENCE-ID overrides and
+  cancelled instances applied.
+
+Parsed events are cached per feed version (ETag, Last-Modified or file
+stamp) in an `OccurrenceIndex`, which also memoizes expanded windows.
+"""
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, Optional
+from zoneinfo import ZoneInfo
+
+import requests
+
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from config import Config
+from deadlines import call_with_retries, record_timeout, request_timeout
+from event_text import infer_event_type, parse_opponent, parse_team_name
+from metrics import record_cache
+from recurrence import (
+    OccurrenceIndex, RecurrenceRule, RecurringSeries, occurrence_id, parse_ical_datetime,
+    resolve_tz,
+)
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+_DURATION_RE = re.compile(
+    r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$'
+)
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          requests.exceptions.ChunkedEncodingError)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
+
+# ----------------------------------------------------------------------
+# Streaming parser
+# ----------------------------------------------------------------------
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_line(line: str) -> tuple:
+    """'DTSTART;TZID=Europe/Paris:20250301T190000' → ('DTSTART', {'TZID': ...}, value)."""
+    head, _, value = line.partition(':')
+    name, *raw_params = head.split(';')
+    params = {}
+    for param in raw_params:
+        key, _, param_value = param.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _unescape(text: str) -> str:
+    return (text.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def iter_vevents(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Yield each VEVENT as {PROPERTY: [(params, value), ...]} while reading `lines`.
+
+    Nested components (VALARM) are skipped; everything outside VEVENTs is ignored.
+    """
+    event = None
+    depth = 0
+    for line in _unfold(lines):
+        name, params, value = _parse_line(line)
+        if name == 'BEGIN':
+            if value.upper() == 'VEVENT' and event is None:
+                event, depth = {}, 0
+            elif event is not None:
+                depth += 1
+            continue
+        if name == 'END' and event is not None:
+            if depth:
+                depth -= 1
+            elif value.upper() == 'VEVENT':
+                yield event
+                event = None
+            continue
+        if event is not None and not depth:
+            event.setdefault(name, []).append((params, value))
+
+
+def _parse_duration(value: str) -> timedelta:
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        return timedelta(0)
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == '-' else delta
+
+
+class _IcsEvent:
+    """The parts of a VEVENT the bot uses."""
+
+    __slots__ = ('uid', 'title', 'notes', 'location', 'categories', 'start', 'duration',
+                 'all_day', 'recurrence_id', 'cancelled', 'recurrence')
+
+    def __init__(self, props: dict, tz):
+        def first(name, default=''):
+            values = props.get(name)
+            return values[0] if values else (None, default)
+
+        self.uid = first('UID')[1].strip()
+        self.title = _unescape(first('SUMMARY', 'Untitled')[1]) or 'Untitled'
+        self.notes = _unescape(first('DESCRIPTION')[1])
+        self.location = _unescape(first('LOCATION')[1])
+        self.categories = [
+            _unescape(c).strip() for _, value in props.get('CATEGORIES', []) for c in value.split(',')
+        ]
+        self.cancelled = first('STATUS')[1].upper() == 'CANCELLED'
+
+        params, value = first('DTSTART')
+        if not value:
+            raise ValueError(f"event {self.uid!r} has no DTSTART")
+        self.start, self.all_day = parse_ical_datetime(value, resolve_tz(params.get('TZID'), tz))
+
+        end_params, end_value = first('DTEND')
+        if end_value:
+            end, _ = parse_ical_datetime(end_value, resolve_tz(end_params.get('TZID'), tz))
+            self.duration = end - self.start
+        elif props.get('DURATION'):
+            self.duration = _parse_duration(first('DURATION')[1])
+        else:
+            self.duration = timedelta(days=1) if self.all_day else timedelta(0)
+
+        rid_params, rid_value = first('RECURRENCE-ID')
+        self.recurrence_id = (
+            parse_ical_datetime(rid_value, resolve_tz(rid_params.get('TZID'), tz))[0]
+            if rid_value else None
+        )
+
+        self.recurrence = None
+        if props.get('RRULE') or props.get('RDATE'):
+            rule = RecurrenceRule.parse(first('RRULE')[1], self.start.tzinfo) if props.get('RRULE') else None
+            exdates, rdates = set(), []
+            for name, target in (('EXDATE', exdates), ('RDATE', rdates)):
+                for item_params, item_value in props.get(name, []):
+                    item_tz = resolve_tz(item_params.get('TZID'), self.start.tzinfo)
+                    for item in item_value.split(','):
+                        if '/' in item:
+                            continue
+                        dt, _ = parse_ical_datetime(item, item_tz)
+                        if name == 'EXDATE':
+                            target.add(dt.astimezone(timezone.utc))
+                        else:
+                            target.append(dt)
+            self.recurrence = RecurringSeries(self.start, self.duration, rule, exdates, rdates)
+
+
+class FeedSnapshot:
+    """Parsed events of one feed version, indexed for window queries."""
+
+    def __init__(self, vevents: Iterable[dict], tz):
+        self.index = OccurrenceIndex()
+        overrides = []
+        skipped = 0
+        for props in vevents:
+            try:
+                event = _IcsEvent(props, tz)
+            except (ValueError, KeyError) as e:
+                skipped += 1
+                if skipped <= 3:
+                    log.warning(f"⚠️ Skipping unparseable ICS event: {e}")
+                continue
+            if event.recurrence_id is not None:
+                overrides.append(event)
+            elif event.cancelled:
+                continue
+            elif event.recurrence is not None:
+                self.index.add_series(event.uid, event.recurrence, event, event.all_day)
+            else:
+                self.index.add_single(event.uid, event.start, event.duration, event)
+
+        # Overrides replace one occurrence of their series (or cancel it); they
+        # may appear before their master in the file
+        for event in overrides:
+            self.index.exclude(event.uid, event.recurrence_id)
+            if not event.cancelled:
+                self.index.add_single(occurrence_id(event.uid, event.recurrence_id, event.all_day),
+                                      event.start, event.duration, event)
+        self.event_count = len(self.index)
+        if skipped:
+            log.warning(f"⚠️ Skipped {skipped} unparseable ICS event(s)")
+
+
+def _to_event(event_id: str, start: datetime, end: datetime, event: _IcsEvent) -> dict:
+    """Convert a parsed occurrence to the shared event format."""
+    return {
+        'id':         event_id,
+        'title':      event.title,
+        'team_name':  parse_team_name(event.title),  # cleaned name used for roster lookup
+        'start_dt':   start.isoformat(),
+        'end_dt':     end.isoformat(),
+        'notes':      event.notes,
+        'location':   event.location,
+        'who':        parse_opponent(event.title),
+        'categories': event.categories,
+    }
+
+
+class ICSCalendar(CalendarProvider):
+    """Read-only provider for an iCalendar feed URL or local .ics file."""
+
+    def __init__(self, source: str, tz_name: str = None,
+                 acquire: Optional[Callable[[], None]] = None):
+        if source.startswith('webcal://'):
+            source = 'https://' + source[len('webcal://'):]
+        self.source = source
+        self._is_url = source.startswith(('http://', 'https://'))
+        self._tz = ZoneInfo(tz_name) if tz_name else timezone.utc
+        # Called before every request to take a token from the credential's rate limiter
+        self._acquire = acquire
+        self._snapshot: Optional[FeedSnapshot] = None
+        self._version = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._checked_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _refresh(self) -> FeedSnapshot:
+        """Return the current snapshot, re-reading the feed only if it may have changed."""
+        if self._snapshot is not None and time.monotonic() - self._checked_at < Config.ICS_REFRESH_SECONDS:
+            return self._snapshot
+        try:
+            if self._is_url:
+                call_with_retries('ics', self._fetch_url, _retryable)
+            else:
+                self._read_file()
+        except (requests.exceptions.RequestException, OSError) as e:
+            log.error(f"Error fetching ICS feed: {e}")
+            raise CalendarUnavailableError(f"ICS feed: {e}") from e
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def _fetch_url(self) -> None:
+        if self._acquire:
+            self._acquire()
+        headers = {}
+        if self._snapshot is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+        try:
+            response = requests.get(self.source, headers=headers, stream=True,
+                                    timeout=request_timeout('ics'))
+        except requests.exceptions.Timeout:
+            record_timeout('ics')
+            raise
+        with response:
+            if response.status_code == 304:
+                record_cache('ics_feed', True)
+                return
+            response.raise_for_status()
+            version = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            if version and version == self._version and self._snapshot is not None:
+                record_cache('ics_feed', True)
+                return  # Server ignored the conditional headers but nothing changed
+            record_cache('ics_feed', False)
+            if 'charset' not in response.headers.get('Content-Type', ''):
+                response.encoding = 'utf-8'  # RFC 5545 default; requests would guess Latin-1
+            snapshot = FeedSnapshot(iter_vevents(response.iter_lines(decode_unicode=True)), self._tz)
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+        self._install(snapshot, version)
+
+    def _read_file(self) -> None:
+        stat = os.stat(self.source)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version and self._snapshot is not None:
+            record_cache('ics_feed', True)
+            return
+        record_cache('ics_feed', False)
+        with open(self.source, encoding='utf-8', errors='replace', newline='') as f:
+            snapshot = FeedSnapshot(iter_vevents(f), self._tz)
+        self._install(snapshot, version)
+
+    def _install(self, snapshot: FeedSnapshot, version) -> None:
+        self._snapshot = snapshot
+        self._version = version
+        log.info(f"📥 Loaded ICS feed: {snapshot.event_count} event(s)")
+
+    # ------------------------------------------------------------------
+    # CalendarProvider
+    # ------------------------------------------------------------------
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        now = datetime.now(timezone.utc)
+        window_start = (datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=self._tz)
+                        if start_date else now)
+        # End of the end_date day — extend to 6am next day for late-night sessions
+        window_end = (datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=self._tz)
+                      + timedelta(days=1, hours=6)) if end_date else now + timedelta(days=7)
+        snapshot = self._refresh()
+        return [_to_event(*item) for item in snapshot.index.between(window_start, window_end)]
+
+    def get_event(self, event_id) -> dict:
+        found = self._refresh().index.find(str(event_id))
+        return _to_event(*found) if found else None
+
+    def get_upcoming_events(self, days=7) -> list:
+        start = datetime.now(self._tz).strftime('%Y-%m-%d')
+        end = (datetime.now(self._tz) + timedelta(days=days)).strftime('%Y-%m-%d')
+        return self.get_events(start, end)
+
+    def get_event_type(self, event) -> str:
+        # Feeds that set CATEGORIES (e.g. "Scrim") are matched on those first
+        for category in event.get('categories') or ():
+            event_type = infer_event_type(category)
+            if event_type:
+                return event_type
+        return infer_event_type(event.get('title', '') + ' ' + (event.get('notes') or ''))
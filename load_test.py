@@ -0,0 +1,616 @@
+"""
+Synthetic load test: the real cogs against fake Discord and calendar backends.
+
+    python load_test.py --guilds 50 --events 300 --duration 60 --rate 20
+
+Reminders, CalendarCommands, AvailabilityCommands and RosterCommands are
+loaded as extensions into a bot that never connects to Discord.  Each guild
+gets a team whose calendar is a `SyntheticCalendar` with the configured
+latency, jitter and error rate.  The team's reminder channel and the
+interaction responses go through a fake Discord API that adds REST latency
+(and optionally errors).  Provider calls still go through the team's rate
+limiter, deadlines, retries and circuit breaker, and sends still go through
+the shared `MessageDispatcher`, so the whole path from command to calendar
+to Discord is exercised.
+
+A run drives:
+
+- an interaction storm: slash commands arrive at --rate per second (Poisson
+  arrivals), mixed according to COMMAND_MIX (override with --mix), plus
+  --burst simultaneous commands every --burst-every seconds
+- reminder cycles: a full reminder check of every team every --cycle
+  seconds, and --due events per team whose reminders come due during the
+  run, so the scheduler and dispatcher deliver real reminders
+
+and reports throughput, per-command latency percentiles, reminder delivery
+lag, calendar and dispatcher counters, and how long the event loop was
+blocked (from a `StallMonitor` with a --stall-ms threshold).  Command latency
+is measured from interaction creation to the first response, which is what
+Discord's 3-second window counts, and to handler completion.
+
+State files (teams.json, rosters.json, reminder_ledger.json) are written to
+a temporary directory, so a run never touches the bot's real data.  No
+network access and no Discord token are needed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import count
+from types import SimpleNamespace
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from deadlines import provider_stats
+from dispatcher import MessageDispatcher
+from profiling import StallMonitor
+from reminder_health import percentiles, reminder_health
+from resilience import ResilientCalendar
+from roster_storage import RosterStorage
+from synthetic import SyntheticCalendar, TEAM_NAMES, TIMEZONES, make_event, make_events, make_roster
+from team_manager import TeamManager
+from tracing import finish_interaction_trace
+
+COGS = ['reminders', 'calendar_commands', 'availability_commands', 'roster_commands']
+
+# Relative weight of each interaction in the storm.  'autocomplete' is the
+# /availability event picker, which Discord calls on every keystroke
+COMMAND_MIX = {
+    'upcoming': 3,
+    'week': 3,
+    'next': 3,
+    'nextscrim': 2,
+    'nextofficial': 1,
+    'today': 2,
+    'scrim': 1,
+    'availability': 1,
+    'autocomplete': 5,
+    'roster': 2,
+}
+
+# Discord rejects interaction responses later than this (seconds)
+RESPONSE_WINDOW = 3.0
+
+
+def _parse_mix(text: str) -> dict:
+    """Parse 'week=5,next=2' into a command mix."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip().lstrip('/')
+        if name not in COMMAND_MIX:
+            raise argparse.ArgumentTypeError(f"unknown command '{name}' (choose from {', '.join(COMMAND_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ----------------------------------------------------------------------
+# Fake Discord
+# ----------------------------------------------------------------------
+
+class _ErrorResponse:
+    """Stands in for the aiohttp response `discord.HTTPException` expects."""
+
+    status = 503
+    reason = 'Service Unavailable'
+
+
+class FakeDiscordAPI:
+    """Simulated Discord REST round trips: latency with ±50% jitter and injected 503s."""
+
+    def __init__(self, latency: float, error_rate: float, rng: random.Random):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = rng
+        self.requests = 0
+        self.errors = 0
+
+    async def round_trip(self) -> None:
+        self.requests += 1
+        await asyncio.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise discord.HTTPException(_ErrorResponse(), 'injected 503')
+
+
+class FakeMessage:
+    _ids = count(1)
+
+    def __init__(self, channel_id: int, content: str = None, embeds: list = ()):
+        self.id = next(self._ids)
+        self.channel_id = channel_id
+        self.content = content
+        self.embeds = list(embeds)
+
+    async def edit(self, **kwargs):
+        return self
+
+    async def delete(self):
+        pass
+
+
+class FakeChannel:
+    """Reminder channel that counts what the dispatcher delivers to it."""
+
+    def __init__(self, channel_id: int, api: FakeDiscordAPI):
+        self.id = channel_id
+        self._api = api
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, content: str = None, embed: discord.Embed = None, embeds: list = None, **kwargs):
+        await self._api.round_trip()
+        all_embeds = ([embed] if embed else []) + list(embeds or [])
+        self.messages += 1
+        self.embeds += len(all_embeds)
+        return FakeMessage(self.id, content, all_embeds)
+
+
+class FakeResponse:
+    """`interaction.response`: the first call acknowledges the interaction."""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _acknowledge(self) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+        await self._interaction.client.discord_api.round_trip()
+        self._interaction.responded_at = time.monotonic()
+
+    async def send_message(self, *args, **kwargs):
+        await self._acknowledge()
+
+    async def defer(self, *args, **kwargs):
+        await self._acknowledge()
+
+    async def edit_message(self, *args, **kwargs):
+        await self._acknowledge()
+
+    async def send_modal(self, *args, **kwargs):
+        await self._acknowledge()
+
+
+class FakeFollowup:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+
+    async def send(self, content: str = None, **kwargs):
+        await self._interaction.client.discord_api.round_trip()
+        return FakeMessage(self._interaction.channel_id, content)
+
+
+class FakeInteraction:
+    """The parts of `discord.Interaction` the cogs use."""
+
+    _ids = count(1)
+
+    def __init__(self, bot: 'LoadTestBot', guild, user, channel_id: int, created: float):
+        self.id = next(self._ids)
+        self.client = bot
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel_id = channel_id
+        self.user = user
+        self.command = None
+        # `created` is the scheduled arrival (monotonic), which may be earlier
+        # than now if the loop was blocked when it came due
+        self.created = created
+        self.created_at = datetime.now(timezone.utc) - timedelta(seconds=time.monotonic() - created)
+        self.responded_at = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def original_response(self):
+        return FakeMessage(self.channel_id)
+
+
+class LoadTestBot(commands.Bot):
+    """Bot that never connects: it is always ready and its channels are fakes."""
+
+    def __init__(self, team_manager: TeamManager, channels: dict, discord_api: FakeDiscordAPI):
+        super().__init__(command_prefix='!', intents=discord.Intents.default())
+        self.team_manager = team_manager
+        self.dispatcher = MessageDispatcher()
+        self.discord_api = discord_api
+        self._fake_channels = channels
+
+    def get_channel(self, channel_id):
+        return self._fake_channels.get(channel_id)
+
+    async def wait_until_ready(self) -> None:
+        return None
+
+
+# ----------------------------------------------------------------------
+# Load test
+# ----------------------------------------------------------------------
+
+class LoadTest:
+    """One load-test run; see the module docstring for what it drives and measures."""
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.mix = options.mix or COMMAND_MIX
+        self.bot: LoadTestBot = None
+        self.guilds: list = []
+        self.calendars: list[SyntheticCalendar] = []
+        self.channels: dict[int, FakeChannel] = {}
+        self.roster_names: list = []
+        self.monitor = StallMonitor(threshold=options.stall_ms, history=100000)
+        # command → [(seconds to first response or None, seconds to completion)]
+        self.timings: dict[str, list] = {}
+        self.errors: Counter = Counter()
+        self.check_times: list = []
+        self.elapsed = 0.0
+
+    # -- setup ---------------------------------------------------------
+
+    def _write_teams(self) -> None:
+        teams = []
+        for i in range(self.options.guilds):
+            base = TEAM_NAMES[i % len(TEAM_NAMES)]
+            entry = {
+                'team_id': f"load{i}",
+                'name': base if i < len(TEAM_NAMES) else f"{base} {i // len(TEAM_NAMES) + 1}",
+                'guild_id': 100000 + i,
+                'calendar_type': 'teamup',
+                'reminder_channel_id': 200000 + i,
+                'player_role_id': 300000 + i,
+                'coach_role_id': 400000 + i,
+                'management_role_id': 500000 + i,
+                'teamup_calendar_id': f"synthetic{i}",
+                'timezone': self.rng.choice(TIMEZONES),
+            }
+            if self.options.shared_key:
+                # One credential (and so one rate limit) for every team
+                entry['teamup_api_key_env'] = 'LOAD_TEST_TEAMUP_KEY'
+            teams.append(entry)
+        with open('teams.json', 'w') as f:
+            json.dump({'teams': teams}, f)
+
+    def _install_calendars(self, team_manager: TeamManager) -> None:
+        now = datetime.now(timezone.utc)
+        for team in team_manager.get_all_teams():
+            events = make_events(self.rng, self.options.events, team.name, team.timezone,
+                                 id_prefix=f"{team.team_id}-")
+            # Events whose (earliest) reminder comes due while the test runs
+            due_from = now + team.reminder_policy.min_offset
+            for j in range(self.options.due):
+                start = due_from + timedelta(seconds=self.rng.uniform(5, max(5.0, self.options.duration - 5)))
+                events.append(make_event(self.rng, f"{team.team_id}-due{j}", team.name,
+                                         start.replace(microsecond=0), team.timezone))
+            events.sort(key=lambda e: e['start_dt'])
+
+            provider = SyntheticCalendar(
+                events,
+                latency=self.options.calendar_latency,
+                jitter=self.options.calendar_jitter,
+                error_rate=self.options.calendar_error_rate,
+                rng=random.Random(self.rng.random()),
+                acquire=partial(team.limiter.acquire, team.team_id) if team.limiter else None,
+            )
+            # Installed in place of the provider get_calendar() would create
+            team._calendar = ResilientCalendar(provider, f"{team.name}/synthetic", team.team_id, 'synthetic')
+            self.calendars.append(provider)
+
+    def _create_rosters(self, team_manager: TeamManager) -> None:
+        storage = RosterStorage()
+        for team in team_manager.get_all_teams():
+            storage.set_roster(team.name, make_roster(self.rng))
+        self.roster_names = storage.list_all_teams()
+
+    async def setup(self) -> None:
+        self._write_teams()
+        team_manager = TeamManager('teams.json')
+        self._install_calendars(team_manager)
+        self._create_rosters(team_manager)
+
+        api = FakeDiscordAPI(self.options.discord_latency, self.options.discord_error_rate,
+                             random.Random(self.rng.random()))
+        for team in team_manager.get_all_teams():
+            self.channels[team.reminder_channel_id] = FakeChannel(team.reminder_channel_id, api)
+            members = [
+                SimpleNamespace(id=team.guild_id * 100 + n, display_name=f"Player{n}", mention=f"<@{n}>",
+                                roles=[], guild_permissions=discord.Permissions.none())
+                for n in range(10)
+            ]
+            self.guilds.append((team, SimpleNamespace(id=team.guild_id, roles=[]), members))
+
+        self.bot = LoadTestBot(team_manager, self.channels, api)
+        self.monitor.start()
+        for extension in COGS:
+            await self.bot.load_extension(extension)
+
+    async def teardown(self) -> None:
+        for extension in COGS:
+            await self.bot.unload_extension(extension)
+        self.bot.dispatcher.stop()
+        self.monitor.stop()
+
+    # -- interactions --------------------------------------------------
+
+    def _params(self, name: str, team) -> dict:
+        calendar = team.get_calendar().provider
+        if name == 'scrim':
+            return {'event_id': self.rng.choice(calendar.events)['id']}
+        if name == 'availability':
+            horizon = (datetime.now() + timedelta(days=13)).strftime('%Y-%m-%d')
+            upcoming = [e for e in calendar.events if e['start_dt'][:10] <= horizon] or calendar.events
+            return {
+                'status': self.rng.choice(['Late', 'Missing']),
+                'event': self.rng.choice(upcoming)['id'],
+                'notes': self.rng.choice([None, 'Stuck in traffic', 'Work ran late, joining after first map']),
+            }
+        if name == 'roster':
+            if self.rng.random() < 0.8:
+                return {'action': 'view', 'team': self.rng.choice(self.roster_names)}
+            return {'action': 'list'}
+        return {}
+
+    async def _interact(self, name: str, arrival: float) -> None:
+        team, guild, members = self.rng.choice(self.guilds)
+        interaction = FakeInteraction(self.bot, guild, self.rng.choice(members), team.reminder_channel_id, arrival)
+        command = cog = error = None
+        try:
+            if name == 'autocomplete':
+                title = self.rng.choice(team.get_calendar().provider.events)['title']
+                cog = self.bot.get_cog('AvailabilityCommands')
+                await cog.event_autocomplete(interaction, title[:self.rng.randint(0, 6)])
+                # The returned choices are the response
+                interaction.responded_at = time.monotonic()
+            else:
+                command = self.bot.tree.get_command(name)
+                cog = command.binding
+                interaction.command = command
+                if await cog.interaction_check(interaction):
+                    await command.callback(cog, interaction, **self._params(name, team))
+        except Exception as e:
+            error = e
+            self.errors[name] += 1
+            if command is not None:
+                try:
+                    await cog.cog_app_command_error(interaction, app_commands.CommandInvokeError(command, e))
+                except Exception:
+                    pass
+        finally:
+            finish_interaction_trace(interaction, error)
+        finished = time.monotonic()
+        acknowledged = interaction.responded_at - interaction.created if interaction.responded_at else None
+        self.timings.setdefault(name, []).append((acknowledged, finished - interaction.created))
+
+    async def _storm(self, end: float) -> None:
+        names, weights = list(self.mix), list(self.mix.values())
+        tasks = set()
+
+        def spawn(arrival):
+            task = asyncio.create_task(self._interact(self.rng.choices(names, weights)[0], arrival))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        # Open loop: arrivals follow their own schedule, so commands that came
+        # due while the loop was blocked still count from when they arrived
+        arrival = time.monotonic()
+        next_burst = arrival + self.options.burst_every if self.options.burst else None
+        while True:
+            arrival += self.rng.expovariate(self.options.rate)
+            if next_burst and next_burst <= arrival:
+                await asyncio.sleep(max(0.0, next_burst - time.monotonic()))
+                for _ in range(self.options.burst):
+                    spawn(next_burst)
+                next_burst += self.options.burst_every
+            if arrival >= end:
+                break
+            await asyncio.sleep(max(0.0, arrival - time.monotonic()))
+            spawn(arrival)
+        if tasks:
+            await asyncio.wait(tasks, timeout=30)
+
+    async def _reminder_cycles(self, end: float) -> None:
+        reminders = self.bot.get_cog('Reminders')
+        while True:
+            # The check loop already ran once when the cog loaded
+            await asyncio.sleep(self.options.cycle)
+            if time.monotonic() >= end:
+                return
+            # Make every team due again, as if a full check interval had passed
+            reminders._last_checked.clear()
+            started = time.monotonic()
+            await reminders.check_reminders()
+            self.check_times.append(time.monotonic() - started)
+
+    async def _drain(self, timeout: float = 15) -> None:
+        """Let reminders due within the run and queued messages go out."""
+        reminders = self.bot.get_cog('Reminders')
+        stop = time.monotonic() + timeout
+        while time.monotonic() < stop:
+            now = datetime.now(timezone.utc)
+            overdue = [e for e in reminders.scheduler.pending() if e.fire_at <= now]
+            if not overdue and not self.bot.dispatcher.queue_depth():
+                return
+            await asyncio.sleep(0.1)
+
+    async def run(self) -> dict:
+        await self.setup()
+        started = time.monotonic()
+        end = started + self.options.duration
+        try:
+            await asyncio.gather(self._storm(end), self._reminder_cycles(end))
+            await self._drain()
+            self.elapsed = time.monotonic() - started
+        finally:
+            await self.teardown()
+        return self.summary()
+
+    # -- results -------------------------------------------------------
+
+    def summary(self) -> dict:
+        commands_summary = {}
+        all_timings = []
+        for name, timings in sorted(self.timings.items()):
+            all_timings.extend(timings)
+            acks = [a for a, _ in timings if a is not None]
+            totals = [t for _, t in timings]
+            ack_p50, ack_p95, ack_p99 = percentiles(acks, 0.50, 0.95, 0.99)
+            total_p50, total_p95, total_p99 = percentiles(totals, 0.50, 0.95, 0.99)
+            commands_summary[name] = {
+                'count': len(timings),
+                'errors': self.errors[name],
+                'ack_p50_ms': ack_p50 * 1000,
+                'ack_p95_ms': ack_p95 * 1000,
+                'ack_p99_ms': ack_p99 * 1000,
+                'total_p50_ms': total_p50 * 1000,
+                'total_p95_ms': total_p95 * 1000,
+                'total_p99_ms': total_p99 * 1000,
+                'max_ms': max(totals) * 1000,
+            }
+
+        snapshots = [reminder_health.snapshot(team.team_id) for team, _, _ in self.guilds]
+        snapshots = [s for s in snapshots if s]
+        lag_p50, lag_p95, lag_p99 = percentiles(reminder_health.lag_samples(), 0.50, 0.95, 0.99)
+        check_p50, check_max = percentiles(self.check_times, 0.50, 1.0)
+        stalls = list(self.monitor.stalls)
+        stalled = sum(stall.duration for stall in stalls)
+        synthetic = provider_stats().get('synthetic', {})
+
+        return {
+            'options': {k: v for k, v in vars(self.options).items() if k != 'json'},
+            'elapsed_seconds': self.elapsed,
+            'interactions': {
+                'total': len(all_timings),
+                'per_second': len(all_timings) / self.elapsed if self.elapsed else 0.0,
+                'errors': sum(self.errors.values()),
+                'unanswered': sum(1 for ack, _ in all_timings if ack is None),
+                'over_window': sum(1 for ack, total in all_timings if (ack or total) > RESPONSE_WINDOW),
+            },
+            'commands': commands_summary,
+            'reminders': {
+                'sent': sum(s['sent'] for s in snapshots),
+                'failed': sum(s['failed'] for s in snapshots),
+                'lag_p50_ms': lag_p50 * 1000,
+                'lag_p95_ms': lag_p95 * 1000,
+                'lag_p99_ms': lag_p99 * 1000,
+                'checks': len(self.check_times),
+                'check_p50_ms': check_p50 * 1000,
+                'check_max_ms': check_max * 1000,
+            },
+            'calendar': {
+                'requests': sum(c.requests for c in self.calendars),
+                'injected_errors': sum(c.errors for c in self.calendars),
+                'retries': synthetic.get('retries', 0),
+                'timeouts': synthetic.get('timeouts', 0),
+                'deadline_exceeded': synthetic.get('deadline_exceeded', 0),
+                'notes_appended': sum(c.notes_appended for c in self.calendars),
+            },
+            'discord': {
+                'requests': self.bot.discord_api.requests,
+                'injected_errors': self.bot.discord_api.errors,
+                'channel_messages': sum(c.messages for c in self.channels.values()),
+            },
+            'dispatcher': self.bot.dispatcher.stats(),
+            'event_loop': {
+                'threshold_ms': self.options.stall_ms,
+                'stalls': len(stalls),
+                'stalled_seconds': stalled,
+                'stalled_pct': 100.0 * stalled / self.elapsed if self.elapsed else 0.0,
+                'worst_ms': max((stall.duration for stall in stalls), default=0.0) * 1000,
+            },
+        }
+
+
+def format_report(summary: dict) -> str:
+    o = summary['options']
+    i = summary['interactions']
+    r = summary['reminders']
+    c = summary['calendar']
+    d = summary['dispatcher']
+    loop = summary['event_loop']
+    lines = [
+        f"🧪 Load test: {o['guilds']} guild(s) × {o['events']} event(s), "
+        f"{summary['elapsed_seconds']:.1f}s at {o['rate']:g}/s (seed {o['seed']})",
+        "",
+        f"Interactions: {i['total']} ({i['per_second']:.1f}/s) • {i['errors']} failed • "
+        f"{i['unanswered']} unanswered • {i['over_window']} over {RESPONSE_WINDOW:g}s",
+        f"  {'command':<14}{'count':>7}{'errors':>8}{'ack p50':>10}{'p95':>8}{'p99':>8}"
+        f"{'done p95':>10}{'max':>8}  (ms)",
+    ]
+    for name, s in summary['commands'].items():
+        lines.append(
+            f"  {name:<14}{s['count']:>7}{s['errors']:>8}{s['ack_p50_ms']:>10.0f}{s['ack_p95_ms']:>8.0f}"
+            f"{s['ack_p99_ms']:>8.0f}{s['total_p95_ms']:>10.0f}{s['max_ms']:>8.0f}"
+        )
+    lines += [
+        "",
+        f"Reminders: {r['sent']} sent • {r['failed']} failed • lag p50 {r['lag_p50_ms']:.0f}ms • "
+        f"p95 {r['lag_p95_ms']:.0f}ms • p99 {r['lag_p99_ms']:.0f}ms",
+        f"Reminder checks: {r['checks']} cycle(s) • p50 {r['check_p50_ms']:.0f}ms • max {r['check_max_ms']:.0f}ms",
+        f"Calendar: {c['requests']} request(s) • {c['retries']} retried • {c['timeouts']} timed out • "
+        f"{c['deadline_exceeded']} over deadline • {c['injected_errors']} injected error(s)",
+        f"Dispatcher: {d['sent']} send(s) • {d['merged']} merged • {d['failed']} failed • "
+        f"p50 {d['latency_p50_ms']:.0f}ms • p95 {d['latency_p95_ms']:.0f}ms",
+        f"Event loop: {loop['stalls']} stall(s) over {loop['threshold_ms']:g}ms • "
+        f"blocked {loop['stalled_seconds']:.1f}s ({loop['stalled_pct']:.1f}% of the run) • "
+        f"worst {loop['worst_ms']:.0f}ms",
+    ]
+    return "\n".join(lines)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the bot's cogs against synthetic Discord and calendar load.")
+    parser.add_argument('--guilds', type=int, default=50, help="guilds (teams) to simulate")
+    parser.add_argument('--events', type=int, default=300, help="calendar events per team, over 14 days")
+    parser.add_argument('--due', type=int, default=3, help="events per team whose reminders come due during the run")
+    parser.add_argument('--duration', type=float, default=30, help="seconds to drive load for")
+    parser.add_argument('--rate', type=float, default=10, help="slash commands per second (Poisson arrivals)")
+    parser.add_argument('--burst', type=int, default=0, help="extra commands fired at once every --burst-every seconds")
+    parser.add_argument('--burst-every', type=float, default=10)
+    parser.add_argument('--mix', type=_parse_mix, help="command weights, e.g. 'week=5,next=2,autocomplete=10'")
+    parser.add_argument('--cycle', type=float, default=10, help="seconds between forced reminder checks")
+    parser.add_argument('--calendar-latency', type=float, default=0.05, help="mean seconds per calendar request")
+    parser.add_argument('--calendar-jitter', type=float, default=0.5, help="latency spread as a fraction of the mean")
+    parser.add_argument('--calendar-error-rate', type=float, default=0.01, help="share of calendar requests that fail")
+    parser.add_argument('--shared-key', action='store_true', help="all teams share one calendar credential and rate limit")
+    parser.add_argument('--discord-latency', type=float, default=0.05, help="mean seconds per Discord REST call")
+    parser.add_argument('--discord-error-rate', type=float, default=0.0, help="share of Discord REST calls that fail")
+    parser.add_argument('--stall-ms', type=float, default=50, help="report event-loop stalls longer than this")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='PATH', help="also write the summary as JSON")
+    parser.add_argument('--log-level', default='error', help="bot log level during the run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    options = parse_args(argv)
+    logging.basicConfig(level=options.log_level.upper(), format='%(message)s')
+    here = os.getcwd()
+    json_path = os.path.abspath(options.json) if options.json else None
+    with tempfile.TemporaryDirectory(prefix='jarvis-load-') as workdir:
+        # Cogs create their state files in the working directory
+        os.chdir(workdir)
+        try:
+            summary = asyncio.run(LoadTest(options).run())
+        finally:
+            os.chdir(here)
+    print(format_report(summary))
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
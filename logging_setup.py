@@ -0,0 +1,190 @@
+"""
+Structured, non-blocking logging.
+
+Modules log through the standard `logging` package:
+
+    log = get_logger(__name__)
+    log.info("✅ Sent reminder", extra={'team_id': team.team_id, 'latency_ms': 12.5})
+
+`setup_logging` connects the root logger to a bounded queue.  Calling a
+logger only formats the message and enqueues the record, so the event loop
+never blocks on stdout or disk.  A `QueueListener` thread writes the records
+to the console and to a rotating JSON-lines file.
+
+Context fields are copied onto each record as it is enqueued, still on the
+caller's thread:
+
+- team_id, guild_id, event_id, command, channel_id and latency_ms, passed
+  via `extra=` or set for a whole block with `log_context(...)`
+- `sample`: the name of a high-volume path such as 'autocomplete'.  Only
+  LOG_SAMPLE_RATES[name] of these records are kept, and each kept record
+  carries the `sample_rate` it was kept at.
+
+When the queue is full, new records are dropped and counted, so logging
+never applies backpressure to the bot.  The count is reported in
+`dropped_records()`.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from config import Config
+
+# Structured fields copied into JSON output when present on a record
+CONTEXT_FIELDS = ('team_id', 'guild_id', 'channel_id', 'event_id', 'command', 'latency_ms',
+                  'sample_rate')
+
+_context: ContextVar[dict] = ContextVar('log_context', default={})
+
+_listener = None
+_dropped = 0
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a bot module, e.g. get_logger(__name__)."""
+    return logging.getLogger(f"jarvis.{name}")
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach `fields` (team_id, guild_id, ...) to every record logged in the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bind_interaction(interaction) -> None:
+    """
+    Attach an interaction's guild, channel, command and team to the rest of its task.
+
+    Like `start_interaction_deadline`, this is called from `interaction_check`
+    and is not reset, because discord.py runs each interaction in its own task.
+    """
+    fields = {'guild_id': interaction.guild_id, 'channel_id': interaction.channel_id}
+    if interaction.command is not None:
+        fields['command'] = interaction.command.qualified_name
+    team_manager = getattr(interaction.client, 'team_manager', None)
+    team = team_manager.get_team_for_guild(interaction.guild_id) if team_manager else None
+    if team is not None:
+        fields['team_id'] = team.team_id
+    _context.set({**_context.get(), **fields})
+
+
+def dropped_records() -> int:
+    """Records dropped because the log queue was full."""
+    return _dropped
+
+
+class _ContextFilter(logging.Filter):
+    """Adds context fields and applies sampling before a record is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        sample = getattr(record, 'sample', None)
+        if sample is not None:
+            rate = Config.LOG_SAMPLE_RATES.get(sample, 1.0)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+            record.sample_rate = rate
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps tracebacks separate and drops records when full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now, because args and exc_info
+        # may not be safe to use from the writer thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and context fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Human-readable console lines, as the bot printed them before."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = record.getMessage()
+        if not record.name.startswith('jarvis'):
+            # Library records (discord.py) get their level and source
+            line = f"[{record.levelname}] {record.name}: {line}"
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        return line
+
+
+def setup_logging() -> None:
+    """Route all logging through the queue and start the writer thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(JsonFormatter() if Config.LOG_JSON_CONSOLE else ConsoleFormatter())
+    handlers = [console]
+    if Config.LOG_FILE:
+        directory = os.path.dirname(Config.LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            Config.LOG_FILE, maxBytes=Config.LOG_FILE_MAX_BYTES,
+            backupCount=Config.LOG_FILE_BACKUPS, encoding='utf-8',
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(Config.LOG_LEVEL.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush what's still queued on shutdown
+    atexit.register(_listener.stop)
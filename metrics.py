@@ -0,0 +1,330 @@
+"""
+Counters, gauges and histograms exported in Prometheus text format.
+
+Metrics are module-level objects that any module can update.  Each one is
+created once with its label names, and then updated through `.labels(...)`:
+
+    CALENDAR_REQUEST_SECONDS.labels(team='team1', provider='teamup',
+                                    method='get_events').observe(0.42)
+
+`start_metrics_server` serves GET /metrics on METRICS_HOST:METRICS_PORT,
+using the aiohttp server that ships with discord.py.  The server binds to
+localhost by default, so only a Prometheus agent running on the same
+machine can scrape it.
+
+Gauges for state that already lives elsewhere (such as dispatcher queue
+depth) are read when the endpoint is scraped, through callbacks registered
+with `Gauge.set_function`, so the hot paths do no extra work for them.
+"""
+import math
+import threading
+from typing import Callable
+
+from config import Config
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+# Default latency buckets (seconds): 5ms to 30s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Reminder lag buckets (seconds): on time up to the catch-up window
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 15.0, 60.0, 300.0, 1800.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ''
+    # Appended to the name in the exposition, e.g. '_total' for counters
+    name_suffix = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        # Updates all happen on the event loop today; the locks keep a metric
+        # consistent should one ever be bumped from a helper thread such as
+        # the trace exporter or the profiler
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def labels(self, **labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self):
+        """Yield (suffix, label values, extra label, value) for each sample."""
+        raise NotImplementedError
+
+    def render(self) -> list:
+        name = self.name + self.name_suffix
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+        for suffix, values, extra, value in self._samples():
+            labels = _format_labels(self.labelnames, values, extra)
+            lines.append(f"{name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Value:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests or errors."""
+
+    kind = 'counter'
+    name_suffix = '_total'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield '', key, '', child.value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; either set directly or read at scrape time."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Callable[[], dict] = None
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable) -> None:
+        """
+        Read the gauge from `function()` whenever it is scraped.
+
+        For a labelled gauge `function` returns {label values tuple: value};
+        otherwise it returns a number.
+        """
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            try:
+                values = self._function()
+            except Exception as e:
+                log.warning(f"⚠️ Metrics: failed to read {self.name}: {e}")
+                return
+            if not self.labelnames:
+                values = {(): values}
+            for key, value in values.items():
+                yield '', tuple(key), '', value
+            return
+        for key, child in list(self._children.items()):
+            yield '', key, '', child.value
+
+
+class _HistogramValue:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (latencies) in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield '_bucket', key, f'le="{_format_value(bound)}"', cumulative
+            yield '_bucket', key, 'le="+Inf"', count
+            yield '_sum', key, '', total
+            yield '_count', key, '', count
+
+
+class Registry:
+    """Every metric created in the process, in creation order."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ----------------------------------------------------------------------
+# Bot metrics
+# ----------------------------------------------------------------------
+
+CALENDAR_REQUEST_SECONDS = Histogram(
+    'jarvis_calendar_request_seconds',
+    'Time spent in calendar provider calls, including retries and rate-limit waits.',
+    ('team', 'provider', 'method'),
+)
+CALENDAR_ERRORS = Counter(
+    'jarvis_calendar_errors',
+    'Calendar provider calls that failed, by reason '
+    '(unavailable, deadline, rate_limited, circuit_open, error).',
+    ('team', 'provider', 'reason'),
+)
+CALENDAR_STALE_SERVED = Counter(
+    'jarvis_calendar_stale_served',
+    'Calendar results served from the last good snapshot instead of the provider.',
+    ('team', 'provider'),
+)
+COMMAND_SECONDS = Histogram(
+    'jarvis_command_seconds',
+    'Slash command latency from interaction creation to handler completion.',
+    ('command',),
+)
+COMMAND_ERRORS = Counter(
+    'jarvis_command_errors',
+    'Slash commands whose handler raised.',
+    ('command',),
+)
+REMINDER_LAG_SECONDS = Histogram(
+    'jarvis_reminder_lag_seconds',
+    'Delay between a reminder\'s target time and its delivery.',
+    ('kind',),
+    buckets=LAG_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'jarvis_cache_requests',
+    'Cache lookups by cache and result (hit or miss).',
+    ('cache', 'result'),
+)
+DISPATCHER_QUEUE_DEPTH = Gauge(
+    'jarvis_dispatcher_queue_depth',
+    'Outbound messages waiting in the dispatcher queue.',
+)
+DISPATCHER_SEND_SECONDS = Histogram(
+    'jarvis_dispatcher_send_seconds',
+    'Time from queueing an outbound message to Discord accepting it.',
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def cache_hit_ratios() -> dict:
+    """{cache: (hits, lookups)} since startup."""
+    ratios: dict = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):
+        hits, total = ratios.get(cache, (0, 0))
+        ratios[cache] = (hits + (child.value if result == 'hit' else 0), total + child.value)
+    return ratios
+
+
+# ----------------------------------------------------------------------
+# HTTP endpoint
+# ----------------------------------------------------------------------
+
+async def start_metrics_server(host: str = None, port: int = None):
+    """
+    Serve GET /metrics until the event loop stops.
+
+    Returns:
+        The aiohttp `AppRunner`, or None if metrics are disabled
+    """
+    if not Config.METRICS_ENABLED:
+        return None
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(
+            body=REGISTRY.render().encode('utf-8'),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+        )
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    host = host or Config.METRICS_HOST
+    port = Config.METRICS_PORT if port is None else port
+    await web.TCPSite(runner, host, port).start()
+    log.info(f"📈 Metrics endpoint listening on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,559 @@
+"""
+Local stand-in for the TeamUp and Google Calendar APIs.
+
+Serves the endpoints the providers use, so the real `TeamUpAPI` and
+`GoogleCalendarAPI` code (connection handling, retries, rate limiting,
+Google's paged mirror sync) can run end to end on a machine with no
+network:
+
+- TeamUp, under /teamup/{calendar key}: GET /events?startDate&endDate,
+  GET and PATCH /events/{id}, GET /subcalendars
+- Google, under /calendar/v3/calendars/{calendar id}: events.list (with
+  maxResults/pageToken paging, timeMin, showDeleted and syncToken
+  incremental sync), events.get and events.patch
+
+Any calendar key or id is accepted; its events are generated on first use
+from the seed and the key (see synthetic.py), so a calendar looks the same
+every run.  About 1 in 10 Google events is a weekly series, so the mirror's
+local expansion is exercised too.  Point the bot at the server with:
+
+    TEAMUP_API_BASE_URL=http://127.0.0.1:8090/teamup
+    GOOGLE_API_BASE_URL=http://127.0.0.1:8090/calendar/v3/
+
+Faults are injected per request: mean latency with jitter, a share of 429s
+(with Retry-After) and a share of 5xx responses.  `--churn` edits, moves
+and cancels events while the server runs, so incremental syncs have
+something to fetch.  Control endpoints under /_mock change faults at
+runtime (POST /_mock/faults), invalidate every Google sync token so the
+next incremental sync gets a 410 (POST /_mock/expire-sync-tokens) and
+report request counts (GET /_mock/stats).
+
+The server uses the aiohttp that ships with discord.py.  It can run on its
+own (`python mock_calendar_server.py --help`) or inside another program
+through `MockCalendarServer.start()` / `stop()`.
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Optional
+
+from aiohttp import web
+
+from logging_setup import get_logger
+from synthetic import SUBCALENDARS, TEAM_NAMES, TIMEZONES, make_events, make_google_event
+
+log = get_logger(__name__)
+
+TEAMUP_PREFIX = '/teamup'
+GOOGLE_PREFIX = '/calendar/v3'
+CONTROL_PREFIX = '/_mock'
+
+# Status codes used for injected server errors
+_SERVER_ERRORS = (500, 502, 503)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class Faults:
+    """Latency and error injection applied to every API request."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.5,
+                 rate_429: float = 0.0, rate_5xx: float = 0.0, retry_after: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+
+    def update(self, values: dict) -> None:
+        for name in ('latency', 'jitter', 'rate_429', 'rate_5xx', 'retry_after'):
+            if name in values:
+                setattr(self, name, type(getattr(self, name))(values[name]))
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name)
+                for name in ('latency', 'jitter', 'rate_429', 'rate_5xx', 'retry_after')}
+
+    def delay(self, rng: random.Random) -> float:
+        return max(0.0, self.latency * (1 + self.jitter * (2 * rng.random() - 1)))
+
+    def status(self, rng: random.Random) -> Optional[int]:
+        """Injected error status for this request, or None to answer normally."""
+        roll = rng.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_5xx:
+            return rng.choice(_SERVER_ERRORS)
+        return None
+
+
+class TeamUpCalendar:
+    """Events of one TeamUp calendar, in TeamUp's JSON shape."""
+
+    def __init__(self, key: str, rng: random.Random, count: int, start: datetime):
+        team = rng.choice(TEAM_NAMES)
+        tz_name = rng.choice(TIMEZONES)
+        self.events: dict[str, dict] = {}
+        for event in make_events(rng, count, team, tz_name, start=start, id_prefix=''):
+            event.pop('team_name', None)
+            event['id'] = str(10_000_000 + int(event['id']))
+            event['subcalendar_ids'] = [int(s) for s in event['subcalendar_ids']]
+            event.update(all_day=False, rrule='', version=_now(), update_dt=None)
+            self.events[event['id']] = event
+
+    def between(self, start_date: str, end_date: str) -> list:
+        return sorted(
+            (e for e in self.events.values() if start_date <= e['start_dt'][:10] <= end_date),
+            key=lambda e: e['start_dt'],
+        )
+
+    def patch(self, event_id: str, changes: dict) -> Optional[dict]:
+        event = self.events.get(event_id)
+        if event is None:
+            return None
+        event.update({k: v for k, v in changes.items() if k != 'id'})
+        event['update_dt'] = event['version'] = _now()
+        return event
+
+    def churn(self, rng: random.Random) -> None:
+        if not self.events:
+            return
+        event = self.events[rng.choice(list(self.events))]
+        roll = rng.random()
+        if roll < 0.1:
+            del self.events[event['id']]
+        elif roll < 0.3:
+            shift = timedelta(hours=rng.choice([-1, 1]))
+            for field in ('start_dt', 'end_dt'):
+                event[field] = (datetime.fromisoformat(event[field]) + shift).isoformat()
+            event['update_dt'] = _now()
+        else:
+            self.patch(event['id'], {'title': event['title'].split(' (')[0] + f" ({rng.randint(1, 99)})"})
+
+
+class GoogleCalendar:
+    """
+    Events of one Google calendar with a change log for sync tokens.
+
+    Every write bumps `seq`; each event remembers the seq it was created and
+    last changed at.  A sync token is the seq at the end of a listing, so the
+    next incremental list returns the events changed after it.  Tokens carry
+    an epoch, and bumping it (expire) makes every outstanding token invalid.
+    """
+
+    def __init__(self, calendar_id: str, rng: random.Random, count: int, start: datetime):
+        team = rng.choice(TEAM_NAMES)
+        tz_name = rng.choice(TIMEZONES)
+        self.calendar_id = calendar_id
+        self.seq = 0
+        self.epoch = 0
+        self.events: dict[str, dict] = {}
+        # event id → (created seq, changed seq)
+        self._versions: dict[str, tuple] = {}
+        for i in range(count):
+            when = start + timedelta(minutes=rng.randrange(14 * 24 * 60))
+            when = when.replace(minute=0 if when.minute < 30 else 30, second=0, microsecond=0)
+            raw = make_google_event(rng, f"g{i:05d}", team, when, tz_name)
+            if rng.random() < 0.1:
+                raw['recurrence'] = [f"RRULE:FREQ=WEEKLY;COUNT={rng.randint(2, 8)}"]
+            self._store(raw)
+
+    def _store(self, raw: dict) -> None:
+        self.seq += 1
+        created = self._versions.get(raw['id'], (self.seq,))[0]
+        raw['updated'] = _now()
+        self.events[raw['id']] = raw
+        self._versions[raw['id']] = (created, self.seq)
+
+    def sync_token(self, seq: int) -> str:
+        return f"s{self.epoch}-{seq}"
+
+    def _parse_token(self, token: str, prefix: str) -> Optional[tuple]:
+        try:
+            head, _, tail = token.partition('-')
+            if not head.startswith(prefix):
+                return None
+            return int(head[len(prefix):]), int(tail)
+        except ValueError:
+            return None
+
+    def list(self, params) -> tuple:
+        """events.list → (status, body)."""
+        page_size = max(1, min(int(params.get('maxResults', 250)), 2500))
+        show_deleted = params.get('showDeleted', 'false').lower() == 'true'
+        since = None
+        if params.get('syncToken'):
+            parsed = self._parse_token(params['syncToken'], 's')
+            if parsed is None or parsed[0] != self.epoch or parsed[1] > self.seq:
+                return 410, _google_error(410, 'Sync token is no longer valid, a full sync is required.',
+                                          'fullSyncRequired')
+            since = parsed[1]
+            # Incremental results always include deletions
+            show_deleted = True
+
+        # A page token pins the listing's end seq and offset, so paging stays
+        # consistent while events change
+        offset, upto = 0, self.seq
+        if params.get('pageToken'):
+            parsed = self._parse_token(params['pageToken'], 'p')
+            if parsed is None:
+                return 400, _google_error(400, 'Invalid page token value.', 'invalid')
+            offset, upto = parsed
+
+        if since is None:
+            matching = sorted(
+                (e for e in self.events.values() if self._versions[e['id']][0] <= upto),
+                key=lambda e: e['id'],
+            )
+        else:
+            matching = sorted(
+                (e for e in self.events.values() if since < self._versions[e['id']][1] <= upto),
+                key=lambda e: (self._versions[e['id']][1], e['id']),
+            )
+        if not show_deleted:
+            matching = [e for e in matching if e.get('status') != 'cancelled']
+        if since is None and params.get('timeMin'):
+            time_min = _parse_time(params['timeMin'])
+            matching = [e for e in matching if _ends_after(e, time_min)]
+
+        page = matching[offset:offset + page_size]
+        body = {'kind': 'calendar#events', 'summary': self.calendar_id, 'updated': _now(), 'items': page}
+        if offset + page_size < len(matching):
+            body['nextPageToken'] = f"p{offset + page_size}-{upto}"
+        else:
+            body['nextSyncToken'] = self.sync_token(upto)
+        return 200, body
+
+    def patch(self, event_id: str, changes: dict) -> Optional[dict]:
+        raw = self.events.get(event_id)
+        if raw is None:
+            return None
+        raw.update({k: v for k, v in changes.items() if k != 'id'})
+        self._store(raw)
+        return raw
+
+    def churn(self, rng: random.Random) -> None:
+        live = [e for e in self.events.values() if e.get('status') != 'cancelled']
+        if not live:
+            return
+        raw = rng.choice(live)
+        roll = rng.random()
+        if roll < 0.1:
+            self.patch(raw['id'], {'status': 'cancelled'})
+        elif roll < 0.3 and 'dateTime' in raw['start']:
+            shift = timedelta(hours=rng.choice([-1, 1]))
+            moved = {}
+            for field in ('start', 'end'):
+                moved[field] = dict(raw[field], dateTime=(
+                    datetime.fromisoformat(raw[field]['dateTime']) + shift).isoformat())
+            self.patch(raw['id'], moved)
+        else:
+            self.patch(raw['id'], {'summary': raw['summary'].split(' (')[0] + f" ({rng.randint(1, 99)})"})
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _ends_after(raw: dict, time_min: datetime) -> bool:
+    """events.list timeMin: keep series and events ending after `time_min`."""
+    if raw.get('recurrence'):
+        return True
+    end = raw.get('end', {})
+    return _parse_time(end.get('dateTime') or end['date'] + 'T00:00:00Z') > time_min
+
+
+def _google_error(code: int, message: str, reason: str) -> dict:
+    return {'error': {'code': code, 'message': message,
+                      'errors': [{'domain': 'global', 'reason': reason, 'message': message}]}}
+
+
+def _teamup_error(status: int, message: str) -> dict:
+    return {'error': {'id': f"http_{status}", 'title': HTTPStatus(status).phrase, 'message': message}}
+
+
+class MockCalendarServer:
+    """
+    aiohttp application serving the TeamUp and Google stand-ins.
+
+    Args:
+        events: Events generated per calendar (over 14 days from a day ago)
+        faults: Latency and error injection
+        page_size: Most Google events per page, below the client's maxResults,
+            so full syncs page
+        churn: Event changes per minute per calendar
+        teamup_token: If set, TeamUp requests must send this Teamup-Token
+        seed: Seed for generated calendars and injected faults
+    """
+
+    def __init__(self, events: int = 200, faults: Faults = None, page_size: int = 100,
+                 churn: float = 0.0, teamup_token: str = None, seed: int = 1):
+        self.event_count = events
+        self.faults = faults or Faults()
+        self.page_size = page_size
+        self.churn = churn
+        self.teamup_token = teamup_token
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._start = datetime.now(timezone.utc) - timedelta(days=1)
+        self.teamup: dict[str, TeamUpCalendar] = {}
+        self.google: dict[str, GoogleCalendar] = {}
+        # (api, operation) → requests; injected faults by status
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._churn_task: Optional[asyncio.Task] = None
+        self.app = self._build_app()
+
+    # ------------------------------------------------------------------
+    # Calendars
+    # ------------------------------------------------------------------
+
+    def _teamup_calendar(self, key: str) -> TeamUpCalendar:
+        calendar = self.teamup.get(key)
+        if calendar is None:
+            rng = random.Random(f"{self.seed}:teamup:{key}")
+            calendar = self.teamup[key] = TeamUpCalendar(key, rng, self.event_count, self._start)
+        return calendar
+
+    def _google_calendar(self, calendar_id: str) -> GoogleCalendar:
+        calendar = self.google.get(calendar_id)
+        if calendar is None:
+            rng = random.Random(f"{self.seed}:google:{calendar_id}")
+            calendar = self.google[calendar_id] = GoogleCalendar(
+                calendar_id, rng, self.event_count, self._start
+            )
+        return calendar
+
+    # ------------------------------------------------------------------
+    # Application
+    # ------------------------------------------------------------------
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._inject_faults])
+        events = GOOGLE_PREFIX + '/calendars/{calendar_id}/events'
+        app.add_routes([
+            web.get(TEAMUP_PREFIX + '/{key}/events', self.teamup_events),
+            web.get(TEAMUP_PREFIX + '/{key}/events/{event_id}', self.teamup_event),
+            web.patch(TEAMUP_PREFIX + '/{key}/events/{event_id}', self.teamup_patch),
+            web.get(TEAMUP_PREFIX + '/{key}/subcalendars', self.teamup_subcalendars),
+            web.get(events, self.google_list),
+            web.get(events + '/{event_id}', self.google_get),
+            web.patch(events + '/{event_id}', self.google_patch),
+            web.get(CONTROL_PREFIX + '/stats', self.control_stats),
+            web.post(CONTROL_PREFIX + '/faults', self.control_faults),
+            web.post(CONTROL_PREFIX + '/expire-sync-tokens', self.control_expire),
+        ])
+        return app
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler):
+        if request.path.startswith(CONTROL_PREFIX):
+            return await handler(request)
+        api = 'google' if request.path.startswith(GOOGLE_PREFIX) else 'teamup'
+        delay = self.faults.delay(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+        status = self.faults.status(self._rng)
+        if status is None:
+            return await handler(request)
+        self.injected[status] += 1
+        headers = {'Retry-After': str(self.faults.retry_after)} if status == 429 else None
+        message = 'Rate limit exceeded (injected)' if status == 429 else 'Backend error (injected)'
+        body = (_google_error(status, message, 'rateLimitExceeded' if status == 429 else 'backendError')
+                if api == 'google' else _teamup_error(status, message))
+        return web.json_response(body, status=status, headers=headers)
+
+    def _teamup_denied(self, request: web.Request) -> Optional[web.Response]:
+        token = request.headers.get('Teamup-Token')
+        if not token or (self.teamup_token and token != self.teamup_token):
+            return web.json_response(_teamup_error(401, 'Missing or invalid Teamup-Token'), status=401)
+        return None
+
+    async def teamup_events(self, request: web.Request) -> web.Response:
+        self.requests['teamup', 'events'] += 1
+        denied = self._teamup_denied(request)
+        if denied:
+            return denied
+        today = datetime.now(timezone.utc).date()
+        start = request.query.get('startDate', today.isoformat())
+        end = request.query.get('endDate', (today + timedelta(days=1)).isoformat())
+        calendar = self._teamup_calendar(request.match_info['key'])
+        return web.json_response({'events': calendar.between(start, end)})
+
+    async def teamup_event(self, request: web.Request) -> web.Response:
+        self.requests['teamup', 'event'] += 1
+        denied = self._teamup_denied(request)
+        if denied:
+            return denied
+        event = self._teamup_calendar(request.match_info['key']).events.get(request.match_info['event_id'])
+        if event is None:
+            return web.json_response(_teamup_error(404, 'Event not found'), status=404)
+        return web.json_response({'event': event})
+
+    async def teamup_patch(self, request: web.Request) -> web.Response:
+        self.requests['teamup', 'patch'] += 1
+        denied = self._teamup_denied(request)
+        if denied:
+            return denied
+        try:
+            changes = await request.json()
+        except ValueError:
+            return web.json_response(_teamup_error(400, 'Body must be JSON'), status=400)
+        event = self._teamup_calendar(request.match_info['key']).patch(request.match_info['event_id'], changes)
+        if event is None:
+            return web.json_response(_teamup_error(404, 'Event not found'), status=404)
+        return web.json_response({'event': event})
+
+    async def teamup_subcalendars(self, request: web.Request) -> web.Response:
+        self.requests['teamup', 'subcalendars'] += 1
+        denied = self._teamup_denied(request)
+        if denied:
+            return denied
+        self._teamup_calendar(request.match_info['key'])
+        return web.json_response({'subcalendars': [
+            {'id': int(sub_id), 'name': name, 'active': True} for sub_id, name in SUBCALENDARS.items()
+        ]})
+
+    async def google_list(self, request: web.Request) -> web.Response:
+        calendar = self._google_calendar(request.match_info['calendar_id'])
+        params = dict(request.query)
+        kind = 'incremental' if params.get('syncToken') else 'full'
+        self.requests['google', f"list_{kind}"] += 1
+        params['maxResults'] = min(int(params.get('maxResults', 250)), self.page_size)
+        status, body = calendar.list(params)
+        return web.json_response(body, status=status)
+
+    async def google_get(self, request: web.Request) -> web.Response:
+        self.requests['google', 'get'] += 1
+        raw = self._google_calendar(request.match_info['calendar_id']).events.get(request.match_info['event_id'])
+        if raw is None:
+            return web.json_response(_google_error(404, 'Not Found', 'notFound'), status=404)
+        return web.json_response(raw)
+
+    async def google_patch(self, request: web.Request) -> web.Response:
+        self.requests['google', 'patch'] += 1
+        try:
+            changes = await request.json()
+        except ValueError:
+            return web.json_response(_google_error(400, 'Parse Error', 'parseError'), status=400)
+        raw = self._google_calendar(request.match_info['calendar_id']).patch(
+            request.match_info['event_id'], changes
+        )
+        if raw is None:
+            return web.json_response(_google_error(404, 'Not Found', 'notFound'), status=404)
+        return web.json_response(raw)
+
+    async def control_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def control_faults(self, request: web.Request) -> web.Response:
+        try:
+            self.faults.update(await request.json())
+        except (ValueError, TypeError) as e:
+            return web.json_response({'error': str(e)}, status=400)
+        log.info(f"🧪 Mock calendar faults now {self.faults.as_dict()}")
+        return web.json_response(self.faults.as_dict())
+
+    async def control_expire(self, request: web.Request) -> web.Response:
+        for calendar in self.google.values():
+            calendar.epoch += 1
+        log.info(f"🧪 Expired Google sync tokens for {len(self.google)} calendars")
+        return web.json_response({'expired': len(self.google)})
+
+    def stats(self) -> dict:
+        return {
+            'requests': {f"{api}.{op}": n for (api, op), n in sorted(self.requests.items())},
+            'injected': {str(status): n for status, n in sorted(self.injected.items())},
+            'calendars': {'teamup': len(self.teamup), 'google': len(self.google)},
+            'faults': self.faults.as_dict(),
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def _churn_loop(self) -> None:
+        """Apply about `churn` changes per minute to every calendar."""
+        pending = 0.0
+        while True:
+            await asyncio.sleep(1)
+            pending += self.churn / 60
+            while pending >= 1 or (pending > 0 and self._rng.random() < pending):
+                pending = max(0.0, pending - 1)
+                for calendar in list(self.teamup.values()) + list(self.google.values()):
+                    calendar.churn(self._rng)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8090) -> str:
+        """Start serving; returns the server's base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        if self.churn > 0:
+            self._churn_task = asyncio.create_task(self._churn_loop())
+        # Port 0 binds a free port; report the one actually used
+        port = self._runner.addresses[0][1] if self._runner.addresses else port
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._churn_task:
+            self._churn_task.cancel()
+            self._churn_task = None
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local TeamUp / Google Calendar stand-in server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--events', type=int, default=200, help="events per calendar, over 14 days")
+    parser.add_argument('--page-size', type=int, default=100, help="most Google events per list page")
+    parser.add_argument('--latency', type=float, default=0.0, help="mean seconds added to each request")
+    parser.add_argument('--jitter', type=float, default=0.5, help="latency spread as a fraction of the mean")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help="share of requests answered with 500/502/503")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--churn', type=float, default=0.0, help="event changes per minute per calendar")
+    parser.add_argument('--teamup-token', help="require this Teamup-Token (default: any)")
+    parser.add_argument('--seed', type=int, default=1)
+    return parser.parse_args(argv)
+
+
+async def _serve(options: argparse.Namespace) -> None:
+    server = MockCalendarServer(
+        events=options.events,
+        faults=Faults(options.latency, options.jitter, options.rate_429, options.rate_5xx, options.retry_after),
+        page_size=options.page_size,
+        churn=options.churn,
+        teamup_token=options.teamup_token,
+        seed=options.seed,
+    )
+    base = await server.start(options.host, options.port)
+    print(f"Mock calendar server on {base}")
+    print(f"  TEAMUP_API_BASE_URL={base}{TEAMUP_PREFIX}")
+    print(f"  GOOGLE_API_BASE_URL={base}{GOOGLE_PREFIX}/")
+    print(f"  stats: {base}{CONTROL_PREFIX}/stats")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main(argv=None) -> None:
+    try:
+        asyncio.run(_serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
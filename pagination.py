@@ -0,0 +1,218 @@
+"""
+Paginated event views with navigation buttons.
+
+Pages are rendered on demand and further date windows are only fetched
+from the calendar when the user pages past what has been loaded so far,
+so opening /upcoming or /week costs a single calendar request no matter
+how long the schedule is.
+"""
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import discord
+
+from deadlines import start_interaction_deadline
+from logging_setup import bind_interaction
+from embeds import paginate_fields
+from resilience import is_stale
+from tracing import span
+
+
+class EventPageSource:
+    """
+    Loads events window by window and splits them into embed-sized pages.
+
+    Args:
+        load_window: Called with (start_date, end_date) YYYY-MM-DD strings;
+            returns (events, event_types, rosters) for that range
+        build_fields: Turns (events, event_types, rosters) into embed fields,
+            e.g. `build_upcoming_fields` or `build_week_fields`
+        title: Embed title shown on every page
+        window_days: Size of each lazily fetched date window
+        max_windows: How many windows the user may page through
+        max_fields: Maximum fields per page
+        footer: Optional footer text shown on every page
+    """
+
+    def __init__(self, load_window: Callable, build_fields: Callable, title: str,
+                 window_days: int = 7, max_windows: int = 4, max_fields: int = 25,
+                 footer: Optional[str] = None):
+        self._load_window = load_window
+        self._build_fields = build_fields
+        self.title = title
+        self.footer = footer
+        self._window_days = window_days
+        self._max_windows = max_windows
+        self._max_fields = max_fields
+        self._start = datetime.now().date()
+        self._windows_loaded = 0
+        self._seen_ids: set = set()
+        # Oldest snapshot time if any window was served from the stale cache
+        self.stale_since: Optional[datetime] = None
+        # Each page is (window label, fields)
+        self._pages: list[tuple[str, list]] = []
+
+    @property
+    def exhausted(self) -> bool:
+        return self._windows_loaded >= self._max_windows
+
+    def _load_next_window(self) -> None:
+        start = self._start + timedelta(days=self._window_days * self._windows_loaded)
+        end = start + timedelta(days=self._window_days - 1)
+        self._windows_loaded += 1
+
+        events, event_types, rosters = self._load_window(
+            start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        )
+        if is_stale(events) and (self.stale_since is None or events.fetched_at < self.stale_since):
+            self.stale_since = events.fetched_at
+        # Providers may pad the range (e.g. late-night sessions), so windows
+        # can overlap by a few events
+        events = [e for e in events if e['id'] not in self._seen_ids]
+        self._seen_ids.update(e['id'] for e in events)
+        if not events:
+            return
+
+        label = f"{start.strftime('%b %d')} – {end.strftime('%b %d')}"
+        with span('embed.format', events=len(events)):
+            fields = self._build_fields(events, event_types, rosters)
+        for page in paginate_fields(fields, max_fields=self._max_fields):
+            self._pages.append((label, page))
+
+    def has_page(self, index: int, max_loads: Optional[int] = None) -> bool:
+        """
+        Return True if page `index` exists, loading windows as needed.
+
+        With `max_loads`, fetch at most that many windows; a False result
+        then only means "not yet" while the source isn't exhausted.
+        """
+        loads = 0
+        while index >= len(self._pages) and not self.exhausted:
+            if max_loads is not None and loads >= max_loads:
+                break
+            self._load_next_window()
+            loads += 1
+        return 0 <= index < len(self._pages)
+
+    def may_have_page(self, index: int) -> bool:
+        """Return True if page `index` is loaded or could be, without fetching."""
+        return 0 <= index < len(self._pages) or (index >= 0 and not self.exhausted)
+
+    def get_page(self, index: int) -> Optional[discord.Embed]:
+        """Render page `index`, or return None if there is no such page."""
+        if not self.has_page(index):
+            return None
+
+        label, fields = self._pages[index]
+        embed = discord.Embed(title=self.title, description=f"🗓️ {label}", color=discord.Color.blue())
+        for name, value in fields:
+            embed.add_field(name=name, value=value, inline=False)
+
+        more = "" if self.exhausted and index == len(self._pages) - 1 else "+"
+        footer = f"Page {index + 1}/{len(self._pages)}{more}"
+        if self.footer:
+            footer += f" • {self.footer}"
+        if self.stale_since:
+            footer += f" • ⚠️ Calendar unreachable, cached {self.stale_since.strftime('%H:%M')}"
+        embed.set_footer(text=footer)
+        return embed
+
+
+class EventPaginator(discord.ui.View):
+    """Previous/next buttons for browsing an `EventPageSource`."""
+
+    def __init__(self, source: EventPageSource, author_id: int, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.source = source
+        self.author_id = author_id
+        self.index = 0
+        self.message: Optional[discord.Message] = None
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = not self.source.may_have_page(self.index + 1)
+
+    async def _defer_until(self, interaction: discord.Interaction, index: int, **kwargs) -> None:
+        """
+        Load page `index`, fetching at most one window before acknowledging.
+
+        Empty weeks mean a page can take several blocking window fetches;
+        deferring after the first keeps the rest from running past
+        Discord's 3s window for answering the interaction.
+        """
+        if not self.source.has_page(index, max_loads=1) and not self.source.exhausted:
+            with span('discord.respond'):
+                await interaction.response.defer(**kwargs)
+
+    async def start(self, interaction: discord.Interaction) -> bool:
+        """
+        Send the first page. Returns False if there are no events at all.
+
+        The interaction may have been deferred by then, so callers reporting
+        "no events" must reply through the followup webhook.
+        """
+        await self._defer_until(interaction, 0, thinking=True)
+        embed = self.source.get_page(0)
+        if embed is None:
+            return False
+        self._update_buttons()
+        deferred = interaction.response.is_done()
+        with span('discord.respond'):
+            if self.next_page.disabled:
+                # Single page — no need for buttons
+                if deferred:
+                    await interaction.followup.send(embed=embed)
+                else:
+                    await interaction.response.send_message(embed=embed)
+                self.stop()
+                return True
+            if deferred:
+                self.message = await interaction.followup.send(embed=embed, view=self, wait=True)
+            else:
+                await interaction.response.send_message(embed=embed, view=self)
+                self.message = await interaction.original_response()
+        return True
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "❌ Only the person who ran this command can change pages.", ephemeral=True
+            )
+            return False
+        # Loading the next window counts against this button press's deadline
+        start_interaction_deadline(interaction.created_at)
+        bind_interaction(interaction)
+        return True
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        embed = self.source.get_page(self.index)
+        self._update_buttons()
+        with span('discord.respond'):
+            if interaction.response.is_done():
+                await interaction.edit_original_response(embed=embed, view=self)
+            else:
+                await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label='◀ Previous', style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.index = max(self.index - 1, 0)
+        with span('paginator.page', page=self.index + 1, guild_id=interaction.guild_id):
+            await self._show(interaction)
+
+    @discord.ui.button(label='Next ▶', style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Button presses aren't app commands, so each page turn is its own trace
+        with span('paginator.page', page=self.index + 2, guild_id=interaction.guild_id):
+            await self._defer_until(interaction, self.index + 1)
+            if self.source.has_page(self.index + 1):
+                self.index += 1
+            await self._show(interaction)
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,276 @@
+"""
+On-demand profiling and event-loop stall detection for the live bot.
+
+`ProfileSession` captures the event-loop thread for a number of seconds or
+until a number of slash commands have completed, whichever comes first:
+
+    cprofile  deterministic cProfile of everything on the loop thread;
+              produces a .pstats file (load with `python -m pstats`) and a
+              text summary sorted by cumulative time
+    sample    a background thread samples the loop thread's stack every
+              PROFILE_SAMPLE_INTERVAL_MS; produces collapsed stacks for
+              flamegraph.pl / speedscope.  Its overhead is low enough to
+              leave running under real load.
+
+`StallMonitor` runs all the time.  The loop bumps a heartbeat every few
+milliseconds, and a watchdog thread checks how old the heartbeat is.  If it
+is older than LOOP_STALL_THRESHOLD_MS, some callback is blocking the loop,
+for example synchronous HTTP or file I/O.  The watchdog then captures the
+loop thread's stack, which shows the blocking code, and keeps it in a
+short history.
+
+Only one profiling session can run at a time (cProfile cannot be nested).
+"""
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Optional
+
+from config import Config
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+MODES = ('cprofile', 'sample')
+
+_session: Optional['ProfileSession'] = None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    """Root-first 'a;b;c' stack for the collapsed-stack format."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class Stall:
+    """One period during which the event loop did not run."""
+
+    __slots__ = ('at', 'duration', 'stack')
+
+    def __init__(self, at: datetime, duration: float, stack: str):
+        self.at = at
+        self.duration = duration
+        self.stack = stack
+
+    def format(self) -> str:
+        return f"{self.at:%Y-%m-%d %H:%M:%S} — loop blocked {self.duration * 1000:.0f}ms\n{self.stack}"
+
+
+class StallMonitor:
+    """Watchdog thread that reports callbacks blocking the event loop."""
+
+    def __init__(self, threshold: float = None, history: int = 50):
+        self.threshold = (Config.LOOP_STALL_THRESHOLD_MS if threshold is None else threshold) / 1000
+        # Heartbeat often enough that a stall is measured to within ~1/4 of the threshold
+        self._interval = max(0.005, self.threshold / 4)
+        self.stalls: deque = deque(maxlen=history)
+        self.total = 0
+        self._loop = None
+        self._thread_id = None
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching the running loop; must be called from the loop thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name='loop-stall-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        if not self._stop.is_set():
+            self._loop.call_later(self._interval, self._beat)
+
+    def _watch(self) -> None:
+        stalled_since, stack, worst = None, None, 0.0
+        while not self._stop.wait(self._interval):
+            beat = self._last_beat
+            age = time.monotonic() - beat - self._interval
+            if age > self.threshold:
+                if stalled_since != beat:
+                    # New stall: capture the stack while the culprit is still running
+                    stalled_since, worst = beat, age
+                    frame = sys._current_frames().get(self._thread_id)
+                    stack = ''.join(traceback.format_stack(frame)) if frame else '(no stack)'
+                worst = max(worst, age)
+            elif stalled_since is not None:
+                self._record(worst, stack)
+                stalled_since, stack, worst = None, None, 0.0
+
+    def _record(self, duration: float, stack: str) -> None:
+        stall = Stall(datetime.now(), duration, stack)
+        self.stalls.append(stall)
+        self.total += 1
+        if _session is not None:
+            _session.stalls.append(stall)
+        log.warning(f"⚠️ Event loop blocked for {duration * 1000:.0f}ms",
+                    extra={'latency_ms': round(duration * 1000, 1)})
+
+
+stall_monitor = StallMonitor()
+
+
+class _Sampler:
+    """Samples one thread's stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.counts[_collapse(frame)] += 1
+                self.samples += 1
+
+
+class ProfileSession:
+    """
+    One profiling capture of the event-loop thread.
+
+    Args:
+        mode: 'cprofile' or 'sample'
+        seconds: Stop after this long (capped at PROFILE_MAX_SECONDS)
+        interactions: Stop earlier once this many slash commands have completed
+    """
+
+    def __init__(self, mode: str, seconds: float, interactions: int = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}' (use {' or '.join(MODES)})")
+        self.mode = mode
+        self.seconds = min(seconds, Config.PROFILE_MAX_SECONDS)
+        self.interactions = interactions
+        self.completed = 0
+        self.stalls: list = []
+        self._done = asyncio.Event()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_Sampler] = None
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        global _session
+        if _session is not None:
+            raise RuntimeError("A profiling session is already running")
+        self._started = time.monotonic()
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = _Sampler(threading.get_ident(), Config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+            self._sampler.start()
+        _session = self
+
+    def note_interaction(self) -> None:
+        self.completed += 1
+        if self.interactions and self.completed >= self.interactions:
+            self._done.set()
+
+    async def wait(self) -> None:
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=self.seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self) -> None:
+        global _session
+        if self._profiler:
+            self._profiler.disable()
+        if self._sampler:
+            self._sampler.stop()
+        self.elapsed = time.monotonic() - self._started
+        _session = None
+
+    def summary(self) -> str:
+        parts = [f"{self.mode} for {self.elapsed:.1f}s", f"{self.completed} command(s)"]
+        if self._sampler:
+            parts.append(f"{self._sampler.samples} sample(s)")
+        parts.append(f"{len(self.stalls)} loop stall(s)")
+        return " • ".join(parts)
+
+    def results(self) -> list:
+        """Output files as [(filename, bytes)]."""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        files = []
+        if self._profiler:
+            self._profiler.create_stats()
+            # Same format as Profile.dump_stats, without touching disk
+            files.append((f"profile-{stamp}.pstats", marshal.dumps(self._profiler.stats)))
+            text = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=text)
+            stats.sort_stats('cumulative').print_stats(Config.PROFILE_TOP_FUNCTIONS)
+            files.append((f"profile-{stamp}.txt", text.getvalue().encode('utf-8')))
+        if self._sampler:
+            lines = [f"{stack} {count}" for stack, count in self._sampler.counts.most_common()]
+            files.append((f"stacks-{stamp}.collapsed", "\n".join(lines).encode('utf-8')))
+        if self.stalls:
+            text = "\n\n".join(stall.format() for stall in self.stalls)
+            files.append((f"stalls-{stamp}.txt", text.encode('utf-8')))
+        return files
+
+
+def note_interaction() -> None:
+    """Count a completed slash command toward the running session, if any."""
+    if _session is not None:
+        _session.note_interaction()
+
+
+def parse_amount(amount: str) -> tuple:
+    """
+    Parse '30', '30s' or '20i' into (seconds, interactions).
+
+    An interaction count still stops at PROFILE_MAX_SECONDS.
+    """
+    amount = amount.strip().lower()
+    if amount.endswith('i'):
+        count = int(amount[:-1])
+        if count <= 0:
+            raise ValueError("Interaction count must be positive")
+        return Config.PROFILE_MAX_SECONDS, count
+    seconds = float(amount[:-1] if amount.endswith('s') else amount)
+    if seconds <= 0:
+        raise ValueError("Duration must be positive")
+    return seconds, None
@@ -0,0 +1,205 @@
+"""
+Token-bucket rate limiting and quota accounting per calendar credential.
+
+Teams that share a TeamUp API key or a Google service account share one
+bucket, so together they stay under the provider's limit.  Each request
+records which team made it and what kind of work it was for:
+
+    PRIORITY_REMINDER     reminder checks and catch-up (may drain the bucket)
+    PRIORITY_INTERACTIVE  slash commands (the default)
+    PRIORITY_BACKGROUND   prefetches that can simply try again later
+
+Lower priorities must leave part of the burst untouched for the ones above
+them.  When no token is available the request is shed with `RateLimited`,
+and the circuit breaker wrapper answers from cached data; the reminder loop
+simply tries again on its next pass.  Providers are called from the bot's
+coroutines, so waiting for a token there would freeze every guild (gateway
+heartbeats included).  Only code running off the event loop (scripts and
+tools) waits for the next token, if that fits in its deadline and
+RATE_LIMIT_MAX_WAIT.
+
+Limits are configured per credential in an optional top-level
+"rate_limits" block in teams.json, keyed by the credential's env-var name
+(or credentials file / "teamup:<calendar id>" when it isn't set via env):
+
+    "rate_limits": {
+      "TEAM1_TEAMUP_API_KEY": {"per_minute": 100, "burst": 20}
+    }
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from calendar_provider import CalendarUnavailableError
+from config import Config
+from deadlines import current_deadline, on_event_loop
+
+PRIORITY_REMINDER = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+# Share of the burst each priority must leave in the bucket for higher ones
+_RESERVE = {
+    PRIORITY_REMINDER: 0.0,
+    PRIORITY_INTERACTIVE: 0.2,
+    PRIORITY_BACKGROUND: 0.5,
+}
+
+_PRIORITY_NAMES = {
+    PRIORITY_REMINDER: 'reminder',
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+_priority: ContextVar[int] = ContextVar('calendar_priority', default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(level: int):
+    """Run the enclosed provider calls at `level` (PRIORITY_*)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimited(CalendarUnavailableError):
+    """Raised when a request is shed because its credential is out of quota."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute`."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, reserve: float = 0.0) -> float:
+        """Seconds until a token can be taken while keeping `reserve` tokens back."""
+        self._refill()
+        missing = reserve + 1 - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+
+class CredentialLimiter:
+    """Rate limit and per-team usage accounting for one shared credential."""
+
+    def __init__(self, label: str, per_minute: float, burst: int):
+        self.label = label
+        self.per_minute = per_minute
+        self.bucket = TokenBucket(per_minute, burst)
+        # team_id → monotonic timestamps of requests in the last hour
+        self._recent: dict[str, deque] = {}
+        # team_id → {'requests', 'waited', 'shed'} since startup
+        self._totals: dict[str, dict] = {}
+        self.teams: set = set()
+
+    def _count(self, team_id: str, key: str) -> None:
+        totals = self._totals.setdefault(team_id, {'requests': 0, 'waited': 0, 'shed': 0})
+        totals[key] += 1
+
+    def acquire(self, team_id: str) -> None:
+        """
+        Take a token for one request by `team_id`, waiting briefly if allowed.
+
+        Never waits on the event loop thread; the request is shed instead.
+
+        Raises:
+            RateLimited: if the request can't be served in time
+        """
+        level = _priority.get()
+        reserve = _RESERVE[level] * self.bucket.burst
+        wait = self.bucket.wait_time(reserve)
+        if wait > 0:
+            max_wait = Config.RATE_LIMIT_MAX_WAIT if level != PRIORITY_BACKGROUND else 0.0
+            if on_event_loop():
+                max_wait = 0.0
+            deadline = current_deadline()
+            if deadline:
+                max_wait = min(max_wait, deadline.remaining())
+            if wait > max_wait:
+                self._count(team_id, 'shed')
+                raise RateLimited(
+                    f"{self.label}: rate limit reached, {_PRIORITY_NAMES[level]} request shed"
+                )
+            self._count(team_id, 'waited')
+            time.sleep(wait)
+        self.bucket.take()
+        self._count(team_id, 'requests')
+        recent = self._recent.setdefault(team_id, deque())
+        now = time.monotonic()
+        recent.append(now)
+        while recent and now - recent[0] > 3600:
+            recent.popleft()
+
+    def usage(self, team_id: str) -> dict:
+        """Quota usage for `team_id` and the credential as a whole."""
+        now = time.monotonic()
+        recent = self._recent.get(team_id, ())
+        totals = self._totals.get(team_id, {'requests': 0, 'waited': 0, 'shed': 0})
+        self.bucket._refill()
+        return {
+            'credential': self.label,
+            'last_minute': sum(1 for ts in recent if now - ts <= 60),
+            'last_hour': sum(1 for ts in recent if now - ts <= 3600),
+            'shed': totals['shed'],
+            'waited': totals['waited'],
+            'per_minute': self.per_minute,
+            'tokens': int(self.bucket.tokens),
+            'burst': self.bucket.burst,
+            'shared_with': len(self.teams) - 1,
+        }
+
+
+def _parse_limit(label: str, value) -> tuple:
+    where = f"rate_limits '{label}'"
+    if not isinstance(value, dict):
+        raise ValueError(f"{where}: must be an object with 'per_minute' and 'burst'")
+    per_minute = value.get('per_minute')
+    burst = value.get('burst', per_minute)
+    for name, number in (('per_minute', per_minute), ('burst', burst)):
+        if isinstance(number, bool) or not isinstance(number, (int, float)) or number <= 0:
+            raise ValueError(f"{where}: '{name}' must be a positive number")
+    return float(per_minute), max(1, int(burst))
+
+
+class RateLimitRegistry:
+    """Hands out one `CredentialLimiter` per credential, shared by every team using it."""
+
+    _DEFAULTS = {
+        'teamup': (Config.TEAMUP_RATE_LIMIT_PER_MINUTE, Config.TEAMUP_RATE_LIMIT_BURST),
+        'google': (Config.GOOGLE_RATE_LIMIT_PER_MINUTE, Config.GOOGLE_RATE_LIMIT_BURST),
+        'ics': (Config.ICS_RATE_LIMIT_PER_MINUTE, Config.ICS_RATE_LIMIT_BURST),
+    }
+
+    def __init__(self, config: dict = None):
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ValueError("'rate_limits' must be an object keyed by credential")
+        self._limits = {label: _parse_limit(label, value) for label, value in config.items()}
+        self._limiters: dict[str, CredentialLimiter] = {}
+
+    def limiter_for(self, team) -> CredentialLimiter:
+        label = team.credential_label
+        limiter = self._limiters.get(label)
+        if limiter is None:
+            per_minute, burst = self._limits.get(
+                label, self._DEFAULTS.get(team.calendar_type, self._DEFAULTS['teamup'])
+            )
+            limiter = CredentialLimiter(label, per_minute, burst)
+            self._limiters[label] = limiter
+        limiter.teams.add(team.team_id)
+        return limiter
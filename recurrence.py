@@ -0,0 +1,416 @@
+"""
+Local expansion of iCalendar recurrence rules (RFC 5545 RRULE).
+
+Supports the rule parts calendars actually produce for team schedules:
+FREQ (DAILY/WEEKLY/MONTHLY/YEARLY), INTERVAL, COUNT, UNTIL, BYDAY (with
+ordinals such as 2MO or -1FR), BYMONTHDAY, BYMONTH and WKST, plus EXDATE
+and RDATE.  Occurrences are generated in the series' own timezone, so a
+19:00 practice stays at 19:00 local time across DST changes.
+
+`RecurringSeries.between()` expands lazily — only as far as the requested
+window — and memoizes recent windows.  `OccurrenceIndex` combines single
+events and series so providers can answer any window from a stored copy
+of the calendar.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from metrics import record_cache
+
+_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+# Upper bound on periods walked for one window, so a malformed rule can't spin forever
+_MAX_PERIODS = 50_000
+
+# Windows remembered per series
+_MEMO_SIZE = 16
+
+
+def resolve_tz(tzid: Optional[str], default: tzinfo) -> tzinfo:
+    """ZoneInfo for an IANA TZID, falling back to `default` for unknown names."""
+    if not tzid:
+        return default
+    try:
+        return ZoneInfo(tzid.strip('"'))
+    except (ZoneInfoNotFoundError, ValueError):
+        return default
+
+
+def parse_ical_datetime(value: str, tz: tzinfo = timezone.utc) -> tuple:
+    """
+    Parse an iCalendar DATE or DATE-TIME value.
+
+    Args:
+        value: e.g. '20250301', '20250301T190000' or '20250301T190000Z'
+        tz: Timezone for floating times and dates (from TZID or the calendar default)
+
+    Returns:
+        (aware datetime, all_day)
+    """
+    value = value.strip()
+    if 'T' not in value:
+        day = datetime.strptime(value[:8], '%Y%m%d')
+        return day.replace(tzinfo=tz), True
+    if value.endswith('Z'):
+        return datetime.strptime(value[:15], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc), False
+    return datetime.strptime(value[:15], '%Y%m%dT%H%M%S').replace(tzinfo=tz), False
+
+
+def parse_recurrence_lines(lines: list, tz: tzinfo) -> tuple:
+    """
+    Parse RRULE/EXDATE/RDATE property lines, as in a Google event's `recurrence`.
+
+    Returns:
+        (RecurrenceRule or None, set of excluded UTC datetimes, list of extra datetimes)
+    """
+    rule, exdates, rdates = None, set(), []
+    for line in lines:
+        head, _, value = line.partition(':')
+        name, *params = head.split(';')
+        param_tz = tz
+        for param in params:
+            key, _, param_value = param.partition('=')
+            if key.upper() == 'TZID':
+                param_tz = resolve_tz(param_value, tz)
+        name = name.upper()
+        if name == 'RRULE':
+            rule = RecurrenceRule.parse(value, tz)
+        elif name in ('EXDATE', 'RDATE'):
+            for item in value.split(','):
+                if '/' in item:
+                    continue  # RDATE periods aren't used by team calendars
+                dt, _ = parse_ical_datetime(item, param_tz)
+                if name == 'EXDATE':
+                    exdates.add(dt.astimezone(timezone.utc))
+                else:
+                    rdates.append(dt)
+    return rule, exdates, rdates
+
+
+class RecurrenceRule:
+    """A parsed RRULE."""
+
+    __slots__ = ('freq', 'interval', 'count', 'until', 'byday', 'bymonthday', 'bymonth', 'wkst')
+
+    def __init__(self, freq: str, interval: int = 1, count: Optional[int] = None,
+                 until: Optional[datetime] = None, byday: tuple = (), bymonthday: tuple = (),
+                 bymonth: tuple = (), wkst: int = 0):
+        self.freq = freq
+        self.interval = max(1, interval)
+        self.count = count
+        self.until = until
+        # ((ordinal or 0, weekday), ...)
+        self.byday = byday
+        self.bymonthday = bymonthday
+        self.bymonth = bymonth
+        self.wkst = wkst
+
+    @classmethod
+    def parse(cls, text: str, tz: tzinfo = timezone.utc) -> 'RecurrenceRule':
+        """Parse 'FREQ=WEEKLY;BYDAY=TU,TH;UNTIL=20250601T000000Z' (with or without 'RRULE:')."""
+        if text.upper().startswith('RRULE:'):
+            text = text[6:]
+        parts = {}
+        for part in text.strip().split(';'):
+            key, _, value = part.partition('=')
+            if key:
+                parts[key.upper()] = value.upper()
+
+        freq = parts.get('FREQ')
+        if freq not in ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'):
+            raise ValueError(f"Unsupported RRULE frequency: {freq!r}")
+
+        byday = []
+        for item in filter(None, parts.get('BYDAY', '').split(',')):
+            ordinal, weekday = item[:-2], item[-2:]
+            byday.append((int(ordinal) if ordinal not in ('', '+') else 0, _WEEKDAYS[weekday]))
+
+        until = None
+        if 'UNTIL' in parts:
+            until, all_day = parse_ical_datetime(parts['UNTIL'], tz)
+            if all_day:
+                # A DATE value includes the whole day
+                until += timedelta(days=1) - timedelta(microseconds=1)
+
+        return cls(
+            freq=freq,
+            interval=int(parts.get('INTERVAL', 1)),
+            count=int(parts['COUNT']) if 'COUNT' in parts else None,
+            until=until,
+            byday=tuple(byday),
+            bymonthday=tuple(int(d) for d in parts.get('BYMONTHDAY', '').split(',') if d),
+            bymonth=tuple(int(m) for m in parts.get('BYMONTH', '').split(',') if m),
+            wkst=_WEEKDAYS.get(parts.get('WKST', 'MO'), 0),
+        )
+
+    # ------------------------------------------------------------------
+    # Candidate dates per period
+    # ------------------------------------------------------------------
+
+    def _month_days(self, year: int, month: int, start: date) -> list:
+        first = date(year, month, 1)
+        days_in_month = ((first.replace(day=28) + timedelta(days=4)).replace(day=1) - first).days
+        monthdays = set()
+        for monthday in self.bymonthday:
+            day = monthday if monthday > 0 else days_in_month + monthday + 1
+            if 1 <= day <= days_in_month:
+                monthdays.add(first.replace(day=day))
+        weekdays = set()
+        for ordinal, weekday in self.byday:
+            matches = [first + timedelta(days=i) for i in range(days_in_month)
+                       if (first + timedelta(days=i)).weekday() == weekday]
+            if ordinal == 0:
+                weekdays.update(matches)
+            elif -len(matches) <= ordinal <= len(matches):
+                weekdays.add(matches[ordinal - 1 if ordinal > 0 else ordinal])
+        if self.bymonthday and self.byday:
+            # BYDAY restricts BYMONTHDAY (e.g. FR + 13 is Friday the 13th)
+            return sorted(monthdays & weekdays)
+        if self.bymonthday or self.byday:
+            return sorted(monthdays | weekdays)
+        if start.day <= days_in_month:
+            return [first.replace(day=start.day)]
+        return []
+
+    def _period_days(self, period: int, start: date) -> list:
+        """Candidate dates in the `period`-th period (0 = the one containing dtstart)."""
+        step = period * self.interval
+        if self.freq == 'DAILY':
+            day = start + timedelta(days=step)
+            return [day] if self._matches(day) else []
+        if self.freq == 'WEEKLY':
+            week_start = start - timedelta(days=(start.weekday() - self.wkst) % 7) + timedelta(weeks=step)
+            weekdays = sorted(w for _, w in self.byday) or [start.weekday()]
+            days = [week_start + timedelta(days=(w - self.wkst) % 7) for w in weekdays]
+            return sorted(d for d in days if not self.bymonth or d.month in self.bymonth)
+        if self.freq == 'MONTHLY':
+            month_index = start.month - 1 + step
+            year, month = start.year + month_index // 12, month_index % 12 + 1
+            if self.bymonth and month not in self.bymonth:
+                return []
+            return self._month_days(year, month, start)
+        year = start.year + step
+        days = []
+        for month in self.bymonth or (start.month,):
+            days.extend(self._month_days(year, month, start))
+        # BYMONTH keeps the order it was written in (e.g. 6,3)
+        return sorted(days)
+
+    def _matches(self, day: date) -> bool:
+        if self.bymonth and day.month not in self.bymonth:
+            return False
+        if self.byday and day.weekday() not in {w for _, w in self.byday}:
+            return False
+        if self.bymonthday and day.day not in self.bymonthday:
+            return False
+        return True
+
+    def _first_period(self, dtstart: datetime, window_start: datetime) -> int:
+        """Periods that can be skipped outright because they end before the window."""
+        if self.count is not None or window_start <= dtstart:
+            return 0
+        gap_days = (window_start - dtstart).days
+        # Longest possible period, so the estimate never skips past the window
+        period_days = {'DAILY': 1, 'WEEKLY': 7, 'MONTHLY': 31, 'YEARLY': 366}[self.freq]
+        return max(0, gap_days // (period_days * self.interval) - 1)
+
+    def occurrences(self, dtstart: datetime, window_start: datetime, window_end: datetime,
+                    duration: timedelta = timedelta(0)) -> Iterator[datetime]:
+        """
+        Yield occurrence starts whose [start, start + duration) overlaps the window.
+
+        `dtstart` is the first occurrence and fixes the local time of day.
+        """
+        tz = dtstart.tzinfo
+        local_start = dtstart.astimezone(tz)
+        start_date, time_of_day = local_start.date(), local_start.timetz().replace(tzinfo=None)
+        produced = 0
+        for period in range(self._first_period(dtstart, window_start), _MAX_PERIODS):
+            days = self._period_days(period, start_date)
+            if not days and self.freq == 'DAILY':
+                continue
+            for day in days:
+                occurrence = datetime.combine(day, time_of_day).replace(tzinfo=tz)
+                if occurrence < dtstart:
+                    continue
+                if self.until and occurrence > self.until:
+                    return
+                produced += 1
+                if self.count is not None and produced > self.count:
+                    return
+                if occurrence >= window_end:
+                    return
+                if occurrence + duration > window_start:
+                    yield occurrence
+            if days and datetime.combine(days[-1], time.min).replace(tzinfo=tz) >= window_end:
+                return
+
+
+class RecurringSeries:
+    """
+    A recurring master event that expands to occurrences on demand.
+
+    Args:
+        dtstart: Start of the first occurrence (aware)
+        duration: Length of each occurrence
+        rule: Parsed RRULE, or None for a series defined only by RDATEs
+        exdates: Excluded occurrence starts (UTC), including those replaced by overrides
+        rdates: Extra occurrence starts
+    """
+
+    def __init__(self, dtstart: datetime, duration: timedelta, rule: Optional[RecurrenceRule],
+                 exdates: set = None, rdates: list = None):
+        self.dtstart = dtstart
+        self.duration = duration
+        self.rule = rule
+        self.exdates = exdates or set()
+        self.rdates = rdates or []
+        self._memo: OrderedDict = OrderedDict()
+
+    def exclude(self, occurrence_start: datetime) -> None:
+        self.exdates.add(occurrence_start.astimezone(timezone.utc))
+        self._memo.clear()
+
+    def between(self, window_start: datetime, window_end: datetime) -> list:
+        """Occurrence starts overlapping [window_start, window_end), memoized per window."""
+        key = (window_start, window_end)
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+
+        starts = []
+        if self.rule:
+            starts.extend(self.rule.occurrences(self.dtstart, window_start, window_end, self.duration))
+        elif window_start - self.duration < self.dtstart < window_end:
+            starts.append(self.dtstart)
+        starts.extend(d for d in self.rdates if d < window_end and d + self.duration > window_start)
+        result = sorted(
+            {s for s in starts if s.astimezone(timezone.utc) not in self.exdates},
+            key=lambda s: s.astimezone(timezone.utc),
+        )
+
+        self._memo[key] = result
+        if len(self._memo) > _MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return result
+
+
+def occurrence_id(series_id: str, start: datetime, all_day: bool = False) -> str:
+    """
+    Stable ID for one occurrence, e.g. 'abc123_20250301T190000Z' ('abc123_20250301'
+    for all-day series) — the same scheme Google uses for expanded instances.
+    """
+    if all_day:
+        return f"{series_id}_{start.strftime('%Y%m%d')}"
+    return f"{series_id}_{start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+
+
+def split_occurrence_id(event_id: str) -> tuple:
+    """Inverse of `occurrence_id`: (series_id, start) or (event_id, None)."""
+    series_id, sep, stamp = str(event_id).rpartition('_')
+    if not sep:
+        return event_id, None
+    for fmt, length in (('%Y%m%dT%H%M%SZ', 16), ('%Y%m%d', 8)):
+        if len(stamp) == length:
+            try:
+                return series_id, datetime.strptime(stamp, fmt).replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+    return event_id, None
+
+
+class OccurrenceIndex:
+    """
+    Single events plus recurring series, queried by time window.
+
+    Single events (including moved instances of a series) are kept sorted by
+    start for bisecting; series are expanded only for the windows asked for.
+    Results are memoized per window until the index is modified.
+    Each result is (event_id, start, end, payload).
+    """
+
+    def __init__(self):
+        # (UTC start, event_id, start, duration, payload)
+        self._singles: list = []
+        self._starts: list = []
+        self._by_id: dict = {}
+        self._max_duration = timedelta(0)
+        # series_id → (RecurringSeries, payload, all_day)
+        self._series: dict = {}
+        self._sorted = True
+        self._windows: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._singles) + len(self._series)
+
+    def add_single(self, event_id: str, start: datetime, duration: timedelta, payload) -> None:
+        self._singles.append((start.astimezone(timezone.utc), event_id, start, duration, payload))
+        self._by_id[event_id] = (start, duration, payload)
+        self._max_duration = max(self._max_duration, duration)
+        self._sorted = False
+        self._windows.clear()
+
+    def add_series(self, series_id: str, series: RecurringSeries, payload, all_day: bool = False) -> None:
+        self._series[series_id] = (series, payload, all_day)
+        self._windows.clear()
+
+    def exclude(self, series_id: str, original_start: datetime) -> None:
+        """Drop one occurrence of a series (cancelled, or replaced by a moved instance)."""
+        entry = self._series.get(series_id)
+        if entry:
+            entry[0].exclude(original_start)
+            self._windows.clear()
+
+    def _ensure_sorted(self) -> None:
+        if not self._sorted:
+            self._singles.sort(key=lambda item: item[0])
+            self._starts = [item[0] for item in self._singles]
+            self._sorted = True
+
+    def between(self, window_start: datetime, window_end: datetime) -> list:
+        """Occurrences overlapping [window_start, window_end), sorted by start."""
+        key = (window_start, window_end)
+        if key in self._windows:
+            self._windows.move_to_end(key)
+            record_cache('occurrence_windows', True)
+            return self._windows[key]
+        record_cache('occurrence_windows', False)
+
+        self._ensure_sorted()
+        lo = bisect_left(self._starts, (window_start - self._max_duration).astimezone(timezone.utc))
+        hi = bisect_left(self._starts, window_end.astimezone(timezone.utc))
+        found = [
+            (event_id, start, start + duration, payload)
+            for _, event_id, start, duration, payload in self._singles[lo:hi]
+            if start + duration > window_start
+        ]
+        for series_id, (series, payload, all_day) in self._series.items():
+            for start in series.between(window_start, window_end):
+                found.append((occurrence_id(series_id, start, all_day), start,
+                              start + series.duration, payload))
+        found.sort(key=lambda item: item[1].astimezone(timezone.utc))
+
+        self._windows[key] = found
+        if len(self._windows) > _MEMO_SIZE:
+            self._windows.popitem(last=False)
+        return found
+
+    def find(self, event_id: str) -> Optional[tuple]:
+        """Look up a single event or occurrence by ID: (event_id, start, end, payload)."""
+        if event_id in self._by_id:
+            start, duration, payload = self._by_id[event_id]
+            return event_id, start, start + duration, payload
+        series_id, stamp = split_occurrence_id(event_id)
+        entry = self._series.get(series_id)
+        if entry is None or stamp is None:
+            return None
+        series, payload, all_day = entry
+        # All-day stamps are dates, so search the whole day around them
+        slack = timedelta(days=1) if all_day else timedelta(seconds=1)
+        for start in series.between(stamp - slack, stamp + slack):
+            if occurrence_id(series_id, start, all_day) == event_id:
+                return event_id, start, start + series.duration, payload
+        return None
@@ -0,0 +1,140 @@
+"""
+Reminder delivery SLO tracking.
+
+For each team, the reminder engine records how late every reminder and
+daily summary went out compared with its target time, plus:
+
+- sends that failed
+- reminders sent late by catch-up
+- reminders skipped because their event had already started
+- reminder checks that failed or had to plan from stale calendar data
+
+Lags are kept in a fixed-size ring buffer per team, so percentiles always
+cover the most recent deliveries and memory use does not grow.  `/botinfo`
+shows a snapshot, so operators can see timeliness slipping before players
+notice.
+
+Module-level state (`reminder_health`) survives a reload of the reminders
+cog, the same way the loop stall monitor does.
+"""
+import math
+from array import array
+from datetime import datetime
+from typing import Optional
+
+from config import Config
+
+
+def percentiles(values, *quantiles: float) -> list:
+    """Nearest-rank percentiles, e.g. p50 of [1, 2] is 1 (0.0 when empty)."""
+    ordered = sorted(values)
+    if not ordered:
+        return [0.0] * len(quantiles)
+    return [ordered[max(0, math.ceil(q * len(ordered)) - 1)] for q in quantiles]
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats that overwrites the oldest value."""
+
+    __slots__ = ('_values', '_next', 'count')
+
+    def __init__(self, capacity: int):
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self.count = min(self.count + 1, len(self._values))
+
+    def values(self) -> list:
+        return list(self._values[:self.count]) if self.count < len(self._values) else list(self._values)
+
+    def percentiles(self, *quantiles: float) -> list:
+        """Nearest-rank percentiles of the buffered values (0.0 when empty)."""
+        return percentiles(self.values(), *quantiles)
+
+
+class TeamHealth:
+    """Delivery counters and recent lags for one team."""
+
+    def __init__(self):
+        self.lags = RingBuffer(Config.REMINDER_HEALTH_SAMPLES)
+        self.sent = 0
+        self.failed = 0
+        self.late = 0
+        self.skipped = 0
+        self.checks_failed = 0
+        self.checks_stale = 0
+        self.last_sent: Optional[datetime] = None
+        self.last_check: Optional[str] = None  # 'fresh', 'stale' or 'failed'
+
+
+class ReminderHealth:
+    """Per-team reminder SLO tracker."""
+
+    def __init__(self):
+        self._teams: dict[str, TeamHealth] = {}
+
+    def _team(self, team_id: str) -> TeamHealth:
+        health = self._teams.get(team_id)
+        if health is None:
+            health = self._teams[team_id] = TeamHealth()
+        return health
+
+    def record_sent(self, team_id: str, lag_seconds: float, count: int = 1) -> None:
+        health = self._team(team_id)
+        health.lags.append(max(0.0, lag_seconds))
+        health.sent += count
+        health.last_sent = datetime.now()
+
+    def record_failure(self, team_id: str) -> None:
+        self._team(team_id).failed += 1
+
+    def record_late(self, team_id: str, count: int) -> None:
+        self._team(team_id).late += count
+
+    def record_skipped(self, team_id: str, count: int) -> None:
+        self._team(team_id).skipped += count
+
+    def record_check(self, team_id: str, status: str) -> None:
+        """Outcome of one reminder check: 'fresh', 'stale' or 'failed'."""
+        health = self._team(team_id)
+        health.last_check = status
+        if status == 'failed':
+            health.checks_failed += 1
+        elif status == 'stale':
+            health.checks_stale += 1
+
+    def lag_samples(self) -> list:
+        """Recent delivery lags (seconds) across all teams."""
+        return [lag for health in self._teams.values() for lag in health.lags.values()]
+
+    def snapshot(self, team_id: str) -> Optional[dict]:
+        """Summary for `/botinfo`, or None if nothing has been recorded for the team."""
+        health = self._teams.get(team_id)
+        if health is None:
+            return None
+        lags = health.lags.values()
+        p50, p95 = health.lags.percentiles(0.50, 0.95)
+        target = Config.REMINDER_SLO_LAG_SECONDS
+        return {
+            'sent': health.sent,
+            'failed': health.failed,
+            'late': health.late,
+            'skipped': health.skipped,
+            'samples': len(lags),
+            'on_time_pct': 100.0 * sum(1 for lag in lags if lag <= target) / len(lags) if lags else None,
+            'target_seconds': target,
+            'lag_p50': p50,
+            'lag_p95': p95,
+            'lag_max': max(lags) if lags else 0.0,
+            'checks_failed': health.checks_failed,
+            'checks_stale': health.checks_stale,
+            'last_check': health.last_check,
+            'last_sent': health.last_sent,
+        }
+
+
+reminder_health = ReminderHealth()
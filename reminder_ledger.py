@@ -0,0 +1,116 @@
+"""
+Persistent reminder ledger.
+
+Records which reminders and daily summaries have been sent, the last time
+the reminder loop ran, and the last good event list per team, so that a
+restart or reconnect can work out what was missed while the bot was down.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+LEDGER_FILE = 'reminder_ledger.json'
+
+# Sent-reminder entries older than this are dropped on save
+_RETENTION = timedelta(days=8)
+
+
+class ReminderLedger:
+    """Manages reminder delivery state persistence."""
+
+    def __init__(self, file_path: str = LEDGER_FILE):
+        """
+        Initialize the ledger.
+
+        Args:
+            file_path: Path to the JSON file for storing ledger data
+        """
+        self.file_path = file_path
+        data = self._load()
+        self._sent: dict[str, str] = data.get('sent', {})
+        self._daily: dict[str, str] = data.get('daily', {})
+        self._events: dict[str, dict] = data.get('events', {})
+        self._last_seen: Optional[str] = data.get('last_seen')
+
+    def _load(self) -> dict:
+        try:
+            with open(self.file_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _save(self) -> None:
+        cutoff = (datetime.now(timezone.utc) - _RETENTION).isoformat()
+        self._sent = {k: ts for k, ts in self._sent.items() if ts >= cutoff}
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'sent': self._sent,
+                'daily': self._daily,
+                'events': self._events,
+                'last_seen': self._last_seen,
+            }, f)
+        os.replace(tmp_path, self.file_path)
+
+    # ------------------------------------------------------------------
+    # Reminders
+    # ------------------------------------------------------------------
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sent
+
+    def mark_sent(self, keys: Iterable[str]) -> None:
+        """Record reminder keys as delivered."""
+        now = datetime.now(timezone.utc).isoformat()
+        for key in keys:
+            self._sent[key] = now
+        self._save()
+
+    def forget_prefix(self, prefix: str) -> None:
+        """Drop sent records whose key starts with `prefix` (e.g. a rescheduled event)."""
+        keys = [k for k in self._sent if k.startswith(prefix)]
+        if keys:
+            for key in keys:
+                del self._sent[key]
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Daily summaries
+    # ------------------------------------------------------------------
+
+    def daily_sent_on(self, team_id: str) -> Optional[str]:
+        """Return the YYYY-MM-DD date of the team's last daily summary."""
+        return self._daily.get(team_id)
+
+    def mark_daily_sent(self, team_id: str, date_str: str) -> None:
+        self._daily[team_id] = date_str
+        self._save()
+
+    # ------------------------------------------------------------------
+    # Liveness and cached events
+    # ------------------------------------------------------------------
+
+    @property
+    def last_seen(self) -> Optional[datetime]:
+        """When the reminder loop last completed a pass (None on first run)."""
+        return datetime.fromisoformat(self._last_seen) if self._last_seen else None
+
+    def touch(self) -> None:
+        self._last_seen = datetime.now(timezone.utc).isoformat()
+        self._save()
+
+    def store_events(self, team_id: str, events: list) -> None:
+        """Keep the team's latest event list for recovery when the calendar is unreachable."""
+        self._events[team_id] = {
+            'fetched_at': datetime.now(timezone.utc).isoformat(),
+            'events': events,
+        }
+
+    def cached_events(self, team_id: str) -> list:
+        return self._events.get(team_id, {}).get('events', [])
+
+    def cached_at(self, team_id: str) -> Optional[datetime]:
+        """When the cached event list was fetched (None if there is none)."""
+        fetched_at = self._events.get(team_id, {}).get('fetched_at')
+        return datetime.fromisoformat(fetched_at) if fetched_at else None
@@ -0,0 +1,160 @@
+"""
+Per-team reminder policy: offsets, check interval and message templates.
+
+Configured under an optional "reminders" key for each team in teams.json:
+
+    "reminders": {
+      "offsets": [0.5],
+      "check_interval": 5,
+      "daily_summary_time": "12:00",
+      "template": "🚨 **EVENT STARTING {WHEN}**",
+      "digest_template": "🚨 **{count} EVENTS STARTING {WHEN}**",
+      "types": {
+        "Official": {"offsets": [24, 2, 0.5], "template": "🏆 **OFFICIAL MATCH {WHEN}**"},
+        "Scrim":    {"offsets": [0.5]}
+      }
+    }
+
+Offsets are hours before the event.  Type names match the provider's event
+type case-insensitively by substring ("official" matches "Official Match").
+Templates may use {when} ("in 30 minutes"), {WHEN} ("IN 30 MINUTES"),
+{title}, {type} and, in digests, {count}.  `daily_summary_time` is
+HH:MM in the team's configured timezone.  Everything is validated when
+the policy is built, so a bad teams.json fails at startup rather than at
+reminder time.
+"""
+from datetime import time, timedelta
+from typing import Optional
+
+from config import Config
+
+DEFAULT_TEMPLATE = "🚨 **EVENT STARTING {WHEN}**"
+DEFAULT_DIGEST_TEMPLATE = "🚨 **{count} EVENTS STARTING {WHEN}**"
+
+_SAMPLE_FIELDS = {'when': 'in 30 minutes', 'WHEN': 'IN 30 MINUTES', 'title': 'Event',
+                  'type': 'Scrim', 'count': 2}
+
+
+def describe_offset(hours: float) -> str:
+    """Human-readable lead time, e.g. 0.5 → 'in 30 minutes', 24 → 'in 24 hours'."""
+    minutes = round(hours * 60)
+    if minutes < 60 or minutes % 60:
+        return f"in {minutes} minute{'s' if minutes != 1 else ''}"
+    whole_hours = minutes // 60
+    if whole_hours < 48 or whole_hours % 24:
+        return f"in {whole_hours} hour{'s' if whole_hours != 1 else ''}"
+    return f"in {whole_hours // 24} days"
+
+
+def _parse_offsets(value, where: str) -> tuple:
+    if not isinstance(value, list) or not value:
+        raise ValueError(f"{where}: 'offsets' must be a non-empty list of hours")
+    for hours in value:
+        if isinstance(hours, bool) or not isinstance(hours, (int, float)) or hours <= 0:
+            raise ValueError(f"{where}: invalid offset {hours!r} (must be a positive number of hours)")
+    return tuple(sorted(set(float(h) for h in value), reverse=True))
+
+
+def _parse_template(value, where: str) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{where}: template must be a non-empty string")
+    try:
+        value.format(**_SAMPLE_FIELDS)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"{where}: invalid template {value!r} ({e})") from None
+    return value
+
+
+def _parse_daily_time(value, where: str) -> time:
+    try:
+        hour, minute = (int(part) for part in str(value).split(':'))
+        return time(hour=hour, minute=minute)
+    except ValueError:
+        raise ValueError(f"{where}: 'daily_summary_time' must be HH:MM, got {value!r}") from None
+
+
+class ReminderPolicy:
+    """Validated, precompiled reminder settings for one team."""
+
+    def __init__(self, data: Optional[dict] = None, team_id: str = '?'):
+        data = data or {}
+        where = f"team '{team_id}' reminders"
+        if not isinstance(data, dict):
+            raise ValueError(f"{where}: must be an object")
+
+        self.offsets: tuple = (
+            _parse_offsets(data['offsets'], where) if 'offsets' in data
+            else tuple(sorted(Config.REMINDER_TIMES, reverse=True))
+        )
+        interval = data.get('check_interval', Config.CHECK_INTERVAL)
+        if isinstance(interval, bool) or not isinstance(interval, int) or interval < Config.CHECK_INTERVAL:
+            raise ValueError(
+                f"{where}: 'check_interval' must be a whole number of minutes "
+                f">= {Config.CHECK_INTERVAL}"
+            )
+        self.check_interval: int = interval
+        self.daily_time: time = _parse_daily_time(
+            data.get('daily_summary_time', Config.DAILY_SUMMARY_TIME), where
+        )
+        self.template: str = _parse_template(data.get('template'), where) or DEFAULT_TEMPLATE
+        self.digest_template: str = (
+            _parse_template(data.get('digest_template'), where) or DEFAULT_DIGEST_TEMPLATE
+        )
+
+        # [(lowercase type keyword, offsets, template)] in config order
+        self._types: list[tuple[str, tuple, Optional[str]]] = []
+        types = data.get('types', {})
+        if not isinstance(types, dict):
+            raise ValueError(f"{where}: 'types' must be an object keyed by event type")
+        for type_name, type_data in types.items():
+            type_where = f"{where}, type '{type_name}'"
+            if not isinstance(type_data, dict):
+                raise ValueError(f"{type_where}: must be an object")
+            offsets = (_parse_offsets(type_data['offsets'], type_where)
+                       if 'offsets' in type_data else self.offsets)
+            self._types.append((
+                type_name.lower(), offsets, _parse_template(type_data.get('template'), type_where)
+            ))
+
+        all_offsets = set(self.offsets).union(*(o for _, o, _ in self._types))
+        self.max_offset = timedelta(hours=max(all_offsets))
+        self.min_offset = timedelta(hours=min(all_offsets))
+        self._lookup_cache: dict = {}
+
+    def _match(self, event_type: Optional[str]):
+        if event_type in self._lookup_cache:
+            return self._lookup_cache[event_type]
+        match = (self.offsets, None)
+        if event_type:
+            lower = event_type.lower()
+            for keyword, offsets, template in self._types:
+                if keyword in lower:
+                    match = (offsets, template)
+                    break
+        self._lookup_cache[event_type] = match
+        return match
+
+    def offsets_for(self, event_type: Optional[str]) -> tuple:
+        """Reminder offsets (hours, largest first) for an event of this type."""
+        return self._match(event_type)[0]
+
+    def headline(self, events: list, event_types: list, hours: float) -> str:
+        """Render the headline for a reminder covering `events` at `hours` before start."""
+        when = describe_offset(hours)
+        fields = {'when': when, 'WHEN': when.upper(), 'count': len(events)}
+        if len(events) == 1:
+            event_type = event_types[0]
+            template = self._match(event_type)[1] or self.template
+            fields.update(title=events[0].get('title', 'Event'), type=event_type or 'Event')
+            return template.format(**fields)
+        fields.update(title='', type='')
+        return self.digest_template.format(**fields)
+
+    def describe(self) -> str:
+        """Summary for /botinfo, e.g. '0.5h • Official: 24h, 2h, 0.5h'."""
+        parts = [", ".join(f"{h:g}h" for h in self.offsets)]
+        for keyword, offsets, _ in self._types:
+            parts.append(f"{keyword.title()}: " + ", ".join(f"{h:g}h" for h in offsets))
+        return " • ".join(parts)
@@ -0,0 +1,121 @@
+"""
+Ahead-of-time reminder scheduling.
+
+The reminder loop plans reminders a few minutes before they are due: it
+resolves rosters and event types, renders the message payloads, and arms
+a timer for the exact fire time.  When the timer fires the only work left
+is a single send.  If the event changes before then, the next planning
+pass notices the different fingerprint and re-renders the payload.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from metrics import REMINDER_LAG_SECONDS
+from tracing import root_span
+
+
+def event_fingerprint(event: dict) -> tuple:
+    """Fields that affect a rendered reminder; a change triggers a re-render."""
+    return (
+        event['id'],
+        event.get('start_dt'),
+        event.get('end_dt'),
+        event.get('title'),
+        event.get('notes'),
+        event.get('location'),
+        event.get('who'),
+    )
+
+
+class ScheduledReminder:
+    """A rendered reminder waiting for its fire time."""
+
+    __slots__ = ('key', 'team_id', 'fire_at', 'fingerprint', 'channel', 'payloads',
+                 'event_keys', 'task')
+
+    def __init__(self, key: str, team_id: str, fire_at: datetime, fingerprint: tuple,
+                 channel, payloads: list, event_keys: list):
+        self.key = key
+        self.team_id = team_id
+        self.fire_at = fire_at
+        self.fingerprint = fingerprint
+        self.channel = channel
+        self.payloads = payloads
+        self.event_keys = event_keys
+        self.task: Optional[asyncio.Task] = None
+
+
+class ReminderScheduler:
+    """
+    Holds pre-rendered reminders and fires each one at its target time.
+
+    Args:
+        send: Coroutine called as send(entry) at fire time; it should deliver
+            `entry.payloads` to `entry.channel`
+    """
+
+    def __init__(self, send: Callable[[ScheduledReminder], Awaitable[None]]):
+        self._send = send
+        self._entries: dict[str, ScheduledReminder] = {}
+        # Seconds between each reminder's target time and its actual send
+        self.fire_lags: deque = deque(maxlen=200)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pending(self, team_id: str = None) -> list:
+        return [e for e in self._entries.values() if team_id is None or e.team_id == team_id]
+
+    def plan(self, key: str, team_id: str, fire_at: datetime, fingerprint: tuple, channel,
+             render: Callable[[], list], event_keys: list) -> bool:
+        """
+        Schedule (or refresh) a reminder.
+
+        `render` is only called when the reminder is new or its fingerprint or
+        fire time changed, so repeated planning passes are cheap.
+
+        Returns:
+            True if the payload was (re)rendered
+        """
+        existing = self._entries.get(key)
+        if existing and existing.fingerprint == fingerprint and existing.fire_at == fire_at:
+            existing.channel = channel
+            return False
+        if existing:
+            self.cancel(key)
+
+        entry = ScheduledReminder(key, team_id, fire_at, fingerprint, channel, render(), event_keys)
+        entry.task = asyncio.create_task(self._fire(entry))
+        self._entries[key] = entry
+        return True
+
+    def retain(self, team_id: str, keys: set) -> None:
+        """Cancel this team's reminders that are no longer part of the plan."""
+        for entry in self.pending(team_id):
+            if entry.key not in keys:
+                self.cancel(entry.key)
+
+    def cancel(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry and entry.task and not entry.task.done():
+            entry.task.cancel()
+
+    def cancel_all(self) -> None:
+        for key in list(self._entries):
+            self.cancel(key)
+
+    async def _fire(self, entry: ScheduledReminder) -> None:
+        delay = (entry.fire_at - datetime.now(timezone.utc)).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Drop the entry before sending so a concurrent plan() can't cancel
+        # a send that is already in flight
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        with root_span('reminders.fire', team=entry.team_id, reminders=len(entry.event_keys)):
+            await self._send(entry)
+        lag = (datetime.now(timezone.utc) - entry.fire_at).total_seconds()
+        self.fire_lags.append(lag)
+        REMINDER_LAG_SECONDS.labels(kind='reminder').observe(max(0.0, lag))
@@ -1,12 +1,28 @@
 import discord
 from discord.ext import commands, tasks
-from datetime import datetime, timedelta, time
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta, timezone
 from embeds import format_event_embed
 from roster_storage import RosterStorage
 from config import Config
+from dispatcher import PRIORITY_REMINDER, PRIORITY_SUMMARY, MAX_EMBEDS, MAX_EMBED_TOTAL
+from reminder_scheduler import ReminderScheduler, event_fingerprint
+from reminder_ledger import ReminderLedger
+from reminder_health import reminder_health
+from change_detection import ChangeDetector, MOVED, format_change_lines
+from resilience import is_stale
+from deadlines import deadline
+from metrics import REMINDER_LAG_SECONDS
+# Calendar request priorities are a separate scale from the dispatcher's
+from rate_limiter import (PRIORITY_BACKGROUND as REQUEST_PRIORITY_BACKGROUND,
+                          PRIORITY_REMINDER as REQUEST_PRIORITY_REMINDER, request_priority)
+from tracing import root_span, span
+from logging_setup import get_logger
+import asyncio
+import math
 import random
 
+log = get_logger(__name__)
+
 
 # Marvel Rivals themed inspirational quotes
 INSPIRATIONAL_QUOTES = [
@@ -119,53 +135,247 @@ class Reminders(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.sent_reminders = set()
+        # Sent reminders, daily summaries and last-good events, persisted across restarts
+        self.ledger = ReminderLedger()
+        self._recovery_lock = asyncio.Lock()
+        self.change_detector = ChangeDetector()
+        self._disconnected_at = None
         self.roster_storage = RosterStorage()
+        self.scheduler = ReminderScheduler(self._fire_reminder)
+        # team_id → when check_reminders last planned that team's reminders
+        self._last_checked: dict[str, datetime] = {}
         self.check_reminders.start()
-        self.daily_noon_reminder.start()
+        # Daily summaries armed for delivery: {(team_id, 'YYYY-MM-DD')}
+        self._daily_armed: set = set()
+        self._daily_tasks: set = set()
+        self.daily_summary_scheduler.start()
 
     def cog_unload(self):
         self.check_reminders.cancel()
-        self.daily_noon_reminder.cancel()
+        self.daily_summary_scheduler.cancel()
+        for task in self._daily_tasks:
+            task.cancel()
+        self.scheduler.cancel_all()
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _reminder_key(team_id: str, event: dict, hours_before: float) -> str:
+        return f"{team_id}_{event['id']}_{hours_before}"
+
     def should_send_reminder(self, team_id: str, event: dict, hours_before: float) -> bool:
         event_time = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
         reminder_time = event_time - timedelta(hours=hours_before)
         now = datetime.now(reminder_time.tzinfo)
         time_diff = (now - reminder_time).total_seconds()
-        key = f"{team_id}_{event['id']}_{hours_before}"
-        if -300 <= time_diff <= 300 and key not in self.sent_reminders:
-            self.sent_reminders.add(key)
+        key = self._reminder_key(team_id, event, hours_before)
+        if -300 <= time_diff <= 300 and key not in self.ledger:
+            self.ledger.mark_sent([key])
             return True
         return False
 
-    async def send_reminder(self, channel, team, event, hours_before):
-        calendar = team.get_calendar()
-        team_name = event.get('team_name') or event.get('title', '').strip()
-        roster = self.roster_storage.get_roster(team_name) if team_name else None
-        event_type = calendar.get_event_type(event)
+    @staticmethod
+    def _fetch_days(team) -> int:
+        """Days of events to fetch so the team's longest reminder offset is covered."""
+        return max(7, math.ceil(team.reminder_policy.max_offset.total_seconds() / 86400) + 1)
 
-        embed = format_event_embed(event, roster=roster, event_type=event_type)
+    def collect_due_reminders(self, team, events) -> dict:
+        """Group the events whose reminders are due now by offset: {hours_before: [events]}."""
+        calendar = team.get_calendar()
+        policy = team.reminder_policy
+        due = {}
+        for event in events:
+            for hours in policy.offsets_for(calendar.get_event_type(event)):
+                if self.should_send_reminder(team.team_id, event, hours):
+                    due.setdefault(hours, []).append(event)
+        return due
 
+    def _mention_text(self, team) -> str:
         mentions = []
         if team.player_role_id:
             mentions.append(f"<@&{team.player_role_id}>")
         if team.coach_role_id:
             mentions.append(f"<@&{team.coach_role_id}>")
-        mention_text = " ".join(mentions)
+        return " ".join(mentions)
+
+    def _build_reminder_payloads(self, team, events, hours_before) -> list:
+        """
+        Render reminder messages covering `events` as [(content, embeds)].
+
+        Rosters and event types are resolved once per event, and events are
+        packed into as few messages as Discord's embed limits allow, each
+        with a single set of role pings.
+        """
+        calendar = team.get_calendar()
+        rendered = []
+        for event in sorted(events, key=lambda e: e['start_dt']):
+            team_name = event.get('team_name') or event.get('title', '').strip()
+            roster = self.roster_storage.get_roster(team_name) if team_name else None
+            event_type = calendar.get_event_type(event)
+            rendered.append((event, event_type, format_event_embed(event, roster=roster, event_type=event_type)))
+
+        chunks, chunk, chunk_chars = [], [], 0
+        for item in rendered:
+            size = len(item[2])
+            if chunk and (len(chunk) >= MAX_EMBEDS or chunk_chars + size > MAX_EMBED_TOTAL):
+                chunks.append(chunk)
+                chunk, chunk_chars = [], 0
+            chunk.append(item)
+            chunk_chars += size
+        if chunk:
+            chunks.append(chunk)
+
+        mention_text = self._mention_text(team)
+        payloads = []
+        for chunk in chunks:
+            headline = team.reminder_policy.headline(
+                [event for event, _, _ in chunk], [event_type for _, event_type, _ in chunk], hours_before
+            )
+            payloads.append((f"{headline}\n{mention_text}", [embed for _, _, embed in chunk]))
+        return payloads
+
+    async def send_reminder(self, channel, team, event, hours_before) -> bool:
+        return await self.send_reminder_digest(channel, team, [event], hours_before)
 
+    async def _deliver_payloads(self, channel, payloads) -> None:
+        for content, embeds in payloads:
+            await self.bot.dispatcher.send(
+                channel,
+                content=content,
+                embeds=embeds,
+                priority=PRIORITY_REMINDER,
+            )
+
+    async def send_reminder_digest(self, channel, team, events, hours_before) -> bool:
+        """
+        Send one digest message (or as few as possible) for events sharing a reminder window.
+
+        Returns True once delivered; a failed send is logged and returns False.
+        """
+        titles = ", ".join(e.get('title', 'Unknown') for e in events)
         try:
-            await channel.send(
-                content=f"🚨 **EVENT STARTING IN 30 MINUTES**\n{mention_text}",
-                embed=embed
+            await self._deliver_payloads(channel, self._build_reminder_payloads(team, events, hours_before))
+            log.info(f"✅ [{team.name}] Sent reminder for: {titles}", extra={'team_id': team.team_id})
+            return True
+        except Exception as e:
+            reminder_health.record_failure(team.team_id)
+            log.error(f"❌ [{team.name}] Error sending reminder: {e}", extra={'team_id': team.team_id})
+            return False
+
+    def plan_reminders(self, team, channel, events) -> None:
+        """
+        Pre-render reminders due within the prefetch window and arm their timers.
+
+        All of the team's offsets (per event type, from its reminder policy)
+        are handled in one pass over the events: events that can't have any
+        reminder inside the window are rejected with a single bounds check
+        before their offsets are looked at.
+
+        Reminders for the same offset whose fire times land in the same
+        digest window (one check interval) are planned as a single digest
+        that fires at the earliest of their times.  Reminders up to 5 minutes
+        overdue are still planned and fire immediately.
+        """
+        calendar = team.get_calendar()
+        policy = team.reminder_policy
+        now = datetime.now(timezone.utc)
+        lead = Config.REMINDER_PREFETCH_MINUTES - Config.CHECK_INTERVAL
+        horizon = now + timedelta(minutes=policy.check_interval + lead)
+        grace = now - timedelta(minutes=5)
+        earliest_start = grace + policy.min_offset
+        latest_start = horizon + policy.max_offset
+        window_seconds = Config.CHECK_INTERVAL * 60
+
+        groups = {}
+        for event in events:
+            start = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
+            if not earliest_start <= start <= latest_start:
+                continue
+            for hours in policy.offsets_for(calendar.get_event_type(event)):
+                fire_at = start - timedelta(hours=hours)
+                if not grace <= fire_at <= horizon:
+                    continue
+                key = self._reminder_key(team.team_id, event, hours)
+                if key in self.ledger:
+                    continue
+                window = int(fire_at.timestamp()) // window_seconds
+                groups.setdefault((hours, window), []).append((fire_at, event, key))
+
+        planned = set()
+        for (hours, window), members in groups.items():
+            group_key = f"{team.team_id}_{hours}_{window}"
+            group_events = [event for _, event, _ in members]
+            planned.add(group_key)
+            self.scheduler.plan(
+                group_key,
+                team.team_id,
+                fire_at=min(fire_at for fire_at, _, _ in members),
+                fingerprint=tuple(event_fingerprint(e) for e in group_events),
+                channel=channel,
+                render=lambda: self._build_reminder_payloads(team, group_events, hours),
+                event_keys=[key for _, _, key in members],
             )
-            print(f"✅ [{team.name}] Sent reminder for: {event.get('title', 'Unknown')}")
+        self.scheduler.retain(team.team_id, planned)
+
+    async def _fire_reminder(self, entry):
+        """Scheduler callback: deliver a pre-rendered reminder."""
+        try:
+            await self._deliver_payloads(entry.channel, entry.payloads)
+            # Only recorded once delivered, so a failed send is retried by the
+            # next planning pass or picked up by catch-up recovery
+            self.ledger.mark_sent(entry.event_keys)
+            lag_ms = (datetime.now(timezone.utc) - entry.fire_at).total_seconds() * 1000
+            reminder_health.record_sent(entry.team_id, lag_ms / 1000, len(entry.event_keys))
+            log.info(f"✅ [{entry.team_id}] Sent {len(entry.event_keys)} reminder(s), "
+                     f"{lag_ms:.0f}ms after target",
+                     extra={'team_id': entry.team_id, 'latency_ms': round(lag_ms, 1)})
+        except Exception as e:
+            reminder_health.record_failure(entry.team_id)
+            log.error(f"❌ [{entry.team_id}] Error sending reminder: {e}", extra={'team_id': entry.team_id})
+
+    def _detect_changes(self, team, events, window_end) -> list:
+        """Diff this sync against the previous one (seeded from the ledger after a restart)."""
+        if not self.change_detector.has_snapshot(team.team_id):
+            cached = self.ledger.cached_events(team.team_id)
+            cached_at = self.ledger.cached_at(team.team_id)
+            if cached and cached_at:
+                # The range that list was fetched for, as in _check_team
+                self.change_detector.seed(team.team_id, cached,
+                                          cached_at + timedelta(days=self._fetch_days(team) - 1))
+        return self.change_detector.update(team.team_id, events, window_end)
+
+    async def _handle_changes(self, team, channel, changes) -> None:
+        """Re-plan reminders for rescheduled events and post a compact change notice."""
+        for change in changes:
+            if change.kind == MOVED:
+                # The old time's reminders no longer apply — let the new time's fire
+                self.ledger.forget_prefix(f"{team.team_id}_{change.event['id']}_")
+
+        if not Config.CHANGE_NOTICES_ENABLED:
+            return
+        lines = format_change_lines(changes)
+        description = ""
+        for line in lines:
+            if len(description) + len(line) + 1 > 4000:
+                description += "\n…"
+                break
+            description += ("\n" if description else "") + line
+
+        embed = discord.Embed(
+            title="📢 Schedule Update",
+            description=description,
+            color=discord.Color.blurple(),
+            timestamp=datetime.now()
+        )
+        try:
+            await self.bot.dispatcher.send(channel, embed=embed)
+            log.info(f"✅ [{team.name}] Posted {len(changes)} schedule change(s)",
+                     extra={'team_id': team.team_id})
         except Exception as e:
-            print(f"❌ [{team.name}] Error sending reminder: {e}")
+            log.error(f"❌ [{team.name}] Error posting schedule changes: {e}",
+                      extra={'team_id': team.team_id})
 
     # ------------------------------------------------------------------
     # Background tasks
@@ -173,53 +383,129 @@ class Reminders(commands.Cog):
 
     @tasks.loop(minutes=Config.CHECK_INTERVAL)
     async def check_reminders(self):
-        """Check for upcoming events across all teams and send reminders."""
+        """Check for upcoming events across all teams and plan their reminders."""
+        now = datetime.now(timezone.utc)
         for team in self.bot.team_manager.get_all_teams():
             if not team.reminder_channel_id:
                 continue
             channel = self.bot.get_channel(team.reminder_channel_id)
             if not channel:
                 continue
-            try:
-                calendar = team.get_calendar()
-                events = calendar.get_upcoming_events(days=7)
-            except Exception as e:
-                print(f"❌ [{team.name}] Calendar error: {e}")
+            last = self._last_checked.get(team.team_id)
+            # Small tolerance so loop jitter doesn't push a team to the next tick
+            if last and (now - last).total_seconds() < team.reminder_policy.check_interval * 60 - 30:
                 continue
+            with span('reminders.check', team=team.team_id):
+                await self._check_team(team, channel, now)
 
-            for event in events:
-                for hours in Config.REMINDER_TIMES:
-                    if self.should_send_reminder(team.team_id, event, hours):
-                        await self.send_reminder(channel, team, event, hours)
+        self.ledger.touch()
+
+    async def _check_team(self, team, channel, now) -> None:
+        try:
+            # Per-team budget so one slow calendar can't stall the others
+            with deadline(Config.REMINDER_DEADLINE), request_priority(REQUEST_PRIORITY_REMINDER):
+                calendar = team.get_calendar()
+                events = calendar.get_upcoming_events(days=self._fetch_days(team))
+        except Exception as e:
+            reminder_health.record_check(team.team_id, 'failed')
+            log.error(f"❌ [{team.name}] Calendar error: {e}", extra={'team_id': team.team_id})
+            return
+
+        self._last_checked[team.team_id] = now
+        changes = self._detect_changes(team, events, now + timedelta(days=self._fetch_days(team) - 1))
+        if is_stale(events):
+            reminder_health.record_check(team.team_id, 'stale')
+            log.warning(f"⚠️ [{team.name}] Calendar unreachable, planning from data fetched "
+                        f"{events.fetched_at:%H:%M}", extra={'team_id': team.team_id})
+        else:
+            reminder_health.record_check(team.team_id, 'fresh')
+            self.ledger.store_events(team.team_id, events)
+        if changes:
+            await self._handle_changes(team, channel, changes)
+        with span('reminders.plan', events=len(events)):
+            self.plan_reminders(team, channel, events)
 
     @check_reminders.before_loop
     async def before_check_reminders(self):
         await self.bot.wait_until_ready()
-        print(f"✅ Reminder checker started (every {Config.CHECK_INTERVAL} min)")
+        # Catch up on anything that came due while the bot was offline
+        await self.recover_missed(since=self.ledger.last_seen)
+        log.info(f"✅ Reminder checker started (every {Config.CHECK_INTERVAL} min)")
 
-    @tasks.loop(time=time(hour=12, minute=0))
-    async def daily_noon_reminder(self):
-        """Send daily noon summary to each team's reminder channel."""
+    def _daily_groups(self) -> dict:
+        """Group teams that share a timezone and summary time: {(tz, time): [teams]}."""
+        groups = {}
         for team in self.bot.team_manager.get_all_teams():
-            if not team.reminder_channel_id:
-                continue
-            channel = self.bot.get_channel(team.reminder_channel_id)
-            if not channel:
+            if team.reminder_channel_id:
+                key = (team.timezone or 'UTC', team.reminder_policy.daily_time)
+                groups.setdefault(key, []).append(team)
+        return groups
+
+    @tasks.loop(minutes=1)
+    async def daily_summary_scheduler(self):
+        """
+        Deliver each team's daily summary at its local summary time.
+
+        Teams are bucketed by timezone and summary time.  A few minutes before
+        a bucket's time its summaries are fetched and rendered, then armed to
+        send on the exact minute, so each region gets its summary on time and
+        the calendar fetches are spread across the day instead of all at once.
+        """
+        now = datetime.now(timezone.utc)
+        prefetch = timedelta(minutes=Config.DAILY_SUMMARY_PREFETCH_MINUTES)
+        for (_, daily_time), teams in self._daily_groups().items():
+            tz = teams[0].tzinfo
+            local_now = now.astimezone(tz)
+            fire_at = datetime.combine(local_now.date(), daily_time, tzinfo=tz)
+            # Prefetch window opens early; allow a few minutes of retries after
+            if not fire_at - prefetch <= now <= fire_at + timedelta(minutes=5):
                 continue
-            try:
-                await self._send_daily_summary(channel, team)
-            except Exception as e:
-                print(f"❌ [{team.name}] Daily reminder error: {e}")
 
-    @daily_noon_reminder.before_loop
-    async def before_daily_noon_reminder(self):
+            today = local_now.strftime('%Y-%m-%d')
+            for team in teams:
+                armed_key = (team.team_id, today)
+                if armed_key in self._daily_armed or self.ledger.daily_sent_on(team.team_id) == today:
+                    continue
+                channel = self.bot.get_channel(team.reminder_channel_id)
+                if not channel:
+                    continue
+                try:
+                    # Prefetched minutes ahead of time, so it can afford a longer budget
+                    with deadline(Config.BACKGROUND_DEADLINE), request_priority(REQUEST_PRIORITY_BACKGROUND):
+                        payload = self._build_daily_summary(team, today)
+                except Exception as e:
+                    log.error(f"❌ [{team.name}] Daily summary prefetch error: {e}",
+                              extra={'team_id': team.team_id})
+                    continue
+                self._daily_armed.add(armed_key)
+                task = asyncio.create_task(self._fire_daily_summary(channel, team, payload, fire_at))
+                self._daily_tasks.add(task)
+                task.add_done_callback(self._daily_tasks.discard)
+
+    @daily_summary_scheduler.before_loop
+    async def before_daily_summary_scheduler(self):
         await self.bot.wait_until_ready()
-        print("✅ Daily noon reminder started (12:00 PM daily)")
+        log.info(f"✅ Daily summary scheduler started ({len(self._daily_groups())} timezone group(s))")
 
-    async def _send_daily_summary(self, channel, team):
+    async def _fire_daily_summary(self, channel, team, payload, fire_at):
+        delay = (fire_at - datetime.now(timezone.utc)).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            with root_span('reminders.daily', team=team.team_id):
+                await self._deliver_daily_summary(channel, team, payload)
+            lag = (datetime.now(timezone.utc) - fire_at).total_seconds()
+            REMINDER_LAG_SECONDS.labels(kind='daily').observe(max(0.0, lag))
+            reminder_health.record_sent(team.team_id, lag)
+        except Exception as e:
+            reminder_health.record_failure(team.team_id)
+            # Disarm so the scheduler retries within its window
+            self._daily_armed.discard((team.team_id, payload[0]))
+            log.error(f"❌ [{team.name}] Daily reminder error: {e}", extra={'team_id': team.team_id})
+
+    def _build_daily_summary(self, team, today: str) -> tuple:
+        """Fetch today's events and render the summary: (today, content, embed, event_count)."""
         calendar = team.get_calendar()
-        tz = ZoneInfo(team.timezone) if team.timezone else None
-        today = datetime.now(tz).strftime('%Y-%m-%d')
         events = calendar.get_events(start_date=today, end_date=today)
         quote = random.choice(INSPIRATIONAL_QUOTES)
 
@@ -280,8 +566,174 @@ class Reminders(commands.Cog):
             mentions.append(f"<@&{team.coach_role_id}>")
         mention_text = " ".join(mentions)
 
-        await channel.send(content=mention_text, embed=embed)
-        print(f"✅ [{team.name}] Daily summary sent ({len(events) if events else 0} event(s))")
+        return today, mention_text, embed, len(events) if events else 0
+
+    async def _deliver_daily_summary(self, channel, team, payload) -> None:
+        today, content, embed, event_count = payload
+        await self.bot.dispatcher.send(channel, content=content, embed=embed, priority=PRIORITY_SUMMARY)
+        self.ledger.mark_daily_sent(team.team_id, today)
+        log.info(f"✅ [{team.name}] Daily summary sent ({event_count} event(s))",
+                 extra={'team_id': team.team_id})
+
+    async def _send_daily_summary(self, channel, team):
+        """Build and send today's summary immediately (catch-up and !forcedaily)."""
+        today = datetime.now(team.tzinfo).strftime('%Y-%m-%d')
+        await self._deliver_daily_summary(channel, team, self._build_daily_summary(team, today))
+
+    # ------------------------------------------------------------------
+    # Catch-up after downtime
+    # ------------------------------------------------------------------
+
+    @commands.Cog.listener()
+    async def on_disconnect(self):
+        if self._disconnected_at is None:
+            self._disconnected_at = datetime.now(timezone.utc)
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        await self._recover_after_reconnect()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Fires again after a full reconnect (the first on_ready loads this cog)
+        await self._recover_after_reconnect()
+
+    async def _recover_after_reconnect(self):
+        since, self._disconnected_at = self._disconnected_at, None
+        if since:
+            await self.recover_missed(since=since)
+
+    def _daily_summary_time(self, team, day) -> datetime:
+        """When the team's daily summary is scheduled on local date `day`."""
+        return datetime.combine(day, team.reminder_policy.daily_time, tzinfo=team.tzinfo)
+
+    async def recover_missed(self, since):
+        """
+        Replay reminders and daily summaries that fell due while the bot was offline.
+
+        Only reminders due after `since` (the last time the bot was known to be
+        running) are considered, so a first-ever start never replays history.
+        Missed reminders for events that haven't started and are at most
+        `Config.CATCHUP_LATE_MINUTES` overdue are sent late with the real lead
+        time; the rest, for events that started within
+        `Config.CATCHUP_NOTICE_HOURS`, are listed in one condensed notice.
+        """
+        if since is None or not Config.CATCHUP_ENABLED:
+            return
+        async with self._recovery_lock:
+            for team in self.bot.team_manager.get_all_teams():
+                if not team.reminder_channel_id:
+                    continue
+                channel = self.bot.get_channel(team.reminder_channel_id)
+                if not channel:
+                    continue
+                try:
+                    await self._recover_team(team, channel, since)
+                except Exception as e:
+                    log.error(f"❌ [{team.name}] Catch-up error: {e}", extra={'team_id': team.team_id})
+
+    async def _recover_team(self, team, channel, since):
+        now = datetime.now(timezone.utc)
+        try:
+            with deadline(Config.BACKGROUND_DEADLINE), request_priority(REQUEST_PRIORITY_REMINDER):
+                events = team.get_calendar().get_upcoming_events(days=self._fetch_days(team))
+        except Exception as e:
+            log.warning(f"⚠️ [{team.name}] Calendar error during catch-up, using cached events: {e}",
+                        extra={'team_id': team.team_id})
+            events = self.ledger.cached_events(team.team_id)
+
+        calendar = team.get_calendar()
+        # The planner still handles anything up to 5 minutes overdue
+        window_start = since - timedelta(minutes=5)
+        window_end = now - timedelta(minutes=5)
+        late_cutoff = now - timedelta(minutes=Config.CATCHUP_LATE_MINUTES)
+        notice_cutoff = now - timedelta(hours=Config.CATCHUP_NOTICE_HOURS)
+
+        # Keys of offsets too old to send late or list are dropped; the rest are
+        # recorded only once their late reminder or notice has been delivered
+        late, missed, dropped_keys = {}, [], []
+        for event in events:
+            start = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
+            missed_offsets = []
+            for hours in team.reminder_policy.offsets_for(calendar.get_event_type(event)):
+                key = self._reminder_key(team.team_id, event, hours)
+                fire_at = start - timedelta(hours=hours)
+                if window_start <= fire_at < window_end and key not in self.ledger:
+                    missed_offsets.append((fire_at, key))
+            if not missed_offsets:
+                continue
+            keys = [key for _, key in missed_offsets]
+
+            # Only the most recent missed offset matters; earlier ones are superseded
+            latest_fire_at = max(fire_at for fire_at, _ in missed_offsets)
+            if start > now and latest_fire_at >= late_cutoff:
+                lead_minutes = math.ceil((start - now).total_seconds() / 300) * 5
+                late.setdefault(lead_minutes, []).append((event, keys, latest_fire_at))
+            elif start >= notice_cutoff:
+                missed.append((event, keys))
+            else:
+                dropped_keys.extend(keys)
+
+        delivered_keys, sent_late, listed = list(dropped_keys), 0, 0
+        for lead_minutes, members in sorted(late.items()):
+            late_events = [event for event, _, _ in members]
+            if await self.send_reminder_digest(channel, team, late_events, lead_minutes / 60):
+                delivered_keys.extend(key for _, keys, _ in members for key in keys)
+                reminder_health.record_late(team.team_id, len(late_events))
+                # Late sends are the worst lags, so they count towards the SLO too
+                sent_at = datetime.now(timezone.utc)
+                for _, _, fire_at in members:
+                    reminder_health.record_sent(team.team_id, (sent_at - fire_at).total_seconds())
+                sent_late += len(late_events)
+        if missed and await self._send_missed_notice(channel, team, [event for event, _ in missed]):
+            delivered_keys.extend(key for _, keys in missed for key in keys)
+            reminder_health.record_skipped(team.team_id, len(missed))
+            listed = len(missed)
+        if delivered_keys:
+            self.ledger.mark_sent(delivered_keys)
+        if late or missed:
+            log.info(f"✅ [{team.name}] Catch-up: {sent_late} late reminder(s), "
+                     f"{listed} in missed notice", extra={'team_id': team.team_id})
+
+        # Daily summary that should have gone out while we were down
+        local_now = now.astimezone(team.tzinfo)
+        today = local_now.strftime('%Y-%m-%d')
+        summary_at = self._daily_summary_time(team, local_now.date())
+        armed_key = (team.team_id, today)
+        if (Config.CATCHUP_DAILY and since <= summary_at <= now and armed_key not in self._daily_armed
+                and self.ledger.daily_sent_on(team.team_id) != today):
+            # Armed while it sends, so daily_summary_scheduler can't send a second copy
+            self._daily_armed.add(armed_key)
+            try:
+                await self._send_daily_summary(channel, team)
+            except Exception:
+                self._daily_armed.discard(armed_key)
+                raise
+
+    async def _send_missed_notice(self, channel, team, events) -> bool:
+        """Post one condensed notice listing events whose reminders were missed; True once delivered."""
+        lines = []
+        for event in sorted(events, key=lambda e: e['start_dt']):
+            start = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
+            unix_timestamp = int(start.timestamp())
+            lines.append(f"• **{event.get('title', 'Event')}** — <t:{unix_timestamp}:t> (<t:{unix_timestamp}:R>)")
+
+        embed = discord.Embed(
+            title="⚠️ Missed Reminders",
+            description="The bot was offline when these reminders were due:\n\n" + "\n".join(lines),
+            color=discord.Color.orange(),
+            timestamp=datetime.now()
+        )
+        try:
+            await self.bot.dispatcher.send(
+                channel, content=self._mention_text(team), embed=embed, priority=PRIORITY_REMINDER
+            )
+            return True
+        except Exception as e:
+            reminder_health.record_failure(team.team_id)
+            log.error(f"❌ [{team.name}] Error sending missed-reminder notice: {e}",
+                      extra={'team_id': team.team_id})
+            return False
 
     # ------------------------------------------------------------------
     # Manual trigger commands
@@ -298,11 +750,9 @@ class Reminders(commands.Cog):
         if channel:
             try:
                 calendar = team.get_calendar()
-                events = calendar.get_upcoming_events(days=7)
-                for event in events:
-                    for hours in Config.REMINDER_TIMES:
-                        if self.should_send_reminder(team.team_id, event, hours):
-                            await self.send_reminder(channel, team, event, hours)
+                events = calendar.get_upcoming_events(days=self._fetch_days(team))
+                for hours, due_events in self.collect_due_reminders(team, events).items():
+                    await self.send_reminder_digest(channel, team, due_events, hours)
             except Exception as e:
                 await ctx.send(f"❌ Calendar error: {e}")
                 return
@@ -0,0 +1,269 @@
+"""
+Circuit breaker and stale-while-revalidate wrapper for calendar providers.
+
+When TeamUp or Google is failing, `ResilientCalendar` stops sending requests
+after a few consecutive failures (the circuit opens), waits with exponential
+backoff plus jitter, then lets a single probe through (half-open) to see if
+the provider has recovered.  While the circuit is open or a call fails, the
+last good result for the same query is served instead, marked as stale, so
+commands and reminders keep working from cached data rather than claiming
+there are no events.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from config import Config
+from deadlines import DeadlineExceeded
+from logging_setup import get_logger, log_context
+from metrics import CALENDAR_ERRORS, CALENDAR_REQUEST_SECONDS, CALENDAR_STALE_SERVED
+from rate_limiter import RateLimited
+from tracing import span
+
+log = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with jittered exponential backoff."""
+
+    def __init__(self, name: str,
+                 failure_threshold: int = Config.BREAKER_FAILURE_THRESHOLD,
+                 base_backoff: float = Config.BREAKER_BASE_BACKOFF,
+                 max_backoff: float = Config.BREAKER_MAX_BACKOFF):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() >= self._open_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            log.info(f"✅ [{self.name}] Calendar recovered — circuit closed")
+        self.state = CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            backoff = min(self.max_backoff, self.base_backoff * (2 ** self._trips))
+            # Full jitter on the upper half keeps instances from probing in lockstep
+            backoff = backoff / 2 + random.uniform(0, backoff / 2)
+            self._trips += 1
+            self.state = OPEN
+            self._open_until = time.monotonic() + backoff
+            log.warning(f"⚠️ [{self.name}] Calendar failing — circuit open for {backoff:.0f}s")
+
+    def release_probe(self) -> None:
+        """Let another probe through after one that never reached the provider."""
+        self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed)."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+
+class EventList(list):
+    """List of events that remembers whether it was served from a stale snapshot."""
+
+    def __init__(self, events=(), stale: bool = False, fetched_at: Optional[datetime] = None):
+        super().__init__(events)
+        self.stale = stale
+        self.fetched_at = fetched_at
+
+
+def is_stale(events) -> bool:
+    return bool(getattr(events, 'stale', False))
+
+
+def stale_notice(events) -> Optional[str]:
+    """Warning line for results served from a snapshot, or None if they are fresh."""
+    if not is_stale(events):
+        return None
+    fetched_at = int(events.fetched_at.timestamp())
+    return f"⚠️ Calendar unreachable — showing data from <t:{fetched_at}:R>"
+
+
+UNAVAILABLE_MESSAGE = "⚠️ The calendar is temporarily unavailable. Please try again in a few minutes."
+
+
+async def report_outage(interaction, error) -> bool:
+    """
+    Reply to an app command that failed because the calendar is down.
+
+    Meant to be called from a cog's `cog_app_command_error`.
+
+    Returns:
+        True if `error` was a calendar outage and the user was told
+    """
+    if not isinstance(getattr(error, 'original', error), CalendarUnavailableError):
+        return False
+    if interaction.response.is_done():
+        await interaction.followup.send(UNAVAILABLE_MESSAGE, ephemeral=True)
+    else:
+        await interaction.response.send_message(UNAVAILABLE_MESSAGE, ephemeral=True)
+    return True
+
+
+class ResilientCalendar(CalendarProvider):
+    """Wraps a provider with a circuit breaker and last-good-result fallback."""
+
+    def __init__(self, provider: CalendarProvider, name: str,
+                 team_id: str = '', calendar_type: str = ''):
+        self.provider = provider
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self._labels = {'team': team_id or name, 'provider': calendar_type or 'unknown'}
+        # When the provider last answered successfully (shown in /botinfo)
+        self.last_success: Optional[datetime] = None
+        # query key → (result, fetched_at)
+        self._snapshots: dict[tuple, tuple] = {}
+
+    def __getattr__(self, attr):
+        # Provider-specific helpers (e.g. TeamUpAPI.get_subcalendar_name)
+        return getattr(self.provider, attr)
+
+    def _serve_stale(self, key: tuple, error: Exception, reason: str):
+        CALENDAR_ERRORS.labels(reason=reason, **self._labels).inc()
+        snapshot = self._snapshots.get(key)
+        max_age = timedelta(hours=Config.STALE_MAX_AGE_HOURS)
+        if snapshot and datetime.now() - snapshot[1] <= max_age:
+            CALENDAR_STALE_SERVED.labels(**self._labels).inc()
+            return snapshot
+        raise CalendarUnavailableError(f"{self.name} unavailable: {error}") from error
+
+    def _call(self, key: tuple, fetch: Callable):
+        """Run `fetch` through the breaker, returning (result, fetched_at, stale)."""
+        with span(f"calendar.{key[0]}", **self._labels) as current:
+            result, fetched_at, stale = self._call_provider(key, fetch)
+            if current is not None:
+                current.set(stale=stale)
+            return result, fetched_at, stale
+
+    def _call_provider(self, key: tuple, fetch: Callable):
+        if not self.breaker.allow():
+            result, fetched_at = self._serve_stale(
+                key,
+                CalendarUnavailableError(f"circuit open, retry in {self.breaker.retry_in():.0f}s"),
+                'circuit_open',
+            )
+            return result, fetched_at, True
+        started = time.monotonic()
+        try:
+            # Provider log records carry the team they were made for
+            with log_context(team_id=self._labels['team']):
+                result = fetch()
+        except (DeadlineExceeded, RateLimited) as e:
+            # Out of budget or shed locally before a request was sent, which
+            # says nothing about the provider's health
+            self._observe(key, started)
+            self.breaker.release_probe()
+            reason = 'deadline' if isinstance(e, DeadlineExceeded) else 'rate_limited'
+            result, fetched_at = self._serve_stale(key, e, reason)
+            return result, fetched_at, True
+        except CalendarUnavailableError as e:
+            self._observe(key, started)
+            self.breaker.record_failure()
+            result, fetched_at = self._serve_stale(key, e, 'unavailable')
+            return result, fetched_at, True
+        except Exception:
+            # Unexpected errors still release a half-open probe
+            self._observe(key, started)
+            self.breaker.record_failure()
+            CALENDAR_ERRORS.labels(reason='error', **self._labels).inc()
+            raise
+        self._observe(key, started)
+        self.breaker.record_success()
+        now = datetime.now()
+        self.last_success = now
+        self._snapshots[key] = (result, now)
+        self._prune(now)
+        return result, now, False
+
+    def _observe(self, key: tuple, started: float) -> None:
+        CALENDAR_REQUEST_SECONDS.labels(method=key[0], **self._labels).observe(
+            time.monotonic() - started
+        )
+
+    def _prune(self, now: datetime) -> None:
+        cutoff = now - timedelta(hours=Config.STALE_MAX_AGE_HOURS)
+        for key in [k for k, (_, ts) in self._snapshots.items() if ts < cutoff]:
+            del self._snapshots[key]
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        events, fetched_at, stale = self._call(
+            ('events', start_date, end_date),
+            lambda: self.provider.get_events(start_date, end_date),
+        )
+        return EventList(events, stale=stale, fetched_at=fetched_at)
+
+    def get_upcoming_events(self, days=7) -> list:
+        # Keyed by calendar date so yesterday's window is never served as today's
+        events, fetched_at, stale = self._call(
+            ('upcoming', days, datetime.now().strftime('%Y-%m-%d')),
+            lambda: self.provider.get_upcoming_events(days),
+        )
+        return EventList(events, stale=stale, fetched_at=fetched_at)
+
+    def get_event(self, event_id) -> dict:
+        event, _, _ = self._call(('event', event_id), lambda: self.provider.get_event(event_id))
+        return event
+
+    def get_event_type(self, event) -> str:
+        return self.provider.get_event_type(event)
+
+    def append_availability_note(self, event_id, note: str) -> bool:
+        # Read-only providers never send anything, so the breaker stays out of it
+        if not self.provider.supports_writes:
+            return False
+        if not self.breaker.allow():
+            CALENDAR_ERRORS.labels(reason='circuit_open', **self._labels).inc()
+            return False
+        started = time.monotonic()
+        try:
+            with log_context(team_id=self._labels['team'], event_id=event_id):
+                ok = self.provider.append_availability_note(event_id, note)
+        except (DeadlineExceeded, RateLimited) as e:
+            self._observe(('append_note',), started)
+            self.breaker.release_probe()
+            reason = 'deadline' if isinstance(e, DeadlineExceeded) else 'rate_limited'
+            CALENDAR_ERRORS.labels(reason=reason, **self._labels).inc()
+            return False
+        except CalendarUnavailableError:
+            self._observe(('append_note',), started)
+            self.breaker.record_failure()
+            CALENDAR_ERRORS.labels(reason='unavailable', **self._labels).inc()
+            return False
+        self._observe(('append_note',), started)
+        if ok:
+            self.breaker.record_success()
+        else:
+            # The provider answered (e.g. the event is gone); that says
+            # nothing about its health either way
+            self.breaker.release_probe()
+        return ok
@@ -7,15 +7,18 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from roster_storage import RosterStorage
+from logging_setup import bind_interaction
+from tracing import start_interaction_trace
 from typing import Literal
 
 
 class RosterModal(discord.ui.Modal, title='Create Team Roster'):
     """Modal for creating/editing team rosters."""
 
-    def __init__(self, team_name: str, existing_roster=None):
+    def __init__(self, team_name: str, existing_roster=None, storage: RosterStorage = None):
         super().__init__()
         self.team_name = team_name
+        self.storage = storage or RosterStorage()
 
         default_value = "\n".join(existing_roster) if existing_roster else ""
 
@@ -38,8 +41,7 @@ class RosterModal(discord.ui.Modal, title='Create Team Roster'):
                 "❌ You must add at least one player!", ephemeral=True
             )
 
-        storage = RosterStorage()
-        storage.set_roster(self.team_name, players)
+        self.storage.set_roster(self.team_name, players)
 
         embed = discord.Embed(
             title=f"✅ Roster Saved for {self.team_name}",
@@ -61,6 +63,11 @@ class RosterCommands(commands.Cog):
         self.bot = bot
         self.storage = RosterStorage()
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        bind_interaction(interaction)
+        start_interaction_trace(interaction)
+        return True
+
     def _is_coach(self, interaction: discord.Interaction) -> bool:
         """Check if the user has the coach role for this guild."""
         team = self.bot.team_manager.get_team_for_guild(interaction.guild_id)
@@ -71,11 +78,22 @@ class RosterCommands(commands.Cog):
         coach_role = discord.utils.get(interaction.guild.roles, id=team.coach_role_id)
         return coach_role in interaction.user.roles if coach_role else False
 
+    async def team_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=name[:100], value=name)
+            for name in self.storage.search_teams(current)
+        ]
+
     @app_commands.command(name='roster', description='Manage team rosters (Coach only)')
     @app_commands.describe(
         action='Choose what to do with the roster',
         team='Name of the team'
     )
+    @app_commands.autocomplete(team=team_autocomplete)
     async def roster(
         self,
         interaction: discord.Interaction,
@@ -110,7 +128,7 @@ class RosterCommands(commands.Cog):
 
     async def _create_roster(self, interaction: discord.Interaction, team_name: str):
         existing_roster = self.storage.get_roster(team_name)
-        modal = RosterModal(team_name, existing_roster)
+        modal = RosterModal(team_name, existing_roster, self.storage)
         await interaction.response.send_modal(modal)
 
     async def _view_roster(self, interaction: discord.Interaction, team_name: str):
@@ -6,6 +6,9 @@ import json
 import os
 from typing import Optional, Dict, List
 
+from search_index import NameSearchIndex
+from tracing import span
+
 ROSTER_FILE = 'rosters.json'
 
 
@@ -21,6 +24,7 @@ class RosterStorage:
         """
         self.file_path = file_path
         self._ensure_file_exists()
+        self._name_index: Optional[NameSearchIndex] = None
 
     def _ensure_file_exists(self) -> None:
         """Create the roster file if it doesn't exist."""
@@ -36,7 +40,7 @@ class RosterStorage:
             Dictionary mapping team names to player lists
         """
         try:
-            with open(self.file_path, 'r') as f:
+            with span('roster.load'), open(self.file_path, 'r') as f:
                 return json.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
             return {}
@@ -48,9 +52,29 @@ class RosterStorage:
         Args:
             rosters: Dictionary mapping team names to player lists
         """
-        with open(self.file_path, 'w') as f:
+        with span('roster.save', teams=len(rosters)), open(self.file_path, 'w') as f:
             json.dump(rosters, f, indent=2)
 
+    @property
+    def name_index(self) -> NameSearchIndex:
+        """Index of roster names, built on first use and kept in sync by writes."""
+        if self._name_index is None:
+            self._name_index = NameSearchIndex(self._load_rosters().keys())
+        return self._name_index
+
+    def search_teams(self, query: str, limit: int = 25) -> List[str]:
+        """
+        Find roster names matching a partial or misspelled query.
+
+        Args:
+            query: Text typed so far
+            limit: Maximum number of names to return
+
+        Returns:
+            Matching team names, best matches first
+        """
+        return self.name_index.search(query, limit)
+
     def get_roster(self, team_name: str) -> Optional[List[str]]:
         """
         Get roster for a specific team.
@@ -87,6 +111,8 @@ class RosterStorage:
 
         rosters[team_key] = players
         self._save_rosters(rosters)
+        if self._name_index is not None:
+            self._name_index.add(team_key)
 
     def delete_roster(self, team_name: str) -> bool:
         """
@@ -105,6 +131,8 @@ class RosterStorage:
             if team.lower() == team_name.lower():
                 del rosters[team]
                 self._save_rosters(rosters)
+                if self._name_index is not None:
+                    self._name_index.remove(team)
                 return True
 
         return False
@@ -122,3 +150,4 @@ class RosterStorage:
     def clear_all_rosters(self) -> None:
         """Delete all rosters."""
         self._save_rosters({})
+        self._name_index = NameSearchIndex()
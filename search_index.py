@@ -0,0 +1,236 @@
+"""
+In-memory search indexes used by slash-command autocomplete handlers.
+
+Autocomplete callbacks run on every keystroke, so all parsing and label
+formatting happens once when an index is built.  Lookups then only touch
+precomputed tokens: a sorted token list searched with bisect for prefix
+matches, and a trigram index for typo-tolerant fallback.
+"""
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Callable, Optional
+
+# Discord caps autocomplete results at 25 choices of up to 100 characters
+MAX_CHOICES = 25
+MAX_LABEL_LENGTH = 100
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Minimum share of the query's trigrams an entry must contain to be offered
+# as a fuzzy match
+_FUZZY_THRESHOLD = 0.4
+
+
+def _tokenize(text: str) -> list:
+    """Lowercase `text` and split it into alphanumeric words."""
+    return _WORD_RE.findall(text.lower())
+
+
+def _trigrams(text: str) -> set:
+    """Return the set of character trigrams for `text` (padded, per word)."""
+    grams = set()
+    for word in _tokenize(text):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def _prefix_range(keys: list, prefix: str) -> tuple:
+    """Return the (lo, hi) slice of sorted `keys` that start with `prefix`."""
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix + '\uffff')
+    return lo, hi
+
+
+class _EventEntry:
+    __slots__ = ('event_id', 'label', 'start', 'text', 'trigrams')
+
+    def __init__(self, event_id: str, label: str, start: datetime, text: str):
+        self.event_id = event_id
+        self.label = label
+        self.start = start
+        self.text = text
+        self.trigrams = _trigrams(text)
+
+
+class EventSearchIndex:
+    """
+    Precomputed autocomplete index over a list of calendar events.
+
+    Built once per event-cache refresh.  Each event gets a ready-made display
+    label and is indexed by title, opponent, event type and start date
+    (month, day, weekday and ISO date), so searches like "ssg", "fri" or
+    "mar 14" match without reparsing anything.
+    """
+
+    def __init__(self, events: list, type_of: Optional[Callable[[dict], str]] = None):
+        self._entries: list[_EventEntry] = []
+        token_pairs = []
+        trigram_map: dict[str, list[int]] = {}
+
+        for event in events:
+            start = datetime.fromisoformat(event['start_dt'].replace('Z', '+00:00'))
+            title = event.get('title', 'Unknown')
+            label = f"{title} - {start.strftime('%b %d, %I:%M %p')}"[:MAX_LABEL_LENGTH]
+            event_type = type_of(event) if type_of else None
+
+            searchable = ' '.join(filter(None, [
+                title,
+                event.get('who', ''),
+                event_type or '',
+                start.strftime('%b %B %a %A'),
+                str(start.day),
+                start.strftime('%Y-%m-%d'),
+            ]))
+            entry = _EventEntry(event['id'], label, start, ' '.join(_tokenize(searchable)))
+            idx = len(self._entries)
+            self._entries.append(entry)
+
+            for token in set(entry.text.split()):
+                token_pairs.append((token, idx))
+            for gram in entry.trigrams:
+                trigram_map.setdefault(gram, []).append(idx)
+
+        token_pairs.sort()
+        self._tokens = [t for t, _ in token_pairs]
+        self._token_owners = [i for _, i in token_pairs]
+        self._trigram_map = trigram_map
+        self._chronological = sorted(range(len(self._entries)),
+                                     key=lambda i: self._entries[i].start)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list:
+        """
+        Return up to `limit` (label, event_id) pairs ranked by relevance.
+
+        An empty query lists events in chronological order.  Otherwise every
+        query word must prefix-match some indexed word; if nothing matches
+        that way, results fall back to trigram similarity so small typos
+        still find the event.
+        """
+        words = _tokenize(query)
+        if not words:
+            ranked = self._chronological
+        else:
+            ranked = self._prefix_matches(words) or self._fuzzy_matches(query)
+        return [(self._entries[i].label, self._entries[i].event_id) for i in ranked[:limit]]
+
+    def _prefix_matches(self, words: list) -> list:
+        scores: Optional[dict[int, int]] = None
+        for word in words:
+            lo, hi = _prefix_range(self._tokens, word)
+            word_scores: dict[int, int] = {}
+            for pos in range(lo, hi):
+                idx = self._token_owners[pos]
+                # Whole-word hits outrank partial prefixes
+                score = 3 if self._tokens[pos] == word else 2
+                if score > word_scores.get(idx, 0):
+                    word_scores[idx] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {i: s + word_scores[i] for i, s in scores.items() if i in word_scores}
+            if not scores:
+                return []
+
+        phrase = ' '.join(words)
+        for idx in scores:
+            if self._entries[idx].text.startswith(phrase):
+                scores[idx] += 5
+        return sorted(scores, key=lambda i: (-scores[i], self._entries[i].start))
+
+    def _fuzzy_matches(self, query: str) -> list:
+        grams = _trigrams(query)
+        if not grams:
+            return []
+        overlap: dict[int, int] = {}
+        for gram in grams:
+            for idx in self._trigram_map.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+
+        needed = len(grams) * _FUZZY_THRESHOLD
+        matches = [i for i, shared in overlap.items() if shared >= needed]
+        return sorted(matches, key=lambda i: (-overlap[i], self._entries[i].start))
+
+
+class NameSearchIndex:
+    """
+    Incrementally maintained autocomplete index over a set of names.
+
+    Names are kept as a sorted list of lowercase keys so prefix lookups are a
+    bisect, plus a trigram map for fuzzy fallback.  `add` and `remove` update
+    both in place, so callers never rebuild the index after a single change.
+    """
+
+    def __init__(self, names=()):
+        self._keys: list[str] = []
+        self._names: dict[str, str] = {}
+        self._grams: dict[str, set] = {}
+        self._trigram_map: dict[str, set] = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._names
+
+    def get(self, name: str) -> Optional[str]:
+        """Return the stored spelling of `name` (case-insensitive), or None."""
+        return self._names.get(name.lower())
+
+    def add(self, name: str) -> None:
+        key = name.lower()
+        if key in self._names:
+            self._names[key] = name
+            return
+        insort(self._keys, key)
+        self._names[key] = name
+        grams = _trigrams(name)
+        self._grams[key] = grams
+        for gram in grams:
+            self._trigram_map.setdefault(gram, set()).add(key)
+
+    def remove(self, name: str) -> None:
+        key = name.lower()
+        if key not in self._names:
+            return
+        del self._keys[bisect_left(self._keys, key)]
+        del self._names[key]
+        for gram in self._grams.pop(key):
+            owners = self._trigram_map[gram]
+            owners.discard(key)
+            if not owners:
+                del self._trigram_map[gram]
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list:
+        """
+        Return up to `limit` stored names matching `query`.
+
+        Names starting with the query come first (alphabetically), followed
+        by trigram matches ranked by how much of the query they contain.
+        """
+        query = query.strip().lower()
+        if not query:
+            return [self._names[k] for k in self._keys[:limit]]
+
+        lo, hi = _prefix_range(self._keys, query)
+        results = self._keys[lo:min(hi, lo + limit)]
+        if len(results) < limit:
+            seen = set(results)
+            grams = _trigrams(query)
+            overlap: dict[str, int] = {}
+            for gram in grams:
+                for key in self._trigram_map.get(gram, ()):
+                    if key not in seen:
+                        overlap[key] = overlap.get(key, 0) + 1
+            needed = len(grams) * _FUZZY_THRESHOLD
+            fuzzy = sorted((k for k, shared in overlap.items() if shared >= needed),
+                           key=lambda k: (-overlap[k], k))
+            results.extend(fuzzy[:limit - len(results)])
+        return [self._names[k] for k in results]
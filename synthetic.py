@@ -0,0 +1,257 @@
+"""
+Synthetic teams, events, rosters and calendar backends for offline testing.
+
+Everything here is driven by a `random.Random`, so a given seed always
+produces the same calendars.  The shapes are based on what the real
+providers return:
+
+- titles mix the "SSG Scrim vs TeamX" style that Google/ICS title parsing
+  expects with free-form ones ("Team meeting", emoji, long names)
+- notes range from empty to close to Discord's 1024-character field limit
+- start times fall on the half hour in each team's own timezone
+
+`SyntheticCalendar` is a `CalendarProvider` that serves a generated event
+list with configurable latency, jitter and error rate.  Its requests go
+through the same rate-limit, deadline and retry path as `TeamUpAPI`, so
+it can stand in for a real backend wherever a team's calendar is used.
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from deadlines import call_with_retries, record_timeout, request_timeout
+
+TEAM_NAMES = [
+    'SSG', 'Legit', 'Nova', 'Crimson Tide', 'Phoenix Rising', 'Team Vibranium',
+    'Shadow Pact', 'Frostbite', 'Apex Legends Academy', 'Void Walkers', 'Iron Wolves',
+    'Blue Comets', 'Night Owls', 'Starforge', 'Team Liquid Gold', 'Astral',
+]
+
+OPPONENTS = [
+    'TeamX', 'Sentinels', 'Cloud Nine', 'Ghost Gaming', 'Rogue Squad', 'Knights',
+    'NRG Academy', 'Team Envy', 'Eclipse', 'Paper Rex', 'Oxygen', 'Wildcard',
+]
+
+TIMEZONES = [
+    None, 'America/New_York', 'America/Los_Angeles', 'America/Chicago',
+    'Europe/London', 'Europe/Berlin', 'Asia/Tokyo', 'Australia/Sydney',
+]
+
+# Subcalendar id → name, as TeamUp reports event types
+SUBCALENDARS = {'1': 'Scrim', '2': 'Official', '3': 'Warmup', '4': 'VOD', '5': 'Meeting'}
+
+_PLAYER_SYLLABLES = ['zen', 'kai', 'rix', 'nova', 'vex', 'lu', 'mo', 'tor', 'ash', 'fly', 'byte', 'q']
+
+_NOTE_LINES = [
+    'Bring your A-game, comms check 15 minutes before.',
+    'Lobby code will be posted in #scrims.',
+    'Focus on dive comps and ult tracking.',
+    'Map pool: Tokyo 2099, Yggsgard, Klyntar.',
+    'Review last week\'s VOD before joining.',
+    'Subs on standby: please confirm availability.',
+]
+
+
+def make_title(rng: random.Random, team: str) -> tuple:
+    """Return (title, subcalendar id) in one of the title shapes seen in real calendars."""
+    opponent = rng.choice(OPPONENTS)
+    shape = rng.randrange(8)
+    if shape == 0:
+        return f"{team} Scrim", '1'
+    if shape == 1:
+        return f"{team} Scrim vs {opponent}", '1'
+    if shape == 2:
+        return f"{team} Official vs {opponent}", '2'
+    if shape == 3:
+        return f"{team} vs. {opponent} — Season {rng.randint(1, 4)} Week {rng.randint(1, 12)}", '2'
+    if shape == 4:
+        return f"{team} warm up", '3'
+    if shape == 5:
+        return f"VOD review: {team} vs {opponent}", '4'
+    if shape == 6:
+        return f"🔥 {team} scrim block ({rng.choice(['EU', 'NA', 'APAC'])}) vs {opponent} 🔥", '1'
+    return rng.choice(['Team meeting', 'Strategy session', 'Coaching 1:1', team]), '5'
+
+
+def make_notes(rng: random.Random, max_length: int = 1000) -> str:
+    """Event notes from empty up to roughly `max_length` characters."""
+    length = rng.choice([0, 0, 40, 200, max_length])
+    notes = ''
+    while len(notes) < length:
+        notes += rng.choice(_NOTE_LINES) + '\n'
+    return notes[:length]
+
+
+def make_roster(rng: random.Random, size: int = None) -> list:
+    """Player names for one roster (6–12 players by default)."""
+    size = rng.randint(6, 12) if size is None else size
+    return [
+        ''.join(rng.choice(_PLAYER_SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+        + (str(rng.randint(1, 99)) if rng.random() < 0.4 else '')
+        for _ in range(size)
+    ]
+
+
+def make_event(rng: random.Random, event_id: str, team: str, start: datetime,
+               tz_name: Optional[str] = None, duration_minutes: int = None) -> dict:
+    """One event in the shared provider format, with `start` shown in the team's timezone."""
+    title, subcalendar_id = make_title(rng, team)
+    tz = ZoneInfo(tz_name) if tz_name else timezone.utc
+    end = start + timedelta(minutes=duration_minutes or rng.choice([60, 90, 120, 180]))
+    event = {
+        'id': event_id,
+        'title': title,
+        'start_dt': start.astimezone(tz).isoformat(),
+        'end_dt': end.astimezone(tz).isoformat(),
+        'notes': make_notes(rng),
+        'location': rng.choice(['', '', 'Discord Stage', 'Custom lobby', 'LAN — Room 3']),
+        'who': rng.choice(['', rng.choice(OPPONENTS)]),
+        'subcalendar_ids': [subcalendar_id],
+    }
+    if rng.random() < 0.5:
+        # Providers that parse titles (Google, ICS) add the cleaned team name
+        event['team_name'] = team
+    return event
+
+
+def make_google_event(rng: random.Random, event_id: str, team: str, start: datetime,
+                      tz_name: Optional[str] = None) -> dict:
+    """One raw Google Calendar API event (before `_normalize`); about 1 in 10 is all-day."""
+    title, _ = make_title(rng, team)
+    tz = ZoneInfo(tz_name) if tz_name else timezone.utc
+    if rng.random() < 0.1:
+        day = start.astimezone(tz).date()
+        when = {'start': {'date': day.isoformat()}, 'end': {'date': (day + timedelta(days=1)).isoformat()}}
+    else:
+        end = start + timedelta(minutes=rng.choice([60, 90, 120]))
+        when = {
+            'start': {'dateTime': start.astimezone(tz).isoformat(), 'timeZone': tz_name or 'UTC'},
+            'end': {'dateTime': end.astimezone(tz).isoformat(), 'timeZone': tz_name or 'UTC'},
+        }
+    event = {
+        'kind': 'calendar#event',
+        'id': event_id,
+        'status': 'confirmed',
+        'summary': title,
+        'description': make_notes(rng),
+        'updated': start.isoformat(),
+        **when,
+    }
+    if rng.random() < 0.3:
+        event['location'] = rng.choice(['Discord Stage', 'Custom lobby', 'LAN — Room 3'])
+    return event
+
+
+def make_events(rng: random.Random, count: int, team: str, tz_name: Optional[str] = None,
+                start: datetime = None, days: int = 14, id_prefix: str = 'evt') -> list:
+    """
+    `count` events spread over `days` days from `start`, sorted by start time.
+
+    Start times are rounded to the half hour, like scheduled practice blocks.
+    """
+    start = start or datetime.now(timezone.utc)
+    events = []
+    for i in range(count):
+        when = start + timedelta(minutes=rng.randrange(days * 24 * 60))
+        when = when.replace(minute=0 if when.minute < 30 else 30, second=0, microsecond=0)
+        events.append(make_event(rng, f"{id_prefix}{i}", team, when, tz_name))
+    events.sort(key=lambda e: e['start_dt'])
+    return events
+
+
+class SyntheticCalendar(CalendarProvider):
+    """
+    Calendar backend that serves a fixed event list with simulated network behaviour.
+
+    Args:
+        events: Events in the shared provider format (see `make_events`)
+        latency: Mean seconds per request
+        jitter: Spread of the latency as a fraction of `latency` (0.5 → ±50%)
+        error_rate: Share of requests that fail with a retryable error
+        rng: Random source for latency and errors
+        acquire: Called before every request to take a rate-limit token, as
+            the real providers do
+    """
+
+    def __init__(self, events: list, latency: float = 0.05, jitter: float = 0.5,
+                 error_rate: float = 0.0, rng: random.Random = None,
+                 acquire: Optional[Callable[[], None]] = None):
+        self.events = events
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = rng or random.Random()
+        self._acquire = acquire
+        self.subcalendars = dict(SUBCALENDARS)
+        self._by_id = {e['id']: e for e in events}
+        # Stats
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.notes_appended = 0
+
+    def _request(self, handler: Callable, retry: bool = True):
+        """Simulate one HTTP request with the same deadline and retry handling as TeamUpAPI."""
+        def attempt():
+            if self._acquire:
+                self._acquire()
+            _, timeout = request_timeout('synthetic')
+            self.requests += 1
+            delay = max(0.0, self.latency * (1 + self.jitter * (2 * self._rng.random() - 1)))
+            if delay > timeout:
+                time.sleep(timeout)
+                self.timeouts += 1
+                record_timeout('synthetic')
+                raise TimeoutError(f"synthetic: timed out after {timeout:.2f}s")
+            time.sleep(delay)
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                raise ConnectionError("synthetic: injected 503 Service Unavailable")
+            return handler()
+
+        try:
+            return call_with_retries(
+                'synthetic', attempt,
+                lambda e: retry and isinstance(e, (ConnectionError, TimeoutError)),
+            )
+        except (ConnectionError, TimeoutError) as e:
+            raise CalendarUnavailableError(f"Synthetic: {e}") from e
+
+    def get_events(self, start_date=None, end_date=None) -> list:
+        start_date = start_date or datetime.now().strftime('%Y-%m-%d')
+        end_date = end_date or (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+        # Copies, as a real provider decodes fresh dicts from every response
+        return self._request(lambda: [
+            dict(e) for e in self.events if start_date <= e['start_dt'][:10] <= end_date
+        ])
+
+    def get_event(self, event_id) -> dict:
+        return self._request(lambda: dict(self._by_id[event_id]) if event_id in self._by_id else None)
+
+    def get_upcoming_events(self, days=7) -> list:
+        start = datetime.now().strftime('%Y-%m-%d')
+        end = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+        return self.get_events(start, end)
+
+    def get_event_type(self, event) -> str:
+        subcal_ids = event.get('subcalendar_ids') or [None]
+        return self.subcalendars.get(str(subcal_ids[0]), "Unknown")
+
+    def append_availability_note(self, event_id, note: str) -> bool:
+        event = self._by_id.get(event_id)
+        if event is None:
+            return False
+
+        def patch():
+            event['notes'] = ((event.get('notes') or '').rstrip() + '\n' + note).lstrip()
+            self.notes_appended += 1
+            return True
+
+        try:
+            # Not retried, like TeamUpAPI's PATCH
+            return self._request(patch, retry=False)
+        except CalendarUnavailableError:
+            return False
@@ -7,9 +7,20 @@ and are referenced by env-var name inside the JSON.
 """
 import json
 import os
+from functools import partial
+from urllib.parse import urlparse
+from datetime import timezone, tzinfo
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from calendar_provider import CalendarProvider
+from config import Config
+from reminder_policy import ReminderPolicy
+from rate_limiter import CredentialLimiter, RateLimitRegistry
+from resilience import ResilientCalendar
+from logging_setup import get_logger
+
+log = get_logger(__name__)
 
 
 class TeamConfig:
@@ -17,7 +28,7 @@ class TeamConfig:
         self.team_id:           str = data['team_id']
         self.name:              str = data['name']
         self.guild_id:          int = int(data['guild_id'])
-        self.calendar_type:     str = data['calendar_type']   # "teamup" | "google"
+        self.calendar_type:     str = data['calendar_type']   # "teamup" | "google" | "ics"
         self.reminder_channel_id:  Optional[int] = int(data['reminder_channel_id']) if data.get('reminder_channel_id') else None
         self.player_role_id:    int = int(data['player_role_id']) if data.get('player_role_id') else 0
         self.coach_role_id:     int = int(data['coach_role_id']) if data.get('coach_role_id') else 0
@@ -40,30 +51,102 @@ class TeamConfig:
             else data.get('google_credentials_file')
         )
 
+        # ICS-specific: feed URL (http/https/webcal) or local .ics path
+        self.ics_url: Optional[str] = (
+            os.getenv(data['ics_url_env']) if data.get('ics_url_env') else data.get('ics_url')
+        )
+
+        # Env-var name of the credential, used to identify shared credentials
+        self._credential_env: Optional[str] = data.get({
+            'google': 'google_credentials_file_env',
+            'ics': 'ics_url_env',
+        }.get(self.calendar_type, 'teamup_api_key_env'))
+
         self.timezone: Optional[str] = data.get('timezone')  # e.g. "America/New_York"
+        try:
+            # Teams without a timezone run on UTC
+            self.tzinfo: tzinfo = ZoneInfo(self.timezone) if self.timezone else timezone.utc
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{self.timezone}' for team {self.team_id}") from None
+
+        # Reminder offsets, check interval and templates (validated here)
+        self.reminder_policy = ReminderPolicy(data.get('reminders'), self.team_id)
 
         self._calendar: Optional[CalendarProvider] = None
+        # Shared with every team on the same credential; assigned by TeamManager
+        self.limiter: Optional[CredentialLimiter] = None
+
+    @property
+    def credential_label(self) -> str:
+        """Name of the API credential this team uses, as keyed in `rate_limits`."""
+        if self.calendar_type == 'google':
+            return self._credential_env or self.google_credentials_file or f"google:{self.team_id}"
+        if self.calendar_type == 'ics':
+            # Feed URLs often embed a secret token, so only the host is used
+            return self._credential_env or f"ics:{urlparse(self.ics_url or '').netloc or 'file'}"
+        return self._credential_env or f"teamup:{self.teamup_calendar_id}"
 
     def get_calendar(self) -> CalendarProvider:
         """Return the calendar provider for this team (lazily initialized)."""
         if self._calendar is None:
-            if self.calendar_type == 'teamup':
-                from teamup_api import TeamUpAPI
-                self._calendar = TeamUpAPI(self.teamup_calendar_id, self.teamup_api_key)
-            elif self.calendar_type == 'google':
-                from google_calendar_api import GoogleCalendarAPI
-                self._calendar = GoogleCalendarAPI(
-                    self.google_calendar_id, self.google_credentials_file, self.timezone
-                )
+            replay = None
+            if Config.CASSETTE_REPLAY_DIR:
+                from cassettes import newest_cassette
+                replay = newest_cassette(Config.CASSETTE_REPLAY_DIR, self.team_id)
+                if replay is None:
+                    log.warning(f"⚠️ No cassette for {self.team_id} in {Config.CASSETTE_REPLAY_DIR}; "
+                                f"using the live calendar")
+            if replay:
+                from cassettes import ReplayCalendar
+                provider = ReplayCalendar(replay, speed=Config.CASSETTE_REPLAY_SPEED or None)
+                log.info(f"📼 Serving {self.team_id} from cassette {replay}")
             else:
-                raise ValueError(f"Unknown calendar_type '{self.calendar_type}' for team {self.team_id}")
+                provider = self._create_provider()
+                if Config.CASSETTE_RECORD_DIR:
+                    from cassettes import RecordingCalendar, cassette_path
+                    provider = RecordingCalendar(
+                        provider, cassette_path(Config.CASSETTE_RECORD_DIR, self.team_id),
+                        secrets=[self.teamup_api_key, self.teamup_calendar_id, self.google_calendar_id,
+                                 self.google_credentials_file, self.ics_url],
+                        team_id=self.team_id, calendar_type=self.calendar_type,
+                    )
+            # Circuit breaker + last-good-result fallback during provider outages
+            self._calendar = ResilientCalendar(
+                provider, f"{self.name}/{self.calendar_type}", self.team_id, self.calendar_type
+            )
         return self._calendar
 
+    def _create_provider(self) -> CalendarProvider:
+        acquire = partial(self.limiter.acquire, self.team_id) if self.limiter else None
+        if self.calendar_type == 'teamup':
+            from teamup_api import TeamUpAPI
+            return TeamUpAPI(self.teamup_calendar_id, self.teamup_api_key, acquire=acquire)
+        if self.calendar_type == 'google':
+            from google_calendar_api import GoogleCalendarAPI
+            return GoogleCalendarAPI(
+                self.google_calendar_id, self.google_credentials_file, self.timezone,
+                acquire=acquire,
+            )
+        if self.calendar_type == 'ics':
+            from ics_calendar import ICSCalendar
+            return ICSCalendar(self.ics_url, self.timezone, acquire=acquire)
+        raise ValueError(f"Unknown calendar_type '{self.calendar_type}' for team {self.team_id}")
+
+    def calendar_health(self) -> Optional[dict]:
+        """Last successful calendar call and circuit state, once the calendar has been used."""
+        if self._calendar is None:
+            return None
+        return {'last_success': self._calendar.last_success, 'circuit': self._calendar.breaker.state}
+
     def is_configured(self) -> bool:
         if self.calendar_type == 'teamup':
             return bool(self.teamup_calendar_id and self.teamup_api_key)
         if self.calendar_type == 'google':
-            return bool(self.google_calendar_id and self.google_credentials_file)
+            # A stand-in API (GOOGLE_API_BASE_URL) needs no credentials file
+            return bool(self.google_calendar_id
+                        and (self.google_credentials_file or Config.GOOGLE_API_BASE_URL))
+        if self.calendar_type == 'ics':
+            return bool(self.ics_url)
         return False
 
 
@@ -74,19 +157,23 @@ class TeamManager:
         self._teams:     list[TeamConfig]     = []
         self._guild_map: dict[int, TeamConfig] = {}
         self._config_path = config_path
+        self.rate_limits = RateLimitRegistry()
         self._load()
 
     def _load(self):
         if not os.path.exists(self._config_path):
-            print(f"⚠️  {self._config_path} not found — no teams configured.")
+            log.warning(f"⚠️  {self._config_path} not found — no teams configured.")
             return
         with open(self._config_path) as f:
             data = json.load(f)
+        # Per-credential request limits (validated here, like reminder policies)
+        self.rate_limits = RateLimitRegistry(data.get('rate_limits'))
         for entry in data.get('teams', []):
             team = TeamConfig(entry)
+            team.limiter = self.rate_limits.limiter_for(team)
             self._teams.append(team)
             self._guild_map[team.guild_id] = team
-        print(f"✅ Loaded {len(self._teams)} team(s) from {self._config_path}")
+        log.info(f"✅ Loaded {len(self._teams)} team(s) from {self._config_path}")
 
     def get_team_for_guild(self, guild_id: int) -> Optional[TeamConfig]:
         return self._guild_map.get(guild_id)
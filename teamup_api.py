@@ -1,22 +1,65 @@
 import requests
 from datetime import datetime, timedelta
 import os
+import time
+from typing import Callable, Optional
 
-from calendar_provider import CalendarProvider
+from calendar_provider import CalendarProvider, CalendarUnavailableError
+from config import Config
+from deadlines import call_with_retries, record_timeout, request_timeout
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+# Seconds between attempts to load the subcalendar names after a failed fetch
+_SUBCALENDAR_RETRY_SECONDS = 60
+
+
+def _retryable(error: Exception) -> bool:
+    """Connection problems, timeouts, 429 and 5xx are worth another attempt."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
 
 
 class TeamUpAPI(CalendarProvider):
     """Handles all TeamUp Calendar API interactions."""
 
-    def __init__(self, calendar_id=None, api_key=None):
+    supports_writes = True
+
+    def __init__(self, calendar_id=None, api_key=None, acquire: Optional[Callable[[], None]] = None,
+                 base_url: str = None):
+        # Called before every request to take a token from the credential's rate limiter
+        self._acquire = acquire
         self.calendar_id = calendar_id or os.getenv('TEAMUP_CALENDAR_ID')
         self.api_key = api_key or os.getenv('TEAMUP_API_KEY')
-        self.base_url = f"https://api.teamup.com/{self.calendar_id}"
+        self.base_url = f"{(base_url or Config.TEAMUP_API_BASE_URL).rstrip('/')}/{self.calendar_id}"
         self.headers = {
             'Teamup-Token': self.api_key
         }
+        self._subcalendars_tried_at = 0.0
         self.subcalendars = self._fetch_subcalendars()
 
+    def _request(self, method: str, url: str, retry: bool = True, **kwargs):
+        """Send one request with a deadline-bounded timeout, retrying transient errors."""
+        def attempt():
+            if self._acquire:
+                self._acquire()
+            try:
+                response = requests.request(
+                    method, url, headers=self.headers, timeout=request_timeout('teamup'), **kwargs
+                )
+            except requests.exceptions.Timeout:
+                record_timeout('teamup')
+                raise
+            # A missing event is an answer, not a failure
+            if not (method == 'GET' and response.status_code == 404):
+                response.raise_for_status()
+            return response
+
+        return call_with_retries('teamup', attempt, _retryable if retry else (lambda e: False))
+
     def get_events(self, start_date=None, end_date=None) -> list:
         """Fetch events from TeamUp calendar."""
         if not start_date:
@@ -31,23 +74,23 @@ class TeamUpAPI(CalendarProvider):
         }
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+            response = self._request('GET', url, params=params)
             return response.json().get('events', [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching events: {e}")
-            return []
+            log.error(f"Error fetching events: {e}")
+            raise CalendarUnavailableError(f"TeamUp: {e}") from e
 
     def get_event(self, event_id) -> dict:
         """Get a specific event by ID."""
         url = f"{self.base_url}/events/{event_id}"
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            response = self._request('GET', url)
+            if response.status_code == 404:
+                return None
             return response.json().get('event', {})
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching event {event_id}: {e}")
-            return None
+            log.error(f"Error fetching event {event_id}: {e}", extra={'event_id': event_id})
+            raise CalendarUnavailableError(f"TeamUp: {e}") from e
 
     def get_upcoming_events(self, days=7) -> list:
         """Get events for the next N days."""
@@ -61,21 +104,25 @@ class TeamUpAPI(CalendarProvider):
         return self.get_subcalendar_name(subcal_ids) if subcal_ids else None
 
     def _fetch_subcalendars(self):
-        """Fetch subcalendar information."""
+        """Fetch subcalendar information ({} if the request fails)."""
+        self._subcalendars_tried_at = time.monotonic()
         url = f"{self.base_url}/subcalendars"
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            response = self._request('GET', url)
             subcals = response.json().get('subcalendars', [])
             return {str(sub['id']): sub['name'] for sub in subcals}
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching subcalendars: {e}")
+        except (requests.exceptions.RequestException, CalendarUnavailableError) as e:
+            log.error(f"Error fetching subcalendars: {e}")
             return {}
 
     def get_subcalendar_name(self, subcalendar_id):
         """Get the name of a subcalendar by ID."""
         if isinstance(subcalendar_id, list) and len(subcalendar_id) > 0:
             subcalendar_id = subcalendar_id[0]
+        # A fetch shed or failed at startup isn't cached for good; retry lazily
+        if (not self.subcalendars
+                and time.monotonic() - self._subcalendars_tried_at >= _SUBCALENDAR_RETRY_SECONDS):
+            self.subcalendars = self._fetch_subcalendars()
         return self.subcalendars.get(str(subcalendar_id), "Unknown")
 
     def append_availability_note(self, event_id, note: str) -> bool:
@@ -87,9 +134,16 @@ class TeamUpAPI(CalendarProvider):
         updated_notes = (current_notes.rstrip() + '\n' + note).lstrip()
         url = f"{self.base_url}/events/{event_id}"
         try:
-            response = requests.patch(url, headers=self.headers, json={'notes': updated_notes})
-            response.raise_for_status()
+            # Not retried: a PATCH that timed out may still have been applied
+            self._request('PATCH', url, retry=False, json={'notes': updated_notes})
             return True
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in (403, 404):
+                # Read-only key, or the event was deleted since it was fetched
+                log.warning(f"⚠️ Can't update TeamUp event {event_id}: {e}", extra={'event_id': event_id})
+                return False
+            log.error(f"Error updating TeamUp event {event_id}: {e}", extra={'event_id': event_id})
+            raise CalendarUnavailableError(f"TeamUp: {e}") from e
         except requests.exceptions.RequestException as e:
-            print(f"Error updating TeamUp event {event_id}: {e}")
-            return False
+            log.error(f"Error updating TeamUp event {event_id}: {e}", extra={'event_id': event_id})
+            raise CalendarUnavailableError(f"TeamUp: {e}") from e
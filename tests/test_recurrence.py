@@ -0,0 +1,121 @@
+"""
+Expansions of `recurrence.RecurrenceRule` checked against known results.
+
+The expected dates were produced with dateutil's rrule for the same rule
+and DTSTART, so they follow RFC 5545 rather than this module's reading of it.
+"""
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from recurrence import RecurrenceRule, RecurringSeries, parse_recurrence_lines
+
+TZ = ZoneInfo('Europe/Berlin')
+
+# Friday 19:00, on the last day of a 31-day month
+DTSTART = datetime(2025, 1, 31, 19, 0, tzinfo=TZ)
+
+
+def expand(rule: str, dtstart: datetime = DTSTART, days: int = 3000) -> list:
+    """Every occurrence date (YYYY-MM-DD) of `rule` within `days` of dtstart."""
+    occurrences = RecurrenceRule.parse(rule, TZ).occurrences(
+        dtstart, dtstart - timedelta(seconds=1), dtstart + timedelta(days=days)
+    )
+    return [o.strftime('%Y-%m-%d') for o in occurrences]
+
+
+class RecurrenceRuleTest(unittest.TestCase):
+
+    def test_daily(self):
+        self.assertEqual(expand('FREQ=DAILY;INTERVAL=3;COUNT=5'),
+                         ['2025-01-31', '2025-02-03', '2025-02-06', '2025-02-09', '2025-02-12'])
+
+    def test_daily_byday(self):
+        self.assertEqual(expand('FREQ=DAILY;BYDAY=MO,WE,FR;COUNT=6'),
+                         ['2025-01-31', '2025-02-03', '2025-02-05', '2025-02-07', '2025-02-10', '2025-02-12'])
+
+    def test_weekly_byday(self):
+        self.assertEqual(expand('FREQ=WEEKLY;BYDAY=TU,TH;COUNT=6'),
+                         ['2025-02-04', '2025-02-06', '2025-02-11', '2025-02-13', '2025-02-18', '2025-02-20'])
+
+    def test_weekly_interval_depends_on_wkst(self):
+        self.assertEqual(expand('FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,SU;COUNT=6'),
+                         ['2025-02-02', '2025-02-10', '2025-02-16', '2025-02-24', '2025-03-02', '2025-03-10'])
+        self.assertEqual(expand('FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,SU;WKST=SU;COUNT=6'),
+                         ['2025-02-09', '2025-02-10', '2025-02-23', '2025-02-24', '2025-03-09', '2025-03-10'])
+
+    def test_weekly_until_is_inclusive(self):
+        self.assertEqual(expand('FREQ=WEEKLY;UNTIL=20250221T180000Z'),
+                         ['2025-01-31', '2025-02-07', '2025-02-14', '2025-02-21'])
+
+    def test_weekly_bymonth(self):
+        self.assertEqual(expand('FREQ=WEEKLY;BYDAY=SA;BYMONTH=7,8;COUNT=10'),
+                         ['2025-07-05', '2025-07-12', '2025-07-19', '2025-07-26', '2025-08-02',
+                          '2025-08-09', '2025-08-16', '2025-08-23', '2025-08-30', '2026-07-04'])
+
+    def test_monthly_skips_months_without_the_day(self):
+        self.assertEqual(expand('FREQ=MONTHLY;COUNT=5'),
+                         ['2025-01-31', '2025-03-31', '2025-05-31', '2025-07-31', '2025-08-31'])
+
+    def test_monthly_negative_monthday(self):
+        self.assertEqual(expand('FREQ=MONTHLY;BYMONTHDAY=-1;COUNT=4'),
+                         ['2025-01-31', '2025-02-28', '2025-03-31', '2025-04-30'])
+
+    def test_monthly_ordinal_weekdays(self):
+        self.assertEqual(expand('FREQ=MONTHLY;BYDAY=2MO;COUNT=4'),
+                         ['2025-02-10', '2025-03-10', '2025-04-14', '2025-05-12'])
+        self.assertEqual(expand('FREQ=MONTHLY;BYDAY=-1FR;COUNT=4'),
+                         ['2025-01-31', '2025-02-28', '2025-03-28', '2025-04-25'])
+        self.assertEqual(expand('FREQ=MONTHLY;INTERVAL=2;BYDAY=1SA,3SA;COUNT=6'),
+                         ['2025-03-01', '2025-03-15', '2025-05-03', '2025-05-17', '2025-07-05', '2025-07-19'])
+
+    def test_monthly_byday_restricts_bymonthday(self):
+        self.assertEqual(expand('FREQ=MONTHLY;BYDAY=FR;BYMONTHDAY=13;COUNT=5'),
+                         ['2025-06-13', '2026-02-13', '2026-03-13', '2026-11-13', '2027-08-13'])
+        self.assertEqual(expand('FREQ=MONTHLY;BYDAY=MO,TU;BYMONTHDAY=1,2,3;COUNT=8'),
+                         ['2025-02-03', '2025-03-03', '2025-04-01', '2025-06-02',
+                          '2025-06-03', '2025-07-01', '2025-09-01', '2025-09-02'])
+
+    def test_yearly(self):
+        self.assertEqual(expand('FREQ=YEARLY;COUNT=3'), ['2025-01-31', '2026-01-31', '2027-01-31'])
+
+    def test_yearly_bymonth_out_of_order(self):
+        self.assertEqual(expand('FREQ=YEARLY;BYMONTH=6,3;COUNT=3'),
+                         ['2025-03-31', '2026-03-31', '2027-03-31'])
+
+    def test_yearly_last_sunday_of_march(self):
+        self.assertEqual(expand('FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU;COUNT=3'),
+                         ['2025-03-30', '2026-03-29', '2027-03-28'])
+
+    def test_local_time_kept_across_dst(self):
+        rule = RecurrenceRule.parse('FREQ=WEEKLY;COUNT=3', TZ)
+        start = datetime(2025, 3, 23, 19, 0, tzinfo=TZ)
+        occurrences = list(rule.occurrences(start, start - timedelta(seconds=1), start + timedelta(days=30)))
+        self.assertEqual([o.hour for o in occurrences], [19, 19, 19])
+        self.assertEqual([o.astimezone(timezone.utc).hour for o in occurrences], [18, 17, 17])
+
+    def test_window_only_yields_overlapping_occurrences(self):
+        rule = RecurrenceRule.parse('FREQ=DAILY', TZ)
+        window_start = datetime(2025, 2, 10, 0, 0, tzinfo=TZ)
+        occurrences = list(rule.occurrences(DTSTART, window_start, window_start + timedelta(days=3),
+                                            duration=timedelta(hours=2)))
+        self.assertEqual([o.strftime('%Y-%m-%d') for o in occurrences],
+                         ['2025-02-10', '2025-02-11', '2025-02-12'])
+
+
+class RecurringSeriesTest(unittest.TestCase):
+
+    def test_exdate_and_rdate(self):
+        rule, exdates, rdates = parse_recurrence_lines([
+            'RRULE:FREQ=WEEKLY;COUNT=4',
+            'EXDATE;TZID=Europe/Berlin:20250207T190000',
+            'RDATE;TZID=Europe/Berlin:20250210T190000',
+        ], TZ)
+        series = RecurringSeries(DTSTART, timedelta(hours=2), rule, exdates, rdates)
+        starts = series.between(DTSTART, DTSTART + timedelta(days=30))
+        self.assertEqual([s.strftime('%Y-%m-%d') for s in starts],
+                         ['2025-01-31', '2025-02-10', '2025-02-14', '2025-02-21'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+"""
+Lightweight tracing spans for commands, calendar calls, roster lookups and sends.
+
+Work is timed with nested spans:
+
+    with span('roster.load'):
+        ...
+
+The current span is stored in a context variable, so a span opened inside a
+command automatically becomes a child of that command's root span.  Each
+slash command gets a root span from `start_interaction_trace`, called from the
+cog's `interaction_check`.  The root span is closed by
+`finish_interaction_trace` from the bot's completion and error handlers.
+Work outside an interaction, such as a reminder check, still gets a trace:
+its first span becomes the root.
+
+Finished traces are kept in a short in-memory history so `!trace` can show a
+per-stage breakdown.  They can also be exported (TRACE_EXPORT) by a
+background thread, either as JSON lines to TRACE_FILE ('file') or as OTLP/HTTP
+JSON to TRACE_OTLP_ENDPOINT ('otlp').  'otlp' works with a local
+OpenTelemetry collector or any stand-in that accepts the same payload.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import requests
+
+from config import Config
+from logging_setup import get_logger
+
+log = get_logger(__name__)
+
+_current: ContextVar[Optional['Span']] = ContextVar('trace_span', default=None)
+
+# Finished traces, newest last
+recent_traces: deque = deque(maxlen=Config.TRACE_HISTORY)
+
+# interaction id → root span, until the command completes
+_open_roots: dict[int, 'Span'] = {}
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Span:
+    """One timed stage of work, linked to its parent and its trace's root."""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent', 'root', 'attributes',
+                 'start_ns', 'end_ns', '_start', 'duration', 'error', 'children')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, **attributes):
+        self.name = name
+        self.parent = parent
+        self.root = parent.root if parent else self
+        self.trace_id = parent.trace_id if parent else _new_id(16)
+        self.span_id = _new_id(8)
+        self.attributes = {k: v for k, v in attributes.items() if v is not None}
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.end_ns = None
+        self.duration = None
+        self.error = None
+        # Only the root collects its trace's finished spans
+        self.children: list = []
+
+    def set(self, **attributes) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def end(self, error: BaseException = None) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._start
+        self.end_ns = self.start_ns + int(self.duration * 1e9)
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self.root is self:
+            _finish_trace(self)
+        else:
+            self.root.children.append(self)
+
+    @property
+    def spans(self) -> list:
+        """Root first, then finished children in start order."""
+        return [self] + sorted(self.root.children, key=lambda s: s.start_ns)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a child of the current span (or as a new trace)."""
+    with _open_span(name, _current.get(), attributes) as new:
+        yield new
+
+
+@contextmanager
+def root_span(name: str, **attributes):
+    """
+    Time the enclosed block as a new trace.
+
+    For work that inherits a context but runs much later, such as a task
+    created during a reminder check that fires minutes afterwards.
+    """
+    with _open_span(name, None, attributes) as new:
+        yield new
+
+
+@contextmanager
+def _open_span(name: str, parent: Optional[Span], attributes: dict):
+    if not Config.TRACE_ENABLED:
+        yield None
+        return
+    new = Span(name, parent, **attributes)
+    token = _current.set(new)
+    try:
+        yield new
+    except BaseException as e:
+        new.end(error=e)
+        raise
+    else:
+        new.end()
+    finally:
+        _current.reset(token)
+
+
+def start_interaction_trace(interaction) -> None:
+    """Open the root span for a slash command (call from `interaction_check`)."""
+    if not Config.TRACE_ENABLED or interaction.id in _open_roots:
+        return
+    command = interaction.command.qualified_name if interaction.command else None
+    team_manager = getattr(interaction.client, 'team_manager', None)
+    team = team_manager.get_team_for_guild(interaction.guild_id) if team_manager else None
+    root = Span(f"/{command}" if command else 'interaction',
+                command=command, guild_id=interaction.guild_id,
+                team=team.team_id if team else None)
+    if len(_open_roots) >= 1000:
+        # Interactions that never reported completion; don't let them pile up
+        _open_roots.clear()
+    _open_roots[interaction.id] = root
+    # Not reset: discord.py runs each interaction in its own task
+    _current.set(root)
+
+
+def finish_interaction_trace(interaction, error: BaseException = None) -> None:
+    """Close the interaction's root span once its handler has returned or failed."""
+    root = _open_roots.pop(interaction.id, None)
+    if root is not None:
+        root.end(error=error)
+
+
+def find_trace(command: str = None) -> Optional[Span]:
+    """Most recent finished trace, optionally for a given slash command name."""
+    for root in reversed(recent_traces):
+        if command is None or root.attributes.get('command') == command.lstrip('/'):
+            return root
+    return None
+
+
+def _finish_trace(root: Span) -> None:
+    recent_traces.append(root)
+    if _exporter is not None:
+        _exporter.submit(root)
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+def _span_record(s: Span) -> dict:
+    return {
+        'trace_id': s.trace_id,
+        'span_id': s.span_id,
+        'parent_id': s.parent.span_id if s.parent else None,
+        'name': s.name,
+        'start_ns': s.start_ns,
+        'duration_ms': round(s.duration * 1000, 3),
+        'attributes': s.attributes,
+        'error': s.error,
+    }
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_payload(roots: list) -> dict:
+    spans = []
+    for root in roots:
+        for s in root.spans:
+            entry = {
+                'traceId': s.trace_id,
+                'spanId': s.span_id,
+                'name': s.name,
+                'kind': 1,  # SPAN_KIND_INTERNAL
+                'startTimeUnixNano': str(s.start_ns),
+                'endTimeUnixNano': str(s.end_ns),
+                'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in s.attributes.items()],
+                'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+            }
+            if s.parent:
+                entry['parentSpanId'] = s.parent.span_id
+            spans.append(entry)
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'legit-jarvis'}}]},
+        'scopeSpans': [{'scope': {'name': 'jarvis.tracing'}, 'spans': spans}],
+    }]}
+
+
+class _Exporter:
+    """Writes finished traces from a background thread, in batches."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._queue: queue.Queue = queue.Queue(maxsize=1000)
+        self.dropped = 0
+        threading.Thread(target=self._run, name='trace-exporter', daemon=True).start()
+
+    def submit(self, root: Span) -> None:
+        try:
+            self._queue.put_nowait(root)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Anything that piled up meanwhile goes out in the same write/request
+            while len(batch) < 100:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.mode == 'otlp':
+                    requests.post(Config.TRACE_OTLP_ENDPOINT, json=_otlp_payload(batch), timeout=5)
+                else:
+                    with open(Config.TRACE_FILE, 'a', encoding='utf-8') as f:
+                        for root in batch:
+                            for s in root.spans:
+                                f.write(json.dumps(_span_record(s), default=str) + "\n")
+            except Exception as e:
+                log.warning(f"⚠️ Trace export failed: {e}")
+
+
+_exporter: Optional[_Exporter] = None
+
+
+def setup_tracing() -> None:
+    """Start the exporter configured by TRACE_EXPORT (idempotent)."""
+    global _exporter
+    if _exporter is not None or not Config.TRACE_ENABLED:
+        return
+    mode = Config.TRACE_EXPORT
+    if mode not in ('file', 'otlp'):
+        if mode:
+            log.warning(f"⚠️ Unknown TRACE_EXPORT '{mode}' — traces are kept in memory only")
+        return
+    if mode == 'file':
+        directory = os.path.dirname(Config.TRACE_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    _exporter = _Exporter(mode)
+    target = Config.TRACE_FILE if mode == 'file' else Config.TRACE_OTLP_ENDPOINT
+    log.info(f"🧭 Exporting traces ({mode}) to {target}")
@@ -3,6 +3,7 @@ Utility module — re-exports commonly used classes and functions.
 """
 from teamup_api import TeamUpAPI
 from google_calendar_api import GoogleCalendarAPI
+from ics_calendar import ICSCalendar
 from calendar_provider import CalendarProvider
 from embeds import format_event_embed, format_upcoming_events_embed, format_week_events_embed, format_bot_info_embed
 from config import Config
@@ -11,6 +12,7 @@ from team_manager import TeamConfig, TeamManager
 __all__ = [
     'TeamUpAPI',
     'GoogleCalendarAPI',
+    'ICSCalendar',
     'CalendarProvider',
     'format_event_embed',
     'format_upcoming_events_embed',